@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: apiUndo.py
+    author: masonsmigel
+    date: 10/2026
+    description: Undo support for changes made through the maya API.
+                 Changes made with function sets such as MFnMesh.setPoints are not recorded in the undo queue.
+                 This module is also a maya plugin that registers a command to record the undo and redo functions
+                 of an API change so it can be undone like any other maya command.
+"""
+import logging
+import os
+from typing import Callable
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cmds
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_NAME = "apiUndo"
+COMMAND_NAME = "rigamajigApiUndo"
+
+# actions waiting to be picked up by the undo command. Each action is a tuple of (undo, redo)
+_pendingActions = list()
+
+
+def maya_useNewAPI():
+    """Tell maya this plugin uses the python API 2.0"""
+    pass
+
+
+class ApiUndoCommand(om2.MPxCommand):
+    """Command that records the undo and redo functions of an API change"""
+
+    def __init__(self):
+        super(ApiUndoCommand, self).__init__()
+        self._undo = None
+        self._redo = None
+
+    @staticmethod
+    def creator():
+        return ApiUndoCommand()
+
+    def doIt(self, args):
+        # maya loads the plugin as its own module so the pending actions are read from the package module
+        from rigamajig2.maya import apiUndo
+
+        self._undo, self._redo = apiUndo._pendingActions.pop()
+        self.redoIt()
+
+    def redoIt(self):
+        self._redo()
+
+    def undoIt(self):
+        self._undo()
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(plugin):
+    pluginFn = om2.MFnPlugin(plugin, "masonsmigel")
+    pluginFn.registerCommand(COMMAND_NAME, ApiUndoCommand.creator)
+
+
+def uninitializePlugin(plugin):
+    pluginFn = om2.MFnPlugin(plugin)
+    pluginFn.deregisterCommand(COMMAND_NAME)
+
+
+def loadPlugin() -> None:
+    """Load the undo command plugin if it is not loaded"""
+    if cmds.pluginInfo(PLUGIN_NAME, query=True, loaded=True):
+        return
+    pluginPath = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+    cmds.loadPlugin(pluginPath, quiet=True)
+
+
+def execute(redo: Callable, undo: Callable, undoable: bool = True) -> None:
+    """
+    Run an API change and record it in the undo queue.
+
+    :param redo: function that makes the change. It is called immediately and again on redo.
+    :param undo: function that reverts the change
+    :param undoable: record the change in the undo queue. If the undo queue is disabled the change is not recorded.
+    """
+    if not undoable or not cmds.undoInfo(query=True, state=True):
+        redo()
+        return
+
+    loadPlugin()
+    _pendingActions.append((undo, redo))
+    try:
+        getattr(cmds, COMMAND_NAME)()
+    finally:
+        # the command takes the action. If it failed before that remove the action
+        if _pendingActions and _pendingActions[-1] == (undo, redo):
+            _pendingActions.pop()
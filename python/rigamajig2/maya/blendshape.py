@@ -13,7 +13,9 @@ from typing import List, Dict, Tuple
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaAnim as oma
 import maya.cmds as cmds
+import numpy as np
 
+from rigamajig2.maya import apiUndo
 from rigamajig2.maya import connection
 from rigamajig2.maya import deformer
 from rigamajig2.maya import general
@@ -21,6 +23,9 @@ from rigamajig2.maya import mesh
 from rigamajig2.maya import shape
 from rigamajig2.shared import common
 
+# name used in place of a target to get or set the base weights
+BASE_WEIGHTS = "baseWeights"
+
 
 class BlendshapeOrigin:
     local = "local"
@@ -471,10 +476,95 @@ def getNextTargetIndex(blendshape):
     return nextIndex
 
 
+def _getWeightPlugs(blendshape: str, targets: List[str], geometry: str) -> Tuple[List[om.MPlug], int]:
+    """Get the weight map plug of each target (or the baseWeights) and the point count of the geometry"""
+    baseIndex = getBaseIndex(blendshape, geometry)
+
+    plugs = list()
+    for target in targets:
+        if target == BASE_WEIGHTS:
+            plugs.append(_getPlug(f"{blendshape}.inputTarget[{baseIndex}].baseWeights"))
+        else:
+            targetIndex = getTargetIndex(blendshape, target)
+            plugs.append(_getPlug(f"{blendshape}.inputTarget[{baseIndex}].itg[{targetIndex}].tw"))
+    return plugs, shape.getPointCount(geometry)
+
+
+def getWeightsArray(blendshape: str, targets: List[str] = None, geometry: str = None) -> Tuple[np.ndarray, List[str]]:
+    """
+    Get the weight maps of blendshape targets as well as the baseWeights as an array.
+    If no target or geometry are provided all targets and the baseWeights are gathered from the first geometry.
+    Each map is read in a single pass over its array data handle.
+
+    :param blendshape: blendshape node to get the weights of
+    :param targets: Optional - list of targets to get the weights of. Use "baseWeights" to get the base weights.
+    :param geometry: Optional - name of the geometry to get the weights of.
+                     By default, it will find the first geometry attached to the node.
+    :return: (target x vertex) float32 array of weights and the name of the target of each row
+    """
+    if not isBlendshape(blendshape):
+        raise Exception("{} is not a valid blendshape".format(blendshape))
+
+    targets = common.toList(targets) if targets else getTargetList(blendshape) + [BASE_WEIGHTS]
+    if not geometry:
+        geometry = common.getFirst(cmds.blendShape(blendshape, query=True, geometry=True))
+
+    plugs, pointCount = _getWeightPlugs(blendshape, targets, geometry)
+
+    weights = np.ones((len(targets), pointCount), dtype=np.float32)
+    for i, plug in enumerate(plugs):
+        weights[i] = deformer.getPlugWeights(plug, pointCount)
+    return weights, targets
+
+
+def setWeightsArray(
+    blendshape: str,
+    weights: np.ndarray,
+    targets: List[str],
+    geometry: str = None,
+    undoable: bool = True,
+) -> None:
+    """
+    Set the weight maps of blendshape targets as well as the baseWeights from an array.
+    Only the weights that changed are set, with one array data builder per map. The write is undoable.
+
+    :param blendshape: blendshape node to set the weights of
+    :param weights: (target x vertex) array of weights
+    :param targets: name of the target of each row. Use "baseWeights" to set the base weights.
+    :param geometry: Optional - name of geometry to set weights on
+    :param undoable: record the change in the undo queue
+    """
+    if not isBlendshape(blendshape):
+        raise Exception("{} is not a valid blendshape".format(blendshape))
+
+    targets = common.toList(targets)
+    if not geometry:
+        geometry = common.getFirst(cmds.blendShape(blendshape, query=True, geometry=True))
+
+    plugs, pointCount = _getWeightPlugs(blendshape, targets, geometry)
+
+    weights = np.asarray(weights, dtype=np.float32).reshape(len(targets), -1)
+    if weights.shape[1] != pointCount:
+        raise ValueError(f"Expected {pointCount} weights per target. Got {weights.shape[1]}")
+
+    oldWeights = [deformer.getPlugWeights(plug, pointCount) for plug in plugs]
+
+    def _setWeights(weightsList, currentWeightsList):
+        for plug, targetWeights, currentWeights in zip(plugs, weightsList, currentWeightsList):
+            deformer.setPlugWeights(plug, targetWeights, currentWeights=currentWeights)
+
+    apiUndo.execute(
+        redo=lambda: _setWeights(weights, oldWeights),
+        undo=lambda: _setWeights(oldWeights, weights),
+        undoable=undoable,
+    )
+
+
 def getWeights(blendshape, targets=None, geometry=None):
     """
     Get blendshape target weights as well as the baseWeights.
     If no target or geometry are provided all targets are gathered, and the first geometry.
+    See `getWeightsArray` to get the weights as an array.
 
     :param str blendshape: blendshape node to get
     :param str list targets: list of targets to get the blendshape weights from
@@ -483,53 +573,21 @@ def getWeights(blendshape, targets=None, geometry=None):
     :return: dictionary of blendshape weights {"baseweights":[], "target":[]}
     :rtype: dict
     """
-    weightList = dict()
     if not isBlendshape(blendshape):
         raise Exception("{} is not a valid blendshape target".format(blendshape))
 
     if not targets:
         targets = getTargetList(blendshape)
-    if not geometry:
-        geometry = cmds.blendShape(blendshape, query=True, geometry=True)[0]
-
-    pointCount = shape.getPointCount(geometry) - 1
+    targets = common.toList(targets) + [BASE_WEIGHTS]
 
-    # Get the target weights
-    for target in targets:
-        targetIndex = getTargetIndex(blendshape, target)
-
-        targetAttr = "{}.it[0].itg[{}].tw[0:{}]".format(blendshape, targetIndex, pointCount)
-        attrDefaultTest = "{}.it[0].itg[{}].tw[*]".format(blendshape, targetIndex)
-        if not cmds.objExists(attrDefaultTest):
-            values = [1 for _ in range(pointCount + 1)]
-        else:
-            values = cmds.getAttr(targetAttr)
-            values = [round(v, 5) for v in values]
-
-        optimizedDict = dict()
-        for i, v in enumerate(values):
-            if not abs(v - 1.0) <= 0.0001:
-                optimizedDict[i] = v
-
-        weightList[target] = optimizedDict
-
-    # get the base weights
-    targetAttr = "{}.it[0].baseWeights[0:{}]".format(blendshape, pointCount)
-    attrDefaultTest = "{}.it[0].baseWeights[*]".format(blendshape)
-    if not cmds.objExists(attrDefaultTest):
-        values = [1 for _ in range(pointCount + 1)]
-    else:
-        values = cmds.getAttr(targetAttr)
-        values = [round(v, 5) for v in values]
-
-    # optimize the value list
-    optimizedDict = dict()
-    for i, v in enumerate(values):
-        if not abs(v - 1.0) <= 0.0001:
-            optimizedDict[i] = v
-
-    weightList["baseWeights"] = optimizedDict
+    weights, targets = getWeightsArray(blendshape, targets=targets, geometry=geometry)
+    weights = np.round(weights.astype(np.float64), 5)
 
+    # only store the weights that are not 1.0
+    weightList = dict()
+    for target, targetWeights in zip(targets, weights):
+        indices = np.flatnonzero(np.abs(targetWeights - 1.0) > 0.0001)
+        weightList[target] = dict(zip(indices.tolist(), targetWeights[indices].tolist()))
     return weightList
 
 
@@ -542,6 +600,7 @@ def setWeights(
     """
     Set blendshape target weights as well as the baseWeights.
     If no target or geometry are provided all targets are gathered, and the first geometry is used
+    See `setWeightsArray` to set the weights from an array.
 
     :param str blendshape: blendshape node to get
     :param str weights: dictionary of weights
@@ -553,50 +612,21 @@ def setWeights(
         raise Exception("{} is not a valid blendshape".format(blendshape))
 
     if not targets:
-        targets = getTargetList(blendshape) + ["baseWeights"]
+        targets = getTargetList(blendshape) + [BASE_WEIGHTS]
     if not geometry:
         geometry = common.getFirst(cmds.blendShape(blendshape, query=True, geometry=True))
 
-    targets = common.toList(targets)
-
-    pointCount = shape.getPointCount(geometry) - 1
+    targets = [target for target in common.toList(targets) if target]
+    pointCount = shape.getPointCount(geometry)
 
-    for target in targets:
-        if not target:
-            continue
-
-        if target == "baseWeights":
-            tmpWeights = list()
-            for i in range(pointCount + 1):
-                # we need to check if there are weights in the dictionary. We can use get to check and return -1 if
-                # there is not a key for the specified weight. After that we can check if the weight == None. If we does
-                # we replace it with 1.0 since we stripped out any values at 1.0 when we gathered the weights
-                if weights[target].get(i) is not None:
-                    tmpWeight = weights[target].get(i)
-                elif weights[target].get(str(i)) is not None:
-                    tmpWeight = weights[target].get(str(i))
-                else:
-                    tmpWeight = 1.0
-                tmpWeights.append(tmpWeight)
-
-            targetAttr = "{}.inputTarget[0].baseWeights[0:{}]".format(blendshape, pointCount)
-            cmds.setAttr(targetAttr, *tmpWeights)
-        else:
-            tmpWeights = list()
-            for i in range(pointCount + 1):
-                if weights[target].get(i) is not None:
-                    tmpWeight = weights[target].get(i)
-                elif weights[target].get(str(i)) is not None:
-                    tmpWeight = weights[target].get(str(i))
-                else:
-                    tmpWeight = 1.0
-
-                # finally append the weight to the list
-                tmpWeights.append(tmpWeight)
+    # weights at 1.0 were stripped out when the weights were gathered. Keys may be strings when read from json.
+    weightsArray = np.ones((len(targets), pointCount), dtype=np.float32)
+    for i, target in enumerate(targets):
+        for index, value in weights[target].items():
+            if value is not None and int(index) < pointCount:
+                weightsArray[i, int(index)] = value
 
-            targetIndex = getTargetIndex(blendshape, target)
-            targetAttr = "{}.inputTarget[0].itg[{}].tw[0:{}]".format(blendshape, targetIndex, pointCount)
-            cmds.setAttr(targetAttr, *tmpWeights)
+    setWeightsArray(blendshape, weightsArray, targets=targets, geometry=geometry)
 
 
 def getInputTargetItemList(blendshape, target, base=None):
@@ -651,20 +681,51 @@ def getInputTargetItemAttr(blendshape: str, baseIndex: int, targetIndex: int, in
     return targetItemAttr
 
 
-def getDelta(
-    blendshape: str, target: str, inbetween: float = None, prune: int = 5
-) -> Dict[int, Tuple[float, float, float]]:
+def _getPlug(plug: str) -> om.MPlug:
+    """Get the MPlug of an attribute"""
+    selList = om.MSelectionList()
+    selList.add(plug)
+    return selList.getPlug(0)
+
+
+def _getStoredDelta(inputTargetItemPlug: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Read the stored input points and input components of an inputTargetItem plug as arrays"""
+    pointsPlug = _getPlug(f"{inputTargetItemPlug}.inputPointsTarget")
+    componentsPlug = _getPlug(f"{inputTargetItemPlug}.inputComponentsTarget")
+
+    # the plugs have no data until a delta is set
+    try:
+        points = om.MFnPointArrayData(pointsPlug.asMObject()).array()
+        componentList = om.MFnComponentListData(componentsPlug.asMObject())
+    except RuntimeError:
+        return np.zeros(0, dtype=np.int32), np.zeros((0, 3), dtype=np.float32)
+
+    indices = list()
+    for i in range(componentList.length()):
+        indices.extend(om.MFnSingleIndexedComponent(componentList.get(i)).getElements())
+
+    deltas = np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3]
+    indices = np.array(indices, dtype=np.int32)
+
+    # the points and components should match. If they dont only the matching points are used.
+    count = min(len(deltas), len(indices))
+    return indices[:count], deltas[:count].astype(np.float32)
+
+
+def getDeltaArray(
+    blendshape: str, target: str, inbetween: float = None, tolerance: float = 0.0001
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Gather the deltas for each vertex in a blendshape node.
+    Gather the deltas of the modified vertices of a blendshape target as arrays.
 
-    To optimize the dictonary prune any deltas with a magnitude below 0.0001.
-    This returns a dictonary containing only the deltas of vertices that have been modified
+    If the target has a live target geometry the delta is the difference between the target geometry and the orig
+    shape. Otherwise, the delta is read from the stored input points of the target.
 
     :param blendshape: name of the blendshape to gather blendshape data from.
     :param target: name of the target to gather the delta information for
     :param inbetween: inbetween weight value Specify to get the delta of a specific target
-    :param prune: number of decimal places to prune from position delta
-    :return: a dictionary containing the vertex ID as the key, and a tuple representing the delta
+    :param tolerance: deltas with a magnitude below this value are removed
+    :return: array of vertex IDs and a (vertex x 3) float32 array of the delta of each vertex
     """
     if not isBlendshape(blendshape):
         raise Exception("'{}' is not a valid blendshape".format(blendshape))
@@ -679,51 +740,74 @@ def getDelta(
     inputTargetItemPlug = getInputTargetItemAttr(blendshape, baseIndex, targetIndex, inputTargetItem)
     geoTargetPlug = "{}.igt".format(inputTargetItemPlug)
 
-    deltaPointList = dict()
-
-    if len(cmds.listConnections(geoTargetPlug, source=True, destination=False) or list()) > 0:
-        inputShape = cmds.listConnections(geoTargetPlug, source=True, destination=False, plugs=True)
-        inputShape = inputShape[0].split(".")[0]
+    inputShape = common.getFirst(cmds.listConnections(geoTargetPlug, source=True, destination=False, plugs=True))
+    if inputShape:
+        inputShape = inputShape.split(".")[0]
         origShape = deformer.getOrigShape(base)
-         # TODO: add a check to support live connections to nurbs curves as well.
-        targetPoints = mesh.getVertPositions(inputShape, world=False)
-        origPoints = mesh.getVertPositions(origShape, world=False)
-
-        deltaPointList = dict()
-        for i in range(len(targetPoints)):
-            offset = om.MVector(targetPoints[i]) - om.MVector(origPoints[i])
-
-            # check if the magnitude is within a very small vector before adding it.
-            # This will help us cut down on file sizes.
-            if offset.length() >= 0.0001:
-                deltaPointList[str(i)] = (
-                    round(offset.x, prune),
-                    round(offset.y, prune),
-                    round(offset.z, prune),
-                )
-
+        # TODO: add a check to support live connections to nurbs curves as well.
+        deltas = mesh.getPointsArray(inputShape) - mesh.getPointsArray(origShape)
+        indices = np.arange(len(deltas), dtype=np.int32)
     else:
-        pointsTarget = cmds.getAttr("{}.ipt".format(inputTargetItemPlug))
-        componentsTarget = common.flattenList(cmds.getAttr("{}.ict".format(inputTargetItemPlug)))
+        indices, deltas = _getStoredDelta(inputTargetItemPlug)
 
-        for point, componentTarget in zip(pointsTarget, componentsTarget):
-            vertexId = componentTarget.split("[")[-1].split("]")[0]
+    # remove small deltas to cut down on file sizes.
+    keep = np.linalg.norm(deltas, axis=1) >= tolerance
+    return indices[keep], deltas[keep].astype(np.float32)
 
-            prunedPoint = (
-                round(point[0], prune),
-                round(point[1], prune),
-                round(point[2], prune),
-            )
-            deltaPointList[vertexId] = prunedPoint
 
-    return deltaPointList
+def getDelta(
+    blendshape: str, target: str, inbetween: float = None, prune: int = 5
+) -> Dict[int, Tuple[float, float, float]]:
+    """
+    Gather the deltas for each vertex in a blendshape node.
+
+    To optimize the dictonary prune any deltas with a magnitude below 0.0001.
+    This returns a dictonary containing only the deltas of vertices that have been modified.
+    See `getDeltaArray` to get the deltas as arrays.
+
+    :param blendshape: name of the blendshape to gather blendshape data from.
+    :param target: name of the target to gather the delta information for
+    :param inbetween: inbetween weight value Specify to get the delta of a specific target
+    :param prune: number of decimal places to prune from position delta
+    :return: a dictionary containing the vertex ID as the key, and a tuple representing the delta
+    """
+    indices, deltas = getDeltaArray(blendshape, target, inbetween=inbetween)
+    deltas = np.round(deltas.astype(np.float64), prune)
+    return {str(index): tuple(delta) for index, delta in zip(indices.tolist(), deltas.tolist())}
+
+
+def _setStoredDelta(
+    inputTargetItemPlug: str,
+    indices: np.ndarray,
+    deltas: np.ndarray,
+    componentType: int,
+) -> None:
+    """Write arrays of vertex IDs and deltas to the input points and input components of an inputTargetItem plug"""
+    pointsPlug = _getPlug(f"{inputTargetItemPlug}.inputPointsTarget")
+    componentsPlug = _getPlug(f"{inputTargetItemPlug}.inputComponentsTarget")
+
+    pointData = om.MFnPointArrayData()
+    pointObject = pointData.create(om.MPointArray(np.asarray(deltas, dtype=np.float64).tolist()))
+
+    componentFn = om.MFnSingleIndexedComponent()
+    componentObject = componentFn.create(componentType)
+    componentFn.addElements(np.asarray(indices, dtype=np.int32).tolist())
+    componentListData = om.MFnComponentListData()
+    componentListObject = componentListData.create()
+    componentListData.add(componentObject)
+
+    modifier = om.MDGModifier()
+    modifier.newPlugValue(pointsPlug, pointObject)
+    modifier.newPlugValue(componentsPlug, componentListObject)
+    modifier.doIt()
 
 
 def setDelta(
     blendshape: str,
     target: str,
-    deltaDict: Dict[int, Tuple[float, float, float]],
+    deltaDict,
     inbetween: float = None,
+    undoable: bool = True,
 ) -> None:
     """
     Set the delta values on a given blendshape target.
@@ -735,8 +819,10 @@ def setDelta(
 
     :param blendshape: Name of the blendshape node
     :param target: name of the target to set the delta on
-    :param deltaDict: delta data dictionary of deltas for vertex IDs. Gathered from getDeltas
+    :param deltaDict: delta data dictionary of deltas for vertex IDs gathered from getDelta
+                      or a tuple of vertex ID and (vertex x 3) delta arrays gathered from getDeltaArray
     :param inbetween: inbetween weight value
+    :param undoable: record the change in the undo queue
     """
     if not isBlendshape(blendshape):
         raise Exception("'{}' is not a valid blendshape".format(blendshape))
@@ -754,25 +840,35 @@ def setDelta(
     if len(cmds.listConnections(geoTargetPlug, source=True, destination=False) or list()) > 0:
         raise Warning("{}.{} has a live blendshape connection".format(blendshape, target))
 
+    if shape.getType(base) == shape.CURVE:
+        componentType = om.MFn.kCurveCVComponent
     else:
-        pointsList = [deltaDict[p] for p in list(deltaDict.keys())]
-        if shape.getType(base) == shape.MESH:
-            componentsList = ["vtx[{}]".format(p) for p in list(deltaDict.keys())]
-        elif shape.getType(base) == shape.CURVE:
-            componentsList = ["cv[{}]".format(p) for p in list(deltaDict.keys())]
-
-        cmds.setAttr(
-            f"{inputTargetItemPlug}.inputPointsTarget",
-            len(pointsList),
-            *pointsList,
-            type="pointArray",
-        )
-        cmds.setAttr(
-            f"{inputTargetItemPlug}.inputComponentsTarget",
-            len(componentsList),
-            *componentsList,
-            type="componentList",
-        )
+        componentType = om.MFn.kMeshVertComponent
+
+    indices, deltas = _deltaToArrays(deltaDict)
+    oldIndices, oldDeltas = _getStoredDelta(inputTargetItemPlug)
+
+    apiUndo.execute(
+        redo=lambda: _setStoredDelta(inputTargetItemPlug, indices, deltas, componentType),
+        undo=lambda: _setStoredDelta(inputTargetItemPlug, oldIndices, oldDeltas, componentType),
+        undoable=undoable,
+    )
+
+
+def _deltaToArrays(delta) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get a delta as arrays of vertex IDs and deltas.
+
+    :param delta: dictionary of deltas for vertex IDs or a tuple of vertex ID and (vertex x 3) delta arrays
+    :return: array of vertex IDs and a (vertex x 3) float32 array of deltas
+    """
+    if isinstance(delta, dict):
+        indices = np.array([int(vertexId) for vertexId in delta.keys()], dtype=np.int32)
+        deltas = np.array(list(delta.values()), dtype=np.float32).reshape(-1, 3)
+        return indices, deltas
+
+    indices, deltas = delta
+    return np.asarray(indices, dtype=np.int32), np.asarray(deltas, dtype=np.float32).reshape(-1, 3)
 
 
 def reconstructTargetFromDelta(blendshape, deltaDict, name=None):
@@ -782,7 +878,7 @@ def reconstructTargetFromDelta(blendshape, deltaDict, name=None):
     If no delta exists for the given vertex ID default to the position from the orig shape
 
     :param blendshape: blendshape node to reconstruct the delta for. This is used for gathering the orig shape.
-    :param deltaDict: delta data dictionary of deltas for vertex IDs
+    :param deltaDict: delta data dictionary of deltas for vertex IDs or a tuple of vertex ID and delta arrays.
     :param name: name the newly created target
     :return: New blendshape target mesh from delta
     """
@@ -791,22 +887,14 @@ def reconstructTargetFromDelta(blendshape, deltaDict, name=None):
 
     base = getBaseGeometry(blendshape)
     origShape = deformer.getOrigShape(base)
-    origShapePoints = mesh.getVertPositions(origShape, world=False)
+    points = mesh.getPointsArray(origShape, world=False)
 
     targetGeo = deformer.createCleanGeo(base, name=name)
 
-    for vertexId in list(deltaDict.keys()):
-        origPoint = om.MPoint(origShapePoints[int(vertexId)])
-        delta = om.MVector(deltaDict[vertexId])
-
-        absPoint = origPoint + delta
-        absPoint = [absPoint.x, absPoint.y, absPoint.z]
-
-        cmds.xform(
-            "{}.vtx[{}]".format(targetGeo, vertexId),
-            objectSpace=True,
-            translation=absPoint,
-        )
+    # set all the points of the target at once
+    indices, deltas = _deltaToArrays(deltaDict)
+    points[indices] += deltas
+    mesh.setPointsArray(targetGeo, points, world=False)
 
     return targetGeo
 
@@ -848,8 +936,8 @@ def regenerateTarget(blendshape, target, inbetween=None, connect=True):
     else:
         ibName = "{}_ib{}".format(target, str(inbetween).replace(".", "_").replace("-", "neg"))
         targetGeoName = target if not inbetween else ibName
-        deltaDict = getDelta(blendshape, target, inbetween=inbetween)
-        targetGeo = reconstructTargetFromDelta(blendshape, deltaDict=deltaDict, name=targetGeoName)
+        delta = getDeltaArray(blendshape, target, inbetween=inbetween)
+        targetGeo = reconstructTargetFromDelta(blendshape, deltaDict=delta, name=targetGeoName)
 
         targetGeoShape = cmds.listRelatives(targetGeo, shapes=True)[0]
         if connect:
@@ -895,7 +983,7 @@ def transferBlendshape(
     targetList = getTargetList(blendshape)
     for target in targetList:
         # get the base delta
-        baseDelta = getDelta(blendshape=blendshape, target=target)
+        baseDelta = getDeltaArray(blendshape=blendshape, target=target)
 
         # create a new base target with the same name
         addEmptyTarget(blendshape=targetBlendshape, target=target)
@@ -910,7 +998,7 @@ def transferBlendshape(
 
             wt = itiToInbetween(iti)
 
-            inbetweenDelta = getDelta(blendshape=blendshape, target=target, inbetween=wt)
+            inbetweenDelta = getDeltaArray(blendshape=blendshape, target=target, inbetween=wt)
             addEmptyTarget(blendshape=targetBlendshape, target=target, inbetween=wt)
             setDelta(
                 blendshape=targetBlendshape,
@@ -930,7 +1018,7 @@ def transferBlendshape(
             for output in outputs:
                 cmds.connectAttr(f"{targetBlendshape}.{target}", output, force=True)
 
-    weights = getWeights(blendshape=blendshape, geometry=base)
-    setWeights(blendshape=targetBlendshape, weights=weights, geometry=targetMesh)
+    weights, weightTargets = getWeightsArray(blendshape=blendshape, geometry=base)
+    setWeightsArray(blendshape=targetBlendshape, weights=weights, targets=weightTargets, geometry=targetMesh)
 
     return targetBlendshape
@@ -8,24 +8,33 @@
     description: This module contains our rig builder.
                  It acts as a wrapper to manage all functions of the rig_builder.
 """
+import contextlib
+import functools
+import hashlib
 import logging
 import os
+import tempfile
 import time
+from collections import OrderedDict
 from typing import *
 
 import maya.api.OpenMaya as om2
 import maya.cmds as cmds
 
-import rigamajig2.maya.data.abstractData as abstractData
+import rigamajig2.maya.decorators as decorators
 import rigamajig2.maya.file as file
 import rigamajig2.maya.meta as meta
 import rigamajig2.shared.common as common
 import rigamajig2.shared.path as path
+from rigamajig2.maya.builder import checkpoint as _checkpoint
 from rigamajig2.maya.builder import componentManager, scriptManager
 from rigamajig2.maya.builder import constants
 from rigamajig2.maya.builder import core
 from rigamajig2.maya.builder import dataIO
+from rigamajig2.maya.builder import fastBuild
 from rigamajig2.maya.builder import model
+from rigamajig2.maya.builder import prefetch
+from rigamajig2.maya.builder import profiler
 from rigamajig2.maya.components import base
 
 _Component = Type[base.BaseComponent]
@@ -45,6 +54,22 @@ class Builder(object):
     """
 
     VERSIONS_DIRECTORY = "versions"
+    PROFILES_DIRECTORY = os.path.join(tempfile.gettempdir(), "rigamajig2", "profiles")
+    CHECKPOINTS_DIRECTORY = os.path.join(
+        tempfile.gettempdir(), "rigamajig2", "checkpoints"
+    )
+
+    # build stages
+    PRE_SCRIPTS_STAGE = "preScripts"
+    MODEL_STAGE = "model"
+    SKELETON_STAGE = "skeleton"
+    COMPONENTS_STAGE = "components"
+    POSE_READERS_STAGE = "poseReaders"
+    POST_SCRIPTS_STAGE = "postScripts"
+    CONTROL_SHAPES_STAGE = "controlShapes"
+    DEFORMATION_LAYERS_STAGE = "deformationLayers"
+    SKINS_STAGE = "skins"
+    DEFORMERS_STAGE = "deformers"
 
     def __init__(self, rigFile=None):
         """
@@ -54,9 +79,17 @@ class Builder(object):
         self.rigEnvironment = None
         self.rigFile = None
 
-        self._availableComponents = componentManager.findComponents()
         self.componentList = []
 
+        # profiler used to record the build. Only set while running a profiled build.
+        self.buildProfiler = None
+
+        # fast build settings. Only set while running a fast build.
+        self.fastBuild = None
+
+        # reads the data files of the rig file in the background
+        self.dataPrefetcher = prefetch.DataPrefetcher()
+
         # rig file properties
         self._archetypeParent = None
         self._rigName = None
@@ -81,7 +114,7 @@ class Builder(object):
 
     def getAvailableComponents(self) -> List[str]:
         """Get all available components"""
-        return self._availableComponents
+        return componentManager.getComponentTypes()
 
     def getAbsolutePath(self, filepath: path.RelativePath) -> path.AbsolutePath:
         """
@@ -286,7 +319,8 @@ class Builder(object):
 
         for filepath in common.toList(filePaths):
             absolutePath = self.getAbsolutePath(filepath)
-            dataIO.loadJointData(absolutePath)
+            with self._profileStage(f"joints: {filepath}", profiler.DATA):
+                dataIO.loadJointData(absolutePath, prefetcher=self.dataPrefetcher)
             logger.info(f"Joints loaded : {filepath}")
 
     def initialize(self) -> None:
@@ -296,7 +330,10 @@ class Builder(object):
 
         for component in self.componentList:
             logger.info("Initializing: {}".format(component.name))
-            component.initializeComponent()
+            with self._profileStage(
+                f"initialize: {component.name}", profiler.COMPONENT
+            ):
+                component.initializeComponent()
 
         logger.info("initialize -- complete")
 
@@ -310,7 +347,8 @@ class Builder(object):
 
         for component in self.componentList:
             logger.info("Guiding: {}".format(component.name))
-            component.guideComponent()
+            with self._profileStage(f"guide: {component.name}", profiler.COMPONENT):
+                component.guideComponent()
             if hasattr(component, "guidesHierarchy") and component.guidesHierarchy:
                 parent = cmds.listRelatives(component.guidesHierarchy, p=True)
                 if parent and parent[0] == "guides":
@@ -320,11 +358,10 @@ class Builder(object):
 
         logger.info("guide -- complete")
 
-    def build(self) -> None:
+    def _sortComponents(self) -> None:
         """
-        build rig
+        Sort the component list into build order.
         """
-
         # we need to make sure the main.main component gets built first if it exists in the list.
         # this is because all components that use the joint.connectChains function check for a bind group
         # to build the proper scale constraints
@@ -333,10 +370,18 @@ class Builder(object):
                 self.componentList.remove(component)
                 self.componentList.insert(0, component)
 
+    def build(self) -> None:
+        """
+        build rig
+        """
+
+        self._sortComponents()
+
         # now we can safely build all the components in the scene
         for component in self.componentList:
             logger.info("Building: {}".format(component.name))
-            component.buildComponent()
+            with self._profileStage(f"build: {component.name}", profiler.COMPONENT):
+                component.buildComponent()
 
             if cmds.objExists("rig") and component.getComponentType() != "main.main":
                 if hasattr(component, "rootHierarchy"):
@@ -369,7 +414,8 @@ class Builder(object):
         """
         for component in self.componentList:
             logger.info("Connecting: {}".format(component.name))
-            component.connectComponent()
+            with self._profileStage(f"connect: {component.name}", profiler.COMPONENT):
+                component.connectComponent()
             self.updateMaya()
         logger.info("connect -- complete")
 
@@ -379,7 +425,8 @@ class Builder(object):
         """
         for component in self.componentList:
             logger.info("Finalizing: {}".format(component.name))
-            component.finalizeComponent()
+            with self._profileStage(f"finalize: {component.name}", profiler.COMPONENT):
+                component.finalizeComponent()
             self.updateMaya()
 
         # delete the guide group
@@ -393,7 +440,8 @@ class Builder(object):
         """
         for component in self.componentList:
             logger.info("Optimizing {}".format(component.name))
-            component.optimizeComponent()
+            with self._profileStage(f"optimize: {component.name}", profiler.COMPONENT):
+                component.optimizeComponent()
             self.updateMaya()
         logger.info("optimize -- complete")
 
@@ -407,7 +455,8 @@ class Builder(object):
         self.setComponents([])
         for filepath in common.toList(filepaths):
             absolutePath = self.getAbsolutePath(filepath)
-            dataIO.loadComponentData(self, filepath=absolutePath)
+            with self._profileStage(f"components: {filepath}", profiler.DATA):
+                dataIO.loadComponentData(self, filepath=absolutePath)
             logger.info(f"components loaded : {filepath}")
 
     def loadControlShapes(self, applyColor: bool = True) -> None:
@@ -422,7 +471,10 @@ class Builder(object):
             # make the path an absolute
 
             absPath = self.getAbsolutePath(filepath)
-            dataIO.loadControlShapeData(absPath, applyColor=applyColor)
+            with self._profileStage(f"control shapes: {filepath}", profiler.DATA):
+                dataIO.loadControlShapeData(
+                    absPath, applyColor=applyColor, prefetcher=self.dataPrefetcher
+                )
             self.updateMaya()
             logger.info(f"control shapes loaded: {filepath}")
 
@@ -434,7 +486,9 @@ class Builder(object):
 
         for filepath in common.toList(filepaths):
             absPath = self.getAbsolutePath(filepath)
-            if dataIO.loadGuideData(absPath):
+            with self._profileStage(f"guides: {filepath}", profiler.DATA):
+                loaded = dataIO.loadGuideData(absPath, prefetcher=self.dataPrefetcher)
+            if loaded:
                 logger.info(f"guides loaded: {filepath}")
 
     def loadPoseReaders(self, replace: bool = True) -> None:
@@ -447,7 +501,11 @@ class Builder(object):
 
         for filepath in common.toList(filepaths):
             absPath = self.getAbsolutePath(filepath)
-            if dataIO.loadPoseReaderData(absPath, replace=replace):
+            with self._profileStage(f"pose readers: {filepath}", profiler.DATA):
+                loaded = dataIO.loadPoseReaderData(
+                    absPath, replace=replace, prefetcher=self.dataPrefetcher
+                )
+            if loaded:
                 logger.info(f"pose readers loaded: {filepath}")
 
     def loadDeformationLayers(self) -> None:
@@ -455,7 +513,7 @@ class Builder(object):
         Load the deformation layers from the `deformLayersFile` property
         """
         filepath = self.getAbsolutePath(self.deformLayersFile) or None
-        if dataIO.loadDeformationLayerData(filepath):
+        if dataIO.loadDeformationLayerData(filepath, prefetcher=self.dataPrefetcher):
             logger.info("deformation layers loaded")
 
     def loadSkinWeights(self) -> None:
@@ -463,7 +521,7 @@ class Builder(object):
         Load the skin weights from the `skinsFile` property
         """
         filepath = self.getAbsolutePath(self.skinsFile) or None
-        if dataIO.loadSkinWeightData(filepath):
+        if dataIO.loadSkinWeightData(filepath, prefetcher=self.dataPrefetcher):
             logger.info("skin weights loaded")
 
     def loadDeformers(self) -> None:
@@ -474,9 +532,35 @@ class Builder(object):
 
         for filepath in common.toList(deformerPaths):
             absPath = self.getAbsolutePath(filepath)
-            if dataIO.loadDeformer(absPath):
+            with self._profileStage(f"deformers: {filepath}", profiler.DATA):
+                loaded = dataIO.loadDeformer(absPath, prefetcher=self.dataPrefetcher)
+            if loaded:
                 logger.info(f"deformers loaded: {filepath}")
 
+    def prefetchData(self) -> None:
+        """
+        Start reading the data files of the rig file in the background.
+        The data loaders will use the prefetched data when the build reaches them.
+        Files that are already being prefetched are skipped.
+        """
+        prefetchFiles = [
+            (self.jointFiles, "JointData"),
+            (self.guideFiles, "GuideData"),
+            (self.controlShapeFiles, "CurveData"),
+            (self.poseReadersFiles, "PSDData"),
+            (self.deformLayersFile, "DeformLayerData"),
+            (self.skinsFile, "SkinData"),
+            (self.deformerFiles, None),
+        ]
+
+        for filepaths, dataType in prefetchFiles:
+            absolutePaths = [
+                self.getAbsolutePath(filepath)
+                for filepath in common.toList(filepaths)
+                if filepath
+            ]
+            self.dataPrefetcher.prefetch(absolutePaths, dataType=dataType)
+
     # TODO: Fix this or delete it.
     def deleteComponents(self, clearList=True):
         """
@@ -527,28 +611,23 @@ class Builder(object):
     # RUN SCRIPTS UTILITIES
     # --------------------------------------------------------------------------------
 
-    def runBuilderScripts(self, scriptStep):
+    def getBuilderScripts(self, scriptStep: str) -> Tuple[List[str], List[str]]:
         """
-        Run builder scripts for a specific script Type
+        Get the absolute paths of all local and inherited builder scripts for a specific script type.
 
-        :param scriptStep: script type to run. This can be either
+        :param scriptStep: script type to get. This can be either pre_script, post_script or pub_script
+        :return: list of local scripts and list of scripts inherited from archetype parents
         """
         if scriptStep == constants.PRE_SCRIPT:
             localScripts = self.localPreScripts
-            niceScriptStepName = "Pre script"
         elif scriptStep == constants.POST_SCRIPT:
             localScripts = self.localPostScripts
-            niceScriptStepName = "Post script"
         elif scriptStep == constants.PUB_SCRIPT:
             localScripts = self.localPubScripts
-            niceScriptStepName = "Pub script"
         else:
             raise KeyError(f"'{scriptStep} is not a valid script type")
 
         absoluteScripts = [self.getAbsolutePath(script) for script in localScripts]
-        scriptManager.runAllScripts(absoluteScripts)
-        if len(absoluteScripts):
-            logger.info(f"{niceScriptStepName}: local scripts -- complete")
 
         # next get scripts to inherit
         scriptDict = scriptManager.GetCompleteScriptList.getScriptList(
@@ -562,12 +641,45 @@ class Builder(object):
         }
         scripts = list(inheritedScripts.values())
         completeScriptList = common.joinLists(scripts)
-        scriptManager.runAllScripts(completeScriptList)
+
+        return absoluteScripts, completeScriptList
+
+    def runBuilderScripts(self, scriptStep):
+        """
+        Run builder scripts for a specific script Type
+
+        :param scriptStep: script type to run. This can be either
+        """
+        niceScriptStepNames = {
+            constants.PRE_SCRIPT: "Pre script",
+            constants.POST_SCRIPT: "Post script",
+            constants.PUB_SCRIPT: "Pub script",
+        }
+        absoluteScripts, completeScriptList = self.getBuilderScripts(scriptStep)
+        niceScriptStepName = niceScriptStepNames[scriptStep]
+
+        scriptManager.runAllScripts(absoluteScripts, buildProfiler=self.buildProfiler)
+        if len(absoluteScripts):
+            logger.info(f"{niceScriptStepName}: local scripts -- complete")
+
+        scriptManager.runAllScripts(
+            completeScriptList, buildProfiler=self.buildProfiler
+        )
         if len(completeScriptList):
             logger.info(f"{niceScriptStepName}: inherited scripts -- complete")
 
     def run(
-        self, publish: bool = False, savePublish: bool = True, versioning: bool = True
+        self,
+        publish: bool = False,
+        savePublish: bool = True,
+        versioning: bool = True,
+        profile: bool = False,
+        profileDirectory: str = None,
+        checkpoint: bool = False,
+        resume: bool = False,
+        fast: bool = False,
+        refreshPolicy: str = fastBuild.RefreshPolicy.STAGE,
+        refreshInterval: int = 10,
     ) -> None:
         """
         Build a rig.
@@ -580,6 +692,18 @@ class Builder(object):
         :param savePublish: If True, the publishing file will be saved. This is effective only when `publish` is True.
         :param versioning: Enable versioning. If True, a new version will be created in the publishing directory
                            each time the publishing file is overwritten. This allows for version control.
+        :param profile: If True, profile each step of the build. A json report and chrome trace file are written
+                        to the `profileDirectory`.
+        :param profileDirectory: Directory to write the profile results to. Defaults to `PROFILES_DIRECTORY`.
+        :param checkpoint: If True, save a scene checkpoint after each build stage. Each checkpoint records a hash of
+                           the rig file and every data file and script used in that stage.
+        :param resume: If True, load the last valid checkpoint and only build the stages after it.
+                       The build resumes from the first stage with changed inputs. Implies `checkpoint`.
+        :param fast: If True, build in fast mode. Undo recording, the evaluation manager and the viewport are
+                     suspended during the build and restored afterwards.
+        :param refreshPolicy: How often to refresh the viewport in fast mode. Valid values are in
+                              `fastBuild.RefreshPolicy`: never, after each stage or every `refreshInterval` components.
+        :param refreshInterval: Number of components between refreshes when using `RefreshPolicy.COMPONENT`.
         """
         if not self.rigEnvironment:
             logger.error(
@@ -592,42 +716,262 @@ class Builder(object):
             f"\n" f"Begin Rig Build\n{'-' * 70}\n" f"build env: {self.rigEnvironment}\n"
         )
 
-        self.runBuilderScripts(constants.PRE_SCRIPT)
+        # data taken by a previous build or changed since the rig file was set is read again
+        self.prefetchData()
 
-        self.importModel()
+        if profile:
+            self.buildProfiler = profiler.BuildProfiler(name=self.rigName or "build")
+            self.buildProfiler.start()
 
-        self.loadJoints()
+        runBuildSteps = self._runBuildSteps
+        if fast:
+            self.fastBuild = fastBuild.FastBuild(
+                refreshPolicy=refreshPolicy, refreshInterval=refreshInterval
+            )
+            runBuildSteps = decorators.suspendViewport(self._runBuildSteps)
+
+        try:
+            with self.fastBuild or contextlib.nullcontext():
+                runBuildSteps(
+                    publish=publish,
+                    savePublish=savePublish,
+                    versioning=versioning,
+                    checkpoint=checkpoint or resume,
+                    resume=resume,
+                )
+        finally:
+            self.fastBuild = None
+            if self.buildProfiler:
+                self.buildProfiler.stop()
+                self.buildProfiler.write(profileDirectory or self.PROFILES_DIRECTORY)
+                self.buildProfiler = None
 
-        self.loadComponents()
-        self.initialize()
-        self.guide()
+        endTime = time.time()
+        finalTime = endTime - startTime
 
-        self.loadGuides()
+        logger.info(
+            f"\nCompleted Rig Build \t -- time elapsed: {finalTime}\n{'-' * 70}\n"
+        )
 
-        self.build()
-        self.connect()
-        self.finalize()
-        self.loadPoseReaders()
-        self.runBuilderScripts(constants.POST_SCRIPT)
+    def _runBuildSteps(
+        self,
+        publish: bool = False,
+        savePublish: bool = True,
+        versioning: bool = True,
+        checkpoint: bool = False,
+        resume: bool = False,
+    ) -> None:
+        """
+        Run each step of the rig build. See `run` for details on the parameters.
+        """
+        buildStages = self.getBuildStages()
+        checkpointManager = None
+        firstStageIndex = 0
+
+        if checkpoint:
+            checkpointManager = _checkpoint.CheckpointManager(
+                self.getCheckpointDirectory()
+            )
+        if resume:
+            firstStageIndex = self._resumeFromCheckpoint(checkpointManager, buildStages)
+
+        # any checkpoint after the first stage we build was saved from a different scene and must be re-saved.
+        if checkpointManager:
+            checkpointManager.invalidate(list(buildStages.keys())[firstStageIndex:])
+
+        for stageName, stageSteps in list(buildStages.items())[firstStageIndex:]:
+            for stepName, stepFunction in stageSteps:
+                with self._profileStage(stepName):
+                    stepFunction()
 
-        self.loadControlShapes()
+            if self.fastBuild:
+                self.fastBuild.stageComplete()
 
-        self.loadDeformationLayers()
-        self.loadSkinWeights()
-        self.loadDeformers()
+            if checkpointManager:
+                stageInputs = _checkpoint.hashInputs(self.getStageInputs(stageName))
+                checkpointManager.save(stageName, stageInputs)
 
         if publish:
             # self.optimize()
-            self.runBuilderScripts(constants.PUB_SCRIPT)
+            with self._profileStage("pub scripts"):
+                self.runBuilderScripts(constants.PUB_SCRIPT)
             if savePublish:
-                self.publish(versioning=versioning)
-        endTime = time.time()
-        finalTime = endTime - startTime
+                with self._profileStage("publish"):
+                    self.publish(versioning=versioning)
+
+    def getBuildStages(self) -> Dict[str, List[Tuple[str, Callable]]]:
+        """
+        Get the stages of the rig build in the order they are run.
+        A stage is a group of build steps. When checkpointing, a checkpoint is saved at the end of each stage.
+
+        :return: ordered dictionary of stage names and a list of (step name, step function) for each stage
+        """
+        return OrderedDict(
+            [
+                (
+                    self.PRE_SCRIPTS_STAGE,
+                    [
+                        (
+                            "pre scripts",
+                            functools.partial(
+                                self.runBuilderScripts, constants.PRE_SCRIPT
+                            ),
+                        )
+                    ],
+                ),
+                (self.MODEL_STAGE, [("importModel", self.importModel)]),
+                (self.SKELETON_STAGE, [("loadJoints", self.loadJoints)]),
+                (
+                    self.COMPONENTS_STAGE,
+                    [
+                        ("loadComponents", self.loadComponents),
+                        ("initialize", self.initialize),
+                        ("guide", self.guide),
+                        ("loadGuides", self.loadGuides),
+                        ("build", self.build),
+                        ("connect", self.connect),
+                        ("finalize", self.finalize),
+                    ],
+                ),
+                (self.POSE_READERS_STAGE, [("loadPoseReaders", self.loadPoseReaders)]),
+                (
+                    self.POST_SCRIPTS_STAGE,
+                    [
+                        (
+                            "post scripts",
+                            functools.partial(
+                                self.runBuilderScripts, constants.POST_SCRIPT
+                            ),
+                        )
+                    ],
+                ),
+                (
+                    self.CONTROL_SHAPES_STAGE,
+                    [("loadControlShapes", self.loadControlShapes)],
+                ),
+                (
+                    self.DEFORMATION_LAYERS_STAGE,
+                    [("loadDeformationLayers", self.loadDeformationLayers)],
+                ),
+                (self.SKINS_STAGE, [("loadSkinWeights", self.loadSkinWeights)]),
+                (self.DEFORMERS_STAGE, [("loadDeformers", self.loadDeformers)]),
+            ]
+        )
 
-        logger.info(
-            f"\nCompleted Rig Build \t -- time elapsed: {finalTime}\n{'-' * 70}\n"
+    def getStageInputs(self, stageName: str) -> List[str]:
+        """
+        Get the absolute paths of every file used as an input to a build stage.
+        The rig file is an input to every stage. The component source files are an input to the components stage
+        so changes to the component code invalidate its checkpoint.
+
+        :param stageName: name of the build stage
+        :return: list of absolute file paths
+        """
+
+        def _absolutePaths(filepaths):
+            return [
+                self.getAbsolutePath(filepath) for filepath in common.toList(filepaths)
+            ]
+
+        def _scripts(scriptStep):
+            localScripts, inheritedScripts = self.getBuilderScripts(scriptStep)
+            return scriptManager.validateScriptList(localScripts + inheritedScripts)
+
+        stageInputs = {
+            self.PRE_SCRIPTS_STAGE: lambda: _scripts(constants.PRE_SCRIPT),
+            self.MODEL_STAGE: lambda: _absolutePaths(self.modelFile),
+            self.SKELETON_STAGE: lambda: _absolutePaths(self.jointFiles),
+            self.COMPONENTS_STAGE: lambda: _absolutePaths(self.componentFiles)
+            + _absolutePaths(self.guideFiles)
+            + componentManager.getComponentSourceFiles(),
+            self.POSE_READERS_STAGE: lambda: _absolutePaths(self.poseReadersFiles),
+            self.POST_SCRIPTS_STAGE: lambda: _scripts(constants.POST_SCRIPT),
+            self.CONTROL_SHAPES_STAGE: lambda: _absolutePaths(self.controlShapeFiles),
+            self.DEFORMATION_LAYERS_STAGE: lambda: _absolutePaths(
+                self.deformLayersFile
+            ),
+            self.SKINS_STAGE: lambda: _absolutePaths(self.skinsFile),
+            self.DEFORMERS_STAGE: lambda: _absolutePaths(self.deformerFiles),
+        }
+        if stageName not in stageInputs:
+            raise KeyError(f"'{stageName}' is not a valid build stage")
+
+        return [self.rigFile] + stageInputs[stageName]()
+
+    def getCheckpointDirectory(self) -> str:
+        """
+        Get the directory to store build checkpoints for the current rig file.
+        Each rig file gets its own directory within the `CHECKPOINTS_DIRECTORY`
+        """
+        rigFileHash = hashlib.sha1(
+            os.path.realpath(self.rigFile).encode("utf-8")
+        ).hexdigest()[:8]
+        return os.path.join(
+            self.CHECKPOINTS_DIRECTORY, f"{self.rigName or 'rig'}_{rigFileHash}"
         )
 
+    def _resumeFromCheckpoint(
+        self, checkpointManager: _checkpoint.CheckpointManager, buildStages: Dict
+    ) -> int:
+        """
+        Load the last valid checkpoint.
+
+        :param checkpointManager: checkpoint manager to load checkpoints from
+        :param buildStages: build stages. Generated with `getBuildStages`
+        :return: index of the first stage to build
+        """
+        stageNames = list(buildStages.keys())
+
+        firstStageIndex = len(stageNames)
+        for index, stageName in enumerate(stageNames):
+            stageInputs = _checkpoint.hashInputs(self.getStageInputs(stageName))
+            if not checkpointManager.isValid(stageName, stageInputs):
+                changedInputs = checkpointManager.getChangedInputs(
+                    stageName, stageInputs
+                )
+                logger.info(
+                    f"Resuming build from stage '{stageName}'. Changed inputs: {changedInputs}"
+                )
+                firstStageIndex = index
+                break
+
+        if firstStageIndex == 0:
+            return 0
+
+        checkpointManager.load(stageNames[firstStageIndex - 1])
+
+        if firstStageIndex > stageNames.index(self.COMPONENTS_STAGE):
+            self._restoreComponents()
+
+        return firstStageIndex
+
+    def _restoreComponents(self) -> None:
+        """
+        Re-create the component instances after loading a checkpoint.
+        The component instances are not stored in the scene, so they are loaded from the component files and
+        each component step is run again. The build step stored on the component container is already reached
+        so the steps only restore the component parameters from the container metadata.
+        """
+        self.loadComponents()
+        self._sortComponents()
+
+        for component in self.componentList:
+            component.initializeComponent()
+            component.guideComponent()
+            component.buildComponent()
+            component.connectComponent()
+            component.finalizeComponent()
+
+    def _profileStage(self, name: str, category: str = profiler.STEP):
+        """
+        Get a context manager to profile a stage of the build with the `buildProfiler`.
+        If the build is not being profiled this does nothing.
+
+        :param name: name of the stage
+        :param category: category of the stage
+        """
+        return profiler.stage(self.buildProfiler, name, category=category)
+
     # UTILITY FUNCTION TO PUBLISH THE RIG
     def publish(self, versioning: bool = True) -> None:
         """
@@ -688,7 +1032,14 @@ class Builder(object):
         logger.info("out rig published: {}  ({})".format(outputFileName, publishPath))
 
     def updateMaya(self) -> None:
-        """Update maya if in an interactive session"""
+        """
+        Update maya if in an interactive session.
+        During a fast build the refresh policy of the fast build decides if the viewport is refreshed.
+        """
+        if self.fastBuild:
+            self.fastBuild.componentComplete()
+            return
+
         # refresh the viewport after each component is built.
         if not om2.MGlobal.mayaState():
             cmds.refresh(force=True)
@@ -832,9 +1183,10 @@ class Builder(object):
             raise RuntimeError("'{0}' does not exist".format(rigFile))
         self.rigFile = rigFile
 
-        rigData = abstractData.AbstractData()
-        rigData.read(self.rigFile)
-        data = rigData.getData()
+        # data prefetched for the previous rig file is no longer needed
+        self.dataPrefetcher.cancel()
+
+        data = core.RigFile.get(self.rigFile).getData()
         if "rig_env" not in data:
             rigEnvironmentPath = "../"
         else:
@@ -869,13 +1221,15 @@ class Builder(object):
 
         logger.info("\nRig Environment path: {0}".format(self.rigEnvironment))
 
+        # start reading the data files now so they are ready by the time the build needs them.
+        self.prefetchData()
+
     def saveRigFile(self):
         """
         Save a rig file based on current instance property values.
         """
-        data = abstractData.AbstractData()
-        data.read(self.rigFile)
-        newData = data.getData()
+        rigFileModel = core.RigFile.get(self.rigFile)
+        newData = rigFileModel.getData()
 
         newBuilderData = {
             constants.RIG_NAME: self.rigName,
@@ -899,8 +1253,7 @@ class Builder(object):
 
         newData.update(newBuilderData)
 
-        data.setData(newData)
-        data.write(self.rigFile)
+        rigFileModel.write(newData)
 
         logger.info(f"data saved to : {self.rigFile}")
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: checkpoint.py
+    author: masonsmigel
+    date: 10/2026
+    description: Scene checkpoints for the rig builder.
+                 A checkpoint is a maya scene saved after a build stage along with a hash of every file
+                 that was used as an input to that stage.
+"""
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import maya.cmds as cmds
+
+from rigamajig2.maya.data import abstractData
+from rigamajig2.shared import common
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "checkpoints.json"
+CHECKPOINT_FILE_TYPE = "mayaBinary"
+MISSING = "missing"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hashFile(filepath: str) -> str:
+    """
+    Get a content hash of a file. If the path is a directory the hash is built from all files within it.
+
+    :param filepath: path to the file or directory to hash
+    :return: hex digest of the content. If the file does not exist `MISSING` is returned
+    """
+    if not filepath or not os.path.exists(filepath):
+        return MISSING
+
+    fileHash = hashlib.sha1()
+    if os.path.isdir(filepath):
+        for root, dirs, files in os.walk(filepath):
+            dirs.sort()
+            for fileName in sorted(files):
+                childPath = os.path.join(root, fileName)
+                fileHash.update(os.path.relpath(childPath, filepath).encode("utf-8"))
+                fileHash.update(hashFile(childPath).encode("utf-8"))
+        return fileHash.hexdigest()
+
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            fileHash.update(chunk)
+    return fileHash.hexdigest()
+
+
+def hashInputs(filepaths: List[str]) -> Dict[str, str]:
+    """
+    Get a dictionary of content hashes for a list of input files
+
+    :param filepaths: list of files or directories to hash
+    :return: dictionary of filepath and content hash
+    """
+    inputHashes = OrderedDict()
+    for filepath in common.toList(filepaths):
+        if filepath and filepath not in inputHashes:
+            inputHashes[filepath] = hashFile(filepath)
+    return inputHashes
+
+
+def combineHashes(inputHashes: Dict[str, str]) -> str:
+    """
+    Combine a dictionary of input hashes into a single hash
+
+    :param inputHashes: dictionary of filepath and content hash. Generated with `hashInputs`
+    :return: hex digest of all inputs
+    """
+    combinedHash = hashlib.sha1()
+    for filepath in sorted(inputHashes):
+        combinedHash.update(filepath.encode("utf-8"))
+        combinedHash.update(inputHashes[filepath].encode("utf-8"))
+    return combinedHash.hexdigest()
+
+
+class CheckpointManager(object):
+    """
+    Save and restore scene checkpoints for each stage of a build.
+
+    All checkpoints are stored in a single directory with a manifest that records the input hashes of each stage.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: directory to store the checkpoint scenes and manifest in
+        """
+        self.directory = directory
+        self._manifest = OrderedDict()
+
+        self.readManifest()
+
+    @property
+    def manifestPath(self) -> str:
+        """Path to the manifest file"""
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def readManifest(self) -> Dict:
+        """Read the manifest from disk"""
+        self._manifest = OrderedDict()
+        if os.path.exists(self.manifestPath):
+            manifestData = abstractData.AbstractData()
+            manifestData.read(self.manifestPath)
+            self._manifest = manifestData.getData()
+        return self._manifest
+
+    def writeManifest(self) -> None:
+        """Write the manifest to disk"""
+        manifestData = abstractData.AbstractData()
+        manifestData.setData(self._manifest)
+        manifestData.write(self.manifestPath)
+
+    def getCheckpointPath(self, stageName: str) -> str:
+        """Get the path of the checkpoint scene for a stage"""
+        return os.path.join(self.directory, f"{stageName}.mb")
+
+    def getStageHash(self, stageName: str) -> Optional[str]:
+        """Get the input hash recorded for a stage. Returns None if no valid checkpoint exists"""
+        stageData = self._manifest.get(stageName)
+        if not stageData or not os.path.exists(self.getCheckpointPath(stageName)):
+            return None
+        return stageData.get("hash")
+
+    def isValid(self, stageName: str, inputHashes: Dict[str, str]) -> bool:
+        """
+        Check if the checkpoint of a stage was saved with the same inputs
+
+        :param stageName: name of the stage to check
+        :param inputHashes: current input hashes of the stage
+        """
+        return self.getStageHash(stageName) == combineHashes(inputHashes)
+
+    def getChangedInputs(
+        self, stageName: str, inputHashes: Dict[str, str]
+    ) -> List[str]:
+        """
+        Get a list of the inputs that have changed since the checkpoint of a stage was saved
+
+        :param stageName: name of the stage to check
+        :param inputHashes: current input hashes of the stage
+        """
+        previousInputs = (self._manifest.get(stageName) or {}).get("inputs") or {}
+        return [
+            filepath
+            for filepath, fileHash in inputHashes.items()
+            if previousInputs.get(filepath) != fileHash
+        ]
+
+    def save(self, stageName: str, inputHashes: Dict[str, str]) -> str:
+        """
+        Save the current scene as the checkpoint for a stage. This does not change the current scene name.
+
+        :param stageName: name of the stage
+        :param inputHashes: input hashes of the stage
+        :return: path to the checkpoint scene
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        checkpointPath = self.getCheckpointPath(stageName)
+        cmds.file(
+            checkpointPath,
+            exportAll=True,
+            type=CHECKPOINT_FILE_TYPE,
+            force=True,
+            preserveReferences=True,
+        )
+
+        self._manifest[stageName] = OrderedDict(
+            hash=combineHashes(inputHashes),
+            inputs=inputHashes,
+        )
+        self.writeManifest()
+
+        logger.info(f"Checkpoint saved: {stageName} ({checkpointPath})")
+        return checkpointPath
+
+    def load(self, stageName: str) -> None:
+        """
+        Open the checkpoint scene for a stage
+
+        :param stageName: name of the stage to load
+        """
+        checkpointPath = self.getCheckpointPath(stageName)
+        if not os.path.exists(checkpointPath):
+            raise RuntimeError(f"No checkpoint exists for stage '{stageName}'")
+
+        cmds.file(checkpointPath, open=True, force=True, ignoreVersion=True)
+        logger.info(f"Checkpoint loaded: {stageName} ({checkpointPath})")
+
+    def invalidate(self, stageNames: List[str]) -> None:
+        """
+        Remove the manifest entries for a list of stages. Their checkpoints will no longer be valid.
+
+        :param stageNames: names of the stages to invalidate
+        """
+        for stageName in common.toList(stageNames):
+            self._manifest.pop(stageName, None)
+        self.writeManifest()
+
+    def clear(self) -> None:
+        """Remove all checkpoints and the manifest"""
+        for stageName in list(self._manifest.keys()):
+            checkpointPath = self.getCheckpointPath(stageName)
+            if os.path.exists(checkpointPath):
+                os.remove(checkpointPath)
+        if os.path.exists(self.manifestPath):
+            os.remove(self.manifestPath)
+        self._manifest = OrderedDict()
@@ -8,11 +8,12 @@
     description: 
 
 """
+import json
 import logging
 import os
 import pathlib
 from types import ModuleType
-from typing import Type, Dict
+from typing import Type, Dict, List, Optional
 
 from rigamajig2.maya.components import base
 from rigamajig2.shared import common
@@ -22,6 +23,8 @@ from rigamajig2.shared import process
 COMPONENTS_PATH = os.path.abspath(os.path.join(__file__, "../../components"))
 EXCLUDED_FOLDERS = []
 EXCLUDED_FILES = ["__init__.py", "base.py"]
+COMPONENT_INDEX_FILE = ".componentIndex.json"
+COMPONENT_INDEX_VERSION = 1
 
 logger = logging.getLogger(__name__)
 
@@ -30,40 +33,29 @@ ComponentType = Type[base.BaseComponent]
 
 def findComponents(path: str = COMPONENTS_PATH) -> Dict[str, ModuleType]:
     """
-    Find all valid components within a folder
+    Find all valid components within a folder.
+    This imports every component module. To list the available components use `getComponentTypes`.
+
     :param path: path to search for components
-    :return: dictionary of component type and full python dot separated path.
+    :return: dictionary of component type and component module.
     """
-
-    path = rig_path.cleanPath(path)
-    pathContents = os.listdir(path)
+    registry = getRegistry(path)
 
     componentLookup = dict()
-    for filePathItem in pathContents:
-        filePath = pathlib.Path(path) / filePathItem
-
-        if str(filePath.name) not in EXCLUDED_FOLDERS and filePath.is_dir():
-            componentLookup.update(findComponents(str(filePath)))
-
-        if filePath.suffix == ".py" and filePath.name not in EXCLUDED_FILES:
-            module = process.importModuleFromPath(filePath)
-            components = process.getSubclassesFromModule(
-                module=module, classType=base.BaseComponent
-            )
+    for componentType in registry.getComponentTypes():
+        componentLookup[componentType] = registry.getComponentModule(componentType)
+    return componentLookup
 
-            logger.debug(f"Module:{module}: components: {components}")
 
-            if components:
-                if len(components) > 1:
-                    logger.warning(
-                        f"Component modules should only contain one Component class. {module.__name__}"
-                    )
+def getComponentSourceFiles(path: str = COMPONENTS_PATH) -> List[str]:
+    """
+    Get all python source files within a component folder. This includes the component base class.
+    Modules are not imported.
 
-                componentType = formatComponentTypeFromModule(
-                    modulePath=module.__name__
-                )
-                componentLookup[componentType] = module
-    return componentLookup
+    :param path: path to search for component source files
+    :return: sorted list of absolute file paths
+    """
+    return sorted(str(filePath) for filePath in pathlib.Path(path).rglob("*.py"))
 
 
 def formatComponentTypeFromModule(modulePath: str) -> str:
@@ -84,20 +76,16 @@ def createComponentClassInstance(componentType: str) -> ComponentType:
     :param componentType: type of the component to get the class instance from. (limb.limb)
     :return: instance to the component.
     """
-    componentLookup = findComponents(COMPONENTS_PATH)
+    return getRegistry().getComponentClass(componentType)
 
-    componentKey = getComponentLookupKey(componentType, componentLookup)
-    moduleObject = componentLookup.get(componentKey)
 
-    if not moduleObject:
-        raise ValueError(
-            f"Component type {componentType} is not valid. Valid Types are {componentLookup.keys()}"
-        )
-
-    componentInstances = process.getSubclassesFromModule(
-        moduleObject, classType=base.BaseComponent
-    )
-    return common.getFirst(componentInstances)
+def getComponentTypes(path: str = COMPONENTS_PATH) -> List[str]:
+    """
+    Get a list of all valid component types within a folder
+    :param path: path to search for components
+    :return: list of component types `(component.name)`
+    """
+    return getRegistry(path).getComponentTypes()
 
 
 def getComponentLookupKey(
@@ -120,3 +108,247 @@ def getComponentLookupKey(
             componentType = tempModuleName
 
     return componentType
+
+
+class ComponentRegistry(object):
+    """
+    Index of all components within a folder.
+
+    Component modules are only imported once to build the index. The index stores the module path and class name
+    of each component type and is saved next to the components so future sessions can skip the import entirely.
+    Modules are imported lazily the first time a component type is requested.
+    Both the index and imported classes are invalidated when the modification time of a module changes.
+    """
+
+    def __init__(self, path: str = COMPONENTS_PATH, indexFile: str = None):
+        """
+        :param path: path to search for components
+        :param indexFile: path to save the component index. By default it is saved within the component path
+        """
+        self.path = rig_path.cleanPath(path)
+        self.indexFile = indexFile or os.path.join(self.path, COMPONENT_INDEX_FILE)
+
+        # {relativeFilePath: {"mtime": float, "components": {componentType: className}}}
+        self._fileIndex = None
+        # {componentType: (relativeFilePath, className)}
+        self._componentIndex = dict()
+        # {relativeFilePath: (mtime, module)}
+        self._moduleCache = dict()
+
+    def getComponentTypes(self) -> List[str]:
+        """
+        Get a list of all component types in the registry.
+        The index is refreshed if modules were added, removed or modified since it was built.
+        """
+        if self._isIndexStale():
+            self.refresh()
+        return list(self._componentIndex.keys())
+
+    def getComponentModulePath(self, componentType: str) -> Optional[str]:
+        """
+        Get the absolute path to the module containing a component type.
+
+        :param componentType: type of the component. (limb.limb)
+        :return: path to the module or None if the component type does not exist
+        """
+        componentKey = self._getComponentKey(componentType)
+        if componentKey not in self._componentIndex:
+            return None
+
+        relativePath, _ = self._componentIndex[componentKey]
+        return os.path.join(self.path, relativePath)
+
+    def getComponentModule(self, componentType: str) -> ModuleType:
+        """
+        Get the module containing a component type. The module is only imported if it has not been imported yet
+        or if it has been modified since it was imported.
+
+        :param componentType: type of the component. (limb.limb)
+        :return: module object
+        """
+        componentKey = self._getComponentKey(componentType)
+        if componentKey not in self._componentIndex:
+            raise ValueError(
+                f"Component type {componentType} is not valid. Valid Types are {self.getComponentTypes()}"
+            )
+
+        relativePath, _ = self._componentIndex[componentKey]
+        return self._importModule(relativePath)
+
+    def getComponentClass(self, componentType: str) -> ComponentType:
+        """
+        Get the component class of a component type.
+
+        :param componentType: type of the component. (limb.limb)
+        :return: component class
+        """
+        componentKey = self._getComponentKey(componentType)
+        moduleObject = self.getComponentModule(componentKey)
+
+        _, className = self._componentIndex[componentKey]
+        componentClass = getattr(moduleObject, className, None)
+        if componentClass is None:
+            # the class was renamed since the index was built.
+            componentClass = common.getFirst(
+                process.getSubclassesFromModule(
+                    moduleObject, classType=base.BaseComponent
+                )
+            )
+        return componentClass
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Update the index. Only modules that are new or have been modified since the index was built are imported.
+
+        :param force: rebuild the index from scratch, importing every module.
+        """
+        previousFileIndex = dict() if force else self._readIndexFile()
+        if not force and self._fileIndex:
+            previousFileIndex.update(self._fileIndex)
+
+        fileIndex = dict()
+        for filePath in self._findModuleFiles(self.path):
+            relativePath = os.path.relpath(str(filePath), self.path)
+            mtime = os.path.getmtime(filePath)
+
+            previousEntry = previousFileIndex.get(relativePath)
+            if previousEntry and previousEntry.get("mtime") == mtime:
+                fileIndex[relativePath] = previousEntry
+                continue
+
+            module = self._importModule(relativePath, mtime=mtime)
+            components = process.getSubclassesFromModule(
+                module=module, classType=base.BaseComponent
+            )
+            logger.debug(f"Module:{module}: components: {components}")
+
+            componentEntries = dict()
+            if components:
+                if len(components) > 1:
+                    logger.warning(
+                        f"Component modules should only contain one Component class. {module.__name__}"
+                    )
+                componentType = formatComponentTypeFromModule(
+                    modulePath=module.__name__
+                )
+                componentEntries[componentType] = components[0].__name__
+
+            fileIndex[relativePath] = {"mtime": mtime, "components": componentEntries}
+
+        indexChanged = fileIndex != previousFileIndex
+        self._setFileIndex(fileIndex)
+        if indexChanged:
+            self._writeIndexFile()
+
+    def _ensureIndex(self) -> None:
+        """Build the index if it has not been built yet"""
+        if self._fileIndex is None:
+            self.refresh()
+
+    def _isIndexStale(self) -> bool:
+        """Check if the index has not been built or the module files in the folder changed since it was built"""
+        if self._fileIndex is None:
+            return True
+
+        moduleFiles = self._findModuleFiles(self.path)
+        if len(moduleFiles) != len(self._fileIndex):
+            return True
+
+        for filePath in moduleFiles:
+            fileEntry = self._fileIndex.get(os.path.relpath(str(filePath), self.path))
+            if not fileEntry or fileEntry["mtime"] != os.path.getmtime(filePath):
+                return True
+        return False
+
+    def _setFileIndex(self, fileIndex: Dict) -> None:
+        self._fileIndex = fileIndex
+        self._componentIndex = dict()
+        for relativePath, fileEntry in fileIndex.items():
+            for componentType, className in fileEntry["components"].items():
+                self._componentIndex[componentType] = (relativePath, className)
+
+    def _getComponentKey(self, componentType: str) -> str:
+        """
+        Get the lookup key of a component type. If the component type is not in the index or its module has been
+        modified since the index was built the index is refreshed.
+        """
+        self._ensureIndex()
+
+        componentKey = getComponentLookupKey(componentType, self._componentIndex)
+        if componentKey in self._componentIndex:
+            relativePath, _ = self._componentIndex[componentKey]
+            filePath = os.path.join(self.path, relativePath)
+            if (
+                os.path.exists(filePath)
+                and os.path.getmtime(filePath) == self._fileIndex[relativePath]["mtime"]
+            ):
+                return componentKey
+
+        # the component is new, moved or modified.
+        self.refresh()
+        return getComponentLookupKey(componentType, self._componentIndex)
+
+    def _importModule(self, relativePath: str, mtime: float = None) -> ModuleType:
+        """Import a module or get it from the cache if it has not been modified since it was last imported"""
+        filePath = pathlib.Path(self.path) / relativePath
+        if mtime is None:
+            mtime = os.path.getmtime(filePath)
+
+        cachedModule = self._moduleCache.get(relativePath)
+        if cachedModule and cachedModule[0] == mtime:
+            return cachedModule[1]
+
+        module = process.importModuleFromPath(filePath)
+        self._moduleCache[relativePath] = (mtime, module)
+        return module
+
+    def _findModuleFiles(self, path: str) -> List[pathlib.Path]:
+        """Find all python files that could contain a component"""
+        moduleFiles = list()
+        for filePath in sorted(pathlib.Path(path).iterdir()):
+            if str(filePath.name) not in EXCLUDED_FOLDERS and filePath.is_dir():
+                moduleFiles += self._findModuleFiles(str(filePath))
+
+            if filePath.suffix == ".py" and filePath.name not in EXCLUDED_FILES:
+                moduleFiles.append(filePath)
+        return moduleFiles
+
+    def _readIndexFile(self) -> Dict:
+        """Read the saved index. Returns an empty index if the file does not exist or is out of date"""
+        if not os.path.exists(self.indexFile):
+            return dict()
+        try:
+            with open(self.indexFile, "r") as f:
+                indexData = json.load(f)
+        except (OSError, ValueError):
+            logger.debug(f"Failed to read component index: {self.indexFile}")
+            return dict()
+
+        if indexData.get("version") != COMPONENT_INDEX_VERSION:
+            return dict()
+        return indexData.get("files", dict())
+
+    def _writeIndexFile(self) -> None:
+        """Save the index. The index is only a cache so failing to write it is not an error"""
+        indexData = {"version": COMPONENT_INDEX_VERSION, "files": self._fileIndex}
+        try:
+            with open(self.indexFile, "w") as f:
+                json.dump(indexData, f, indent=4)
+        except OSError:
+            logger.debug(f"Failed to write component index: {self.indexFile}")
+
+
+_registries = dict()
+
+
+def getRegistry(path: str = COMPONENTS_PATH) -> ComponentRegistry:
+    """
+    Get the component registry for a folder. Only one registry is created per folder.
+
+    :param path: path to search for components
+    :return: component registry
+    """
+    path = rig_path.cleanPath(path)
+    if path not in _registries:
+        _registries[path] = ComponentRegistry(path)
+    return _registries[path]
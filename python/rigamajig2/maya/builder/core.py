@@ -8,10 +8,13 @@
     description: This module contains utilities for the builder
 
 """
+import copy
 import glob
 import logging
 import os
 import shutil
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from rigamajig2.maya.builder import constants
 from rigamajig2.maya.data import abstractData
@@ -23,21 +26,68 @@ logger = logging.getLogger(__name__)
 SCRIPT_FOLDER_CONSTANTS = ["pre_scripts", "post_scripts", "pub_scripts"]
 
 
-def getAvailableArchetypes():
+# cached archetype rig files. Rebuilt when the archetypes directory or one of its folders changes
+_archetypeCache = {"stamp": None, "rigFiles": OrderedDict()}
+
+
+def _getPathStamp(path: str) -> Optional[Tuple[int, int]]:
+    """Get the modification time and size of a path. Returns None if the path does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _getArchetypesStamp() -> Tuple:
+    """Get a stamp of the archetypes directory and each folder within it"""
+    stamps = [_getPathStamp(common.ARCHETYPES_PATH)]
+    for archetype in _archetypeCache["rigFiles"]:
+        stamps.append(_getPathStamp(os.path.join(common.ARCHETYPES_PATH, archetype)))
+    return tuple(stamps)
+
+
+def getArchetypeRigFiles() -> Dict[str, str]:
     """
-    get a list of available archetypes. Archetypes are defined as a folder containing a .rig file.
-    :return: list of archetypes
+    Get the rig file of each available archetype.
+    The result is cached until the contents of the archetypes directory change.
+
+    :return: dictionary of archetype name and path to its rig file
     """
-    archetypeList = list()
+    if _archetypeCache["stamp"] is not None:
+        if _archetypeCache["stamp"] == _getArchetypesStamp():
+            return _archetypeCache["rigFiles"]
 
-    pathContents = os.listdir(common.ARCHETYPES_PATH)
-    for archetype in pathContents:
+    rigFiles = OrderedDict()
+    for archetype in sorted(os.listdir(common.ARCHETYPES_PATH)):
         archetypePath = os.path.join(common.ARCHETYPES_PATH, archetype)
         if archetype.startswith("."):
             continue
-        if findRigFile(archetypePath):
-            archetypeList.append(archetype)
-    return archetypeList
+        archetypeRigFile = findRigFile(archetypePath)
+        if archetypeRigFile:
+            rigFiles[archetype] = archetypeRigFile
+
+    _archetypeCache["rigFiles"] = rigFiles
+    _archetypeCache["stamp"] = _getArchetypesStamp()
+    return rigFiles
+
+
+def getArchetypeRigFile(archetype: str) -> Optional[str]:
+    """
+    Get the rig file of an archetype
+
+    :param archetype: name of the archetype
+    :return: path to the archetype rig file. None if the archetype is not available
+    """
+    return getArchetypeRigFiles().get(archetype)
+
+
+def getAvailableArchetypes():
+    """
+    get a list of available archetypes. Archetypes are defined as a folder containing a .rig file.
+    :return: list of archetypes
+    """
+    return list(getArchetypeRigFiles().keys())
 
 
 def findRigFile(path):
@@ -74,16 +124,13 @@ def newRigEnvironmentFromArchetype(newEnv, archetype, rigName=None):
         sourceEnvironment=archetypePath, targetEnvironment=newEnv, rigName=rigName
     )
 
-    data = abstractData.AbstractData()
-    data.read(rigFile)
-
-    newData = data.getData()
+    rigFileModel = RigFile.get(rigFile)
+    newData = rigFileModel.getData()
     newData[constants.BASE_ARCHETYPE] = archetype
     newData[constants.PRE_SCRIPT] = list()
     newData[constants.POST_SCRIPT] = list()
     newData[constants.PUB_SCRIPT] = list()
-    data.setData(newData)
-    data.write(rigFile)
+    rigFileModel.write(newData)
 
     # delete the contents of the scripts folders as they should be constructed from
     # previous inheritance. Keeping them here will duplicate the execution.
@@ -113,13 +160,10 @@ def createRigEnvironment(sourceEnvironment, targetEnvironment, rigName):
 
     os.rename(srcRigFile, rigFile)
 
-    data = abstractData.AbstractData()
-    data.read(rigFile)
-
-    newData = data.getData()
+    rigFileModel = RigFile.get(rigFile)
+    newData = rigFileModel.getData()
     newData[constants.RIG_NAME] = rigName
-    data.setData(newData)
-    data.write(rigFile)
+    rigFileModel.write(newData)
 
     logger.info("New rig environment created: {}".format(tgtEnvPath))
     return os.path.join(tgtEnvPath, rigFile)
@@ -135,11 +179,145 @@ def getRigData(rigFile, key):
     if not rigFile:
         return None
 
-    if not os.path.exists(rigFile):
-        raise RuntimeError("rig file at {} does not exist".format(rigFile))
+    return RigFile.get(rigFile).getValue(key)
+
+
+class RigFile(object):
+    """
+    In memory model of a .rig file.
+
+    The file is only parsed when it changes on disk (checked by modification time and size).
+    The archetype parents of the rig file are cached models too, so walking the inheritance chain
+    does not read or list any files that have not changed.
+
+    Instances are shared per file, use `RigFile.get` to access them.
+
+    Example:
+        >>> rigFile = RigFile.get("path/to/myRig.rig")
+        >>> rigFile.getValue("model_file")
+        >>> rigFile.getInheritanceChain()
+    """
+
+    _instances = dict()
+
+    def __init__(self, filepath: str):
+        """
+        :param filepath: path to the .rig file
+        """
+        self.filepath = os.path.realpath(filepath)
+
+        self._data = None
+        self._stamp = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}('{self.filepath}')"
+
+    @classmethod
+    def get(cls, filepath: str) -> "RigFile":
+        """
+        Get the shared rig file model for a file
+
+        :param filepath: path to the .rig file
+        :return: rig file model
+        """
+        key = os.path.realpath(filepath)
+        if key not in cls._instances:
+            cls._instances[key] = cls(key)
+        return cls._instances[key]
+
+    @classmethod
+    def clearCache(cls) -> None:
+        """Clear all cached rig file models"""
+        cls._instances = dict()
+
+    @property
+    def rigEnvironment(self) -> str:
+        """Directory of the rig file. Relative paths stored in the rig file are relative to this directory"""
+        return os.path.dirname(self.filepath)
+
+    def isStale(self) -> bool:
+        """Check if the file has changed on disk since it was last read"""
+        return self._data is None or _getPathStamp(self.filepath) != self._stamp
+
+    def invalidate(self) -> None:
+        """Force the file to be read again the next time it is accessed"""
+        self._data = None
+        self._stamp = None
+
+    def _getLocalData(self) -> Dict:
+        """Get the cached local data. Reads the file if it has changed"""
+        if self.isStale():
+            if not os.path.exists(self.filepath):
+                raise RuntimeError(
+                    "rig file at {} does not exist".format(self.filepath)
+                )
+
+            stamp = _getPathStamp(self.filepath)
+            data = abstractData.AbstractData()
+            data.read(self.filepath)
+
+            self._data = data.getData()
+            self._stamp = stamp
+        return self._data
+
+    def getData(self) -> Dict:
+        """Get a copy of the data stored in this rig file, without inherited values"""
+        return copy.deepcopy(self._getLocalData())
+
+    def getValue(self, key: str, default: Any = None) -> Any:
+        """
+        Get a value stored in this rig file, without inherited values
+
+        :param key: name of the key to get
+        :param default: value returned if the key does not exist
+        """
+        data = self._getLocalData()
+        if key in data:
+            return copy.deepcopy(data[key])
+        return default
+
+    def write(self, data: Dict) -> None:
+        """
+        Write new data to the rig file
+
+        :param data: dictionary of data to write
+        """
+        rigData = abstractData.AbstractData()
+        rigData.setData(data)
+        rigData.write(self.filepath)
+        self.invalidate()
+
+    def getArchetypeParents(self) -> List["RigFile"]:
+        """Get the rig file models of the archetype parents of this rig file"""
+        parents = list()
+        for archetype in common.toList(self.getValue(constants.BASE_ARCHETYPE)):
+            if not archetype:
+                continue
+            archetypeRigFile = getArchetypeRigFile(archetype)
+            if archetypeRigFile:
+                parents.append(RigFile.get(archetypeRigFile))
+        return parents
+
+    def getInheritanceChain(self) -> List[Tuple[int, "RigFile"]]:
+        """
+        Get this rig file and all of its archetype parents, depth first.
+        Parents that are already within their own inheritance path are skipped to avoid cycles.
+
+        :return: list of the recursion level and the rig file model
+        """
+        chain = list()
+
+        def _addToChain(rigFile, recursionLevel, inheritancePath):
+            chain.append((recursionLevel, rigFile))
+            for parent in rigFile.getArchetypeParents():
+                if parent.filepath in inheritancePath:
+                    logger.warning(
+                        f"Cyclic archetype inheritance found in: {rigFile.filepath}"
+                    )
+                    continue
+                _addToChain(
+                    parent, recursionLevel + 1, inheritancePath + [parent.filepath]
+                )
 
-    data = abstractData.AbstractData()
-    data.read(rigFile)
-    if key in data.getData():
-        return data.getData()[key]
-    return None
+        _addToChain(self, 0, [self.filepath])
+        return chain
@@ -11,6 +11,7 @@
 import logging
 import os
 import typing
+from collections import OrderedDict
 
 from maya import cmds as cmds
 
@@ -18,20 +19,18 @@ from rigamajig2.maya import joint
 from rigamajig2.maya import meta
 from rigamajig2.maya import skinCluster
 from rigamajig2.maya.builder import dataManager
+from rigamajig2.maya.builder import prefetch
 from rigamajig2.maya.builder.constants import DEFORMER_DATA_TYPES
 from rigamajig2.maya.data import (
-    psdData,
     skinData,
     deformLayerData,
-    jointData,
-    curveData,
-    guideData,
     abstractData,
     componentData,
 )
 from rigamajig2.maya.rig import psd
 from rigamajig2.shared import common
 from rigamajig2.shared import path
+from rigamajig2.shared import serialization
 from rigamajig2.ui.widgets import mayaMessageBox
 
 logger = logging.getLogger(__name__)
@@ -70,10 +69,10 @@ def gatherLayeredSaveData(
     :return: dictonary containing info about all nodes added, changed and removed from each file.
     """
 
-    dataModules = list(dataManager.getDataModules(dataManager.DATA_PATH).keys())
-    if dataType not in dataModules:
+    dataTypes = dataManager.getDataTypes()
+    if dataType not in dataTypes:
         raise ValueError(
-            f"Data type {dataType} is not valid. Valid Types are {dataModules}"
+            f"Data type {dataType} is not valid. Valid Types are {dataTypes}"
         )
 
     if method not in ["new", "merge", "overwrite"]:
@@ -97,9 +96,7 @@ def gatherLayeredSaveData(
     sourceNodesDict = dict()
     sourceNodesList = set()
     for dataFile in filteredFileStack:
-        dataClass = dataManager.createDataClassInstance(dataType=dataType)
-        dataClass.read(dataFile)
-        nodes = dataClass.getKeys()
+        nodes = abstractData.AbstractData.readKeys(dataFile)
         sourceNodesDict[dataFile] = nodes
 
         sourceNodesList.update(nodes)
@@ -272,11 +269,14 @@ def performLayeredSave(
 
 
 # Joints
-def loadJointData(filepath: str = None) -> bool:
+def loadJointData(
+    filepath: str = None, prefetcher: prefetch.DataPrefetcher = None
+) -> bool:
     """
     Load all joints for the builder
 
     :param filepath: path to joint file
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
     """
     if not path.validatePathExists(filepath):
@@ -286,8 +286,7 @@ def loadJointData(filepath: str = None) -> bool:
         logger.error(f"filepath {filepath} is not a file")
         return False
 
-    dataObj = jointData.JointData()
-    dataObj.read(filepath)
+    dataObj = prefetch.readData(filepath, "JointData", prefetcher=prefetcher)
     dataObj.applyAllData()
 
     # tag all bind joints
@@ -429,11 +428,12 @@ def loadComponentData(builder: _Builder, filepath: str = None) -> None:
 
 
 # Guides
-def loadGuideData(filepath=None) -> bool:
+def loadGuideData(filepath=None, prefetcher: prefetch.DataPrefetcher = None) -> bool:
     """
     Load guide data
 
     :param filepath: path to guide data to save
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
     """
     if not path.validatePathExists(filepath):
@@ -442,8 +442,7 @@ def loadGuideData(filepath=None) -> bool:
         logger.error(f"filepath {filepath} is not a file")
         return False
 
-    dataObj = guideData.GuideData()
-    dataObj.read(filepath)
+    dataObj = prefetch.readData(filepath, "GuideData", prefetcher=prefetcher)
     dataObj.applyAllData()
     return True
 
@@ -482,12 +481,17 @@ def gatherGuides() -> _StringList:
     return meta.getTagged("guide")
 
 
-def loadControlShapeData(filepath: str = None, applyColor: bool = True) -> bool:
+def loadControlShapeData(
+    filepath: str = None,
+    applyColor: bool = True,
+    prefetcher: prefetch.DataPrefetcher = None,
+) -> bool:
     """
     Load the control shapes
 
     :param filepath: path to control shape
     :param applyColor: Apply the control colors.
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
     """
     if not path.validatePathExists(filepath):
@@ -496,8 +500,7 @@ def loadControlShapeData(filepath: str = None, applyColor: bool = True) -> bool:
         logger.error(f"filepath {filepath} is not a file")
         return False
 
-    curveDataObj = curveData.CurveData()
-    curveDataObj.read(filepath)
+    curveDataObj = prefetch.readData(filepath, "CurveData", prefetcher=prefetcher)
 
     controls = [ctl for ctl in curveDataObj.getKeys() if cmds.objExists(ctl)]
     curveDataObj.applyData(controls, create=True, applyColor=applyColor)
@@ -569,12 +572,17 @@ def gatherPoseReaders() -> _StringList:
     return [psd.getAssociateJoint(p) for p in meta.getTagged("poseReader")]
 
 
-def loadPoseReaderData(filepath: str = None, replace: bool = True) -> bool:
+def loadPoseReaderData(
+    filepath: str = None,
+    replace: bool = True,
+    prefetcher: prefetch.DataPrefetcher = None,
+) -> bool:
     """
     Load pose readers
 
     :param filepath: path to the pose reader file
     :param replace: If true replace existing pose readers.
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
     """
     if not path.validatePathExists(filepath):
@@ -583,17 +591,21 @@ def loadPoseReaderData(filepath: str = None, replace: bool = True) -> bool:
         logger.error(f"filepath {filepath} is not a file")
         return False
 
-    dataObj = psdData.PSDData()
-    dataObj.read(filepath)
+    dataObj = prefetch.readData(filepath, "PSDData", prefetcher=prefetcher)
     dataObj.applyData(nodes=dataObj.getData().keys(), replace=replace)
     return True
 
 
 # SKIN WEIGHTS
-def loadSkinWeightData(filepath=None) -> bool:
+def loadSkinWeightData(
+    filepath=None, prefetcher: prefetch.DataPrefetcher = None
+) -> bool:
     """
-    Load all skinweights within the folder
+    Load all skinweights within the folder.
+    When loading a folder the files are decoded on a thread pool while maya applies the previous file.
+
     :param filepath: path to skin weights directory
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
 
     """
@@ -602,21 +614,30 @@ def loadSkinWeightData(filepath=None) -> bool:
 
     root, ext = os.path.splitext(filepath)
     if ext:
-        loadSingleSkin(filepath)
+        loadSingleSkin(filepath, prefetcher=prefetcher)
     else:
-        files = os.listdir(filepath)
-        for f in files:
-            eachFile = os.path.join(filepath, f)
-            _, fileExtension = os.path.splitext(eachFile)
-            if fileExtension == ".json":
-                loadSingleSkin(eachFile)
+        files = prefetch.DataPrefetcher.expandPaths(filepath)
+
+        # files already prefetched by the builder are not read again
+        localPrefetcher = None
+        if prefetcher is None:
+            prefetcher = localPrefetcher = prefetch.DataPrefetcher()
+        prefetcher.prefetch(files, dataType="SkinData")
+
+        try:
+            for eachFile in files:
+                loadSingleSkin(eachFile, prefetcher=prefetcher)
+        finally:
+            if localPrefetcher:
+                localPrefetcher.cancel()
     return True
 
 
-def loadSingleSkin(filepath) -> bool:
+def loadSingleSkin(filepath, prefetcher: prefetch.DataPrefetcher = None) -> bool:
     """
     load a single skin weight file
     :param filepath: path to skin weight file
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return:
     """
     if not path.isFile(filepath):
@@ -624,30 +645,115 @@ def loadSingleSkin(filepath) -> bool:
         return False
 
     if filepath:
-        dataObj = skinData.SkinData()
-        dataObj.read(filepath)
+        dataObj = prefetch.readData(filepath, "SkinData", prefetcher=prefetcher)
         dataObj.applyAllData()
     return True
 
 
-def saveSkinWeights(filepath: str = None) -> None:
+def _getSkinFile(
+    directory: str, geo: str, fileFormat: str = None
+) -> typing.Tuple[str, str]:
+    """
+    Get the file to save the skin weights of a mesh to in a skin directory.
+
+    :param directory: skin weights directory
+    :param geo: name of the mesh
+    :param fileFormat: Optional- format to save the mesh in. If None the format of the existing file of the mesh is
+                       kept and new meshes are saved as binary files.
+    :return: path of the skin file and its file format
     """
-    Save skin weights for selected object
+    fileBase = "{}/{}".format(directory, geo)
+    if not fileFormat:
+        for extension in serialization.DATA_FILE_EXTENSIONS:
+            existingFile = fileBase + extension
+            if os.path.isfile(existingFile):
+                return existingFile, serialization.detectFormat(existingFile)
+        fileFormat = serialization.BINARY
+
+    return fileBase + serialization.getFileExtension(fileFormat), fileFormat
+
+
+def _removeConvertedSkinFiles(skinFile: str) -> None:
+    """
+    Remove the files of a mesh that were saved in a different format than its new skin file.
+    The skin loader reads every data file in a directory so the old file would be loaded as well.
+
+    :param skinFile: skin file the mesh was converted to
+    """
+    fileBase, extension = os.path.splitext(skinFile)
+    for ext in serialization.DATA_FILE_EXTENSIONS:
+        staleFile = fileBase + ext
+        if ext != extension and os.path.isfile(staleFile):
+            os.remove(staleFile)
+            logger.info(f"Removed converted skin file: {staleFile}")
+
+
+def saveSkinWeights(
+    filepath: str = None,
+    fileFormat: str = None,
+    maxError: float = None,
+    incremental: bool = True,
+) -> _StringList:
+    """
+    Save skin weights for selected object.
+    When saving to a directory the weights of each mesh are gathered from maya while the files of the previous
+    meshes are encoded and written on a thread pool. Each mesh keeps the format of its existing file and new meshes
+    are saved as binary files. Most of the binary encoding is compressing arrays which releases the GIL, while json
+    encoding holds it for the whole file so json files are effectively written one at a time.
+
+    Passing a file format converts the saved meshes to it. The files of those meshes in other formats are removed.
+
+    Incremental directory saves compare the weights of each mesh against the hashes stored in the skin manifest
+    of the directory and only write the files of meshes that changed. See `skinData.SkinManifest`.
 
     :param filepath: path to skin weights directory
+    :param fileFormat: Optional- convert the files written when saving to a directory to this format.
+                       See `serialization.getFileFormats`.
+    :param maxError: Optional- store the weights as 16 bit fixed point values with this maximum absolute error
+    :param incremental: only write the files of meshes that changed since the last save to the directory
+    :return: list of files written
     """
     if path.isFile(filepath):
-        dataObj = skinData.SkinData()
+        dataObj = skinData.SkinData(maxError=maxError)
         dataObj.gatherDataIterate(cmds.ls(sl=True))
         dataObj.write(filepath)
+        return [filepath]
 
-    else:
+    manifest = skinData.SkinManifest.read(filepath)
+
+    skippedNodes = list()
+    writtenNodes = list()
+    with prefetch.DataWriter() as dataWriter:
         for geo in cmds.ls(sl=True):
             if not skinCluster.getSkinCluster(geo):
                 continue
-            dataObj = skinData.SkinData()
+            dataObj = skinData.SkinData(maxError=maxError)
             dataObj.gatherData(geo)
-            dataObj.write("{}/{}.json".format(filepath, geo))
+
+            skinFile, skinFileFormat = _getSkinFile(filepath, geo, fileFormat)
+            nodeHashes = {node: dataObj.getHash(node) for node in dataObj.getKeys()}
+            if incremental and not any(
+                manifest.needsWrite(node, skinFile, nodeHash)
+                for node, nodeHash in nodeHashes.items()
+            ):
+                skippedNodes.extend(nodeHashes.keys())
+                continue
+
+            for node, nodeHash in nodeHashes.items():
+                writtenNodes.append((node, skinFile, nodeHash))
+            dataWriter.write(dataObj, skinFile, fileFormat=skinFileFormat)
+
+    # the file hashes are stored once the files are finished writing
+    for node, skinFile, nodeHash in writtenNodes:
+        if fileFormat:
+            _removeConvertedSkinFiles(skinFile)
+        manifest.update(node, skinFile, nodeHash)
+    manifest.write()
+
+    logger.info(
+        f"Saved {len(writtenNodes)} skin files. Skipped {len(skippedNodes)} unchanged skin files."
+    )
+    return list(OrderedDict.fromkeys(skinFile for _, skinFile, _ in writtenNodes))
 
 
 def saveDeformationLayers(filepath: str = None) -> None:
@@ -664,11 +770,14 @@ def saveDeformationLayers(filepath: str = None) -> None:
     dataObj.write(filepath)
 
 
-def loadDeformationLayerData(filepath: str = None) -> bool:
+def loadDeformationLayerData(
+    filepath: str = None, prefetcher: prefetch.DataPrefetcher = None
+) -> bool:
     """
     Load the deformation layers
 
     :param filepath: path to the deformation layers file
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
     """
     if not path.validatePathExists(filepath):
@@ -677,17 +786,19 @@ def loadDeformationLayerData(filepath: str = None) -> bool:
         logger.error(f"filepath {filepath} is not a file")
         return False
 
-    dataObj = deformLayerData.DeformLayerData()
-    dataObj.read(filepath)
+    dataObj = prefetch.readData(filepath, "DeformLayerData", prefetcher=prefetcher)
     dataObj.applyAllData()
     return True
 
 
-def loadDeformer(filepath: str = None) -> bool:
+def loadDeformer(
+    filepath: str = None, prefetcher: prefetch.DataPrefetcher = None
+) -> bool:
     """
     Loads all additional deformation data for the rig.
 
     :param filepath: path to the data to load
+    :param prefetcher: Optional- prefetcher to take the data from if it was read in the background
     :return: True if the data was loaded. False if no data was loaded
     """
     if not path.validatePathExists(filepath):
@@ -696,11 +807,11 @@ def loadDeformer(filepath: str = None) -> bool:
         logger.error(f"filepath {filepath} is not a file")
         return False
 
-    dataType = abstractData.AbstractData().getDataType(filepath)
+    # only the header is read to check the type so other data files are never decoded
+    dataType = abstractData.AbstractData.getDataType(filepath)
     if dataType not in DEFORMER_DATA_TYPES:
         raise ValueError(f"{os.path.basename(filepath)} is not a type of deformer data")
 
-    dataObj = dataManager.createDataClassInstance(dataType)
-    dataObj.read(filepath)
+    dataObj = prefetch.readData(filepath, dataType=dataType, prefetcher=prefetcher)
     dataObj.applyAllData()
     return True
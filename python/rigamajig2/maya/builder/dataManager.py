@@ -11,10 +11,9 @@
 import os
 import pathlib
 from types import ModuleType
-from typing import Type, Dict
+from typing import Type, Dict, List
 
 from rigamajig2.maya.data import abstractData
-from rigamajig2.shared import common
 from rigamajig2.shared import path as rig_path
 from rigamajig2.shared import process
 
@@ -26,36 +25,150 @@ DATA_EXCLUDE_FILES = ["__init__.py"]
 DATA_EXCLUDE_FOLDERS = []
 
 
-def getDataModules(path: str = None) -> Dict[str, ModuleType]:
+class DataRegistry(object):
     """
-    get a dictionary of data type and data module.
-    This can be used to create instances of each data module to use in data loading.
-    :return:
+    Lookup of data type names to data classes.
+
+    Data modules within a folder are only imported the first time the folder is registered.
+    After that all lookups are a dictionary access. Custom data types can be registered directly with
+    `registerDataType` without scanning any folders.
+
+    The built-in data types are registered before anything else, so custom data types registered
+    with the same name always replace them.
     """
-    if not path:
-        path = DATA_PATH
-    path = rig_path.cleanPath(path)
 
-    pathObj = pathlib.Path(path)
+    def __init__(self):
+        # {dataType: dataClass}
+        self._dataClasses = dict()
+        # {path: {dataType: module}}
+        self._pathModules = dict()
+        self._builtinsRegistered = False
+
+    def _registerBuiltinDataTypes(self) -> None:
+        """Import the built-in data modules once. This runs before any registration so it never replaces them"""
+        if self._builtinsRegistered:
+            return
+        self._builtinsRegistered = True
+        self._registerDataPath(DATA_PATH)
+
+    def registerDataPath(self, path: str, force: bool = False) -> Dict[str, ModuleType]:
+        """
+        Register all data types within a folder. Each folder is only scanned once unless `force` is used.
+
+        :param path: path to a folder of data modules
+        :param force: re-import the modules even if the folder has already been registered.
+        :return: dictionary of data type and data module found in the folder
+        """
+        self._registerBuiltinDataTypes()
+        return self._registerDataPath(path, force=force)
+
+    def _registerDataPath(self, path: str, force: bool = False) -> Dict[str, ModuleType]:
+        """Import the data modules within a folder and register their data classes"""
+        path = rig_path.cleanPath(path)
+        if path in self._pathModules and not force:
+            return self._pathModules[path]
+
+        pathObj = pathlib.Path(path)
+        files = [file for file in pathObj.iterdir() if file.is_file()]
+
+        dataTypeLookup = dict()
+        for file in files:
+            filePath = pathlib.Path(path) / file.name
+
+            # check the extension of the files.
+            if filePath.suffix == ".py" and filePath.name not in DATA_EXCLUDE_FILES:
+                moduleObject = process.importModuleFromPath(filePath)
+                dataClasses = process.getSubclassesFromModule(
+                    moduleObject, abstractData.AbstractData
+                )
+
+                if dataClasses:
+                    dataClass = dataClasses[0]
+                    dataTypeLookup[dataClass.__name__] = moduleObject
+                    self._registerDataClass(dataClass)
+
+        self._pathModules[path] = dataTypeLookup
+        return dataTypeLookup
+
+    def registerDataType(
+        self, dataClass: AbstractDataType, dataType: str = None
+    ) -> None:
+        """
+        Register a single data class.
+
+        :param dataClass: data class to register. Must be a subclass of AbstractData
+        :param dataType: name to register the data class as. By default the class name is used.
+        """
+        self._registerBuiltinDataTypes()
+        self._registerDataClass(dataClass, dataType=dataType)
+
+    def _registerDataClass(self, dataClass: AbstractDataType, dataType: str = None) -> None:
+        """Add a data class to the lookup"""
+        if not (
+            isinstance(dataClass, type)
+            and issubclass(dataClass, abstractData.AbstractData)
+        ):
+            raise TypeError(f"{dataClass} must be a subclass of AbstractData")
+
+        self._dataClasses[dataType or dataClass.__name__] = dataClass
+
+    def getDataClass(self, dataType: str) -> AbstractDataType or None:
+        """
+        Get the data class registered for a data type.
+
+        :param dataType: name of the data type
+        :return: data class or None if the data type is not registered
+        """
+        self._registerBuiltinDataTypes()
+        return self._dataClasses.get(dataType)
+
+    def getDataTypes(self) -> List[str]:
+        """Get a list of all registered data types"""
+        self._registerBuiltinDataTypes()
+        return list(self._dataClasses.keys())
+
+
+_registry = DataRegistry()
+
+
+def getRegistry() -> DataRegistry:
+    """Get the data registry"""
+    return _registry
+
+
+def registerDataType(dataClass: AbstractDataType, dataType: str = None) -> None:
+    """
+    Register a custom data class so it can be created with `createDataClassInstance`
 
-    files = [file for file in pathObj.iterdir() if file.is_file()]
+    :param dataClass: data class to register. Must be a subclass of AbstractData
+    :param dataType: name to register the data class as. By default the class name is used.
+    """
+    getRegistry().registerDataType(dataClass, dataType=dataType)
 
-    dataTypeLookup = dict()
-    for file in files:
-        filePath = pathlib.Path(path) / file.name
 
-        # check the extension of the files.
-        if filePath.suffix == ".py" and filePath.name not in DATA_EXCLUDE_FILES:
-            moduleObject = process.importModuleFromPath(filePath)
-            dataClasses = process.getSubclassesFromModule(
-                moduleObject, abstractData.AbstractData
-            )
+def registerDataPath(path: str) -> Dict[str, ModuleType]:
+    """
+    Register all data types within a folder of data modules
 
-            if dataClasses:
-                dataClass = dataClasses[0]
-                dataTypeLookup[dataClass.__name__] = moduleObject
+    :param path: path to a folder of data modules
+    :return: dictionary of data type and data module found in the folder
+    """
+    return getRegistry().registerDataPath(path)
 
-    return dataTypeLookup
+
+def getDataTypes() -> List[str]:
+    """Get a list of all valid data types"""
+    return getRegistry().getDataTypes()
+
+
+def getDataModules(path: str = None) -> Dict[str, ModuleType]:
+    """
+    get a dictionary of data type and data module.
+    This can be used to create instances of each data module to use in data loading.
+    The modules are only imported the first time a path is used.
+    :return:
+    """
+    return getRegistry().registerDataPath(path or DATA_PATH)
 
 
 def createDataClassInstance(dataType=None) -> AbstractDataType:
@@ -64,13 +177,10 @@ def createDataClassInstance(dataType=None) -> AbstractDataType:
     :param dataType: name of the dataType to create an instance of.
     :return: return an instance to the data class object
     """
-    moduleObject = getDataModules().get(dataType)
-    if not moduleObject:
+    dataClass = getRegistry().getDataClass(dataType)
+    if not dataClass:
         raise ValueError(
-            f"Data type {dataType} is not valid. Valid Types are {getDataModules()}"
+            f"Data type {dataType} is not valid. Valid Types are {getDataTypes()}"
         )
 
-    dataTypeInstance = process.getSubclassesFromModule(
-        moduleObject, classType=abstractData.AbstractData
-    )
-    return common.getFirst(dataTypeInstance)()
+    return dataClass()
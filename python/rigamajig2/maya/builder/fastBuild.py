@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: fastBuild.py
+    author: masonsmigel
+    date: 10/2026
+    description: Fast build mode for the rig builder.
+                 Turns off undo recording and the evaluation manager while building and controls how often
+                 the viewport is refreshed.
+"""
+import logging
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cmds
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshPolicy:
+    """How often the viewport is refreshed during a fast build"""
+
+    NEVER = "never"
+    STAGE = "stage"
+    COMPONENT = "component"
+
+
+class FastBuild(object):
+    """
+    Context manager to speed up a rig build.
+
+    While active, the undo queue does not record and the evaluation manager is turned off.
+    All settings are restored when the context exits, even if the build raises an exception.
+    The viewport is only refreshed based on the refresh policy. Use `stageComplete` and `componentComplete`
+    to tell the fast build where it is in the build.
+
+    Example:
+        >>> with FastBuild(refreshPolicy=RefreshPolicy.COMPONENT, refreshInterval=10) as fastBuild:
+        >>>     for component in components:
+        >>>         component.buildComponent()
+        >>>         fastBuild.componentComplete()
+    """
+
+    def __init__(
+        self,
+        refreshPolicy: str = RefreshPolicy.STAGE,
+        refreshInterval: int = 1,
+        suspendUndo: bool = True,
+        suspendEvaluation: bool = True,
+        viewportSuspended: bool = True,
+    ):
+        """
+        :param refreshPolicy: when to refresh the viewport. See `RefreshPolicy` for valid values.
+        :param refreshInterval: number of components between each refresh when using `RefreshPolicy.COMPONENT`
+        :param suspendUndo: turn off undo queue recording
+        :param suspendEvaluation: turn off the evaluation manager
+        :param viewportSuspended: the build runs with a suspended viewport (see `decorators.suspendViewport`).
+                                  Refreshing will un-suspend the viewport to draw it then suspend it again.
+        """
+        if refreshPolicy not in [
+            RefreshPolicy.NEVER,
+            RefreshPolicy.STAGE,
+            RefreshPolicy.COMPONENT,
+        ]:
+            raise ValueError(f"'{refreshPolicy}' is not a valid refresh policy")
+
+        self.refreshPolicy = refreshPolicy
+        self.refreshInterval = max(int(refreshInterval), 1)
+        self.suspendUndo = suspendUndo
+        self.suspendEvaluation = suspendEvaluation
+        self.viewportSuspended = viewportSuspended
+
+        self._componentCount = 0
+        self._undoState = None
+        self._evaluationMode = None
+
+    def __enter__(self):
+        self._componentCount = 0
+
+        if self.suspendUndo:
+            self._undoState = cmds.undoInfo(query=True, state=True)
+            cmds.undoInfo(stateWithoutFlush=False)
+
+        if self.suspendEvaluation:
+            self._evaluationMode = cmds.evaluationManager(query=True, mode=True)[0]
+            cmds.evaluationManager(mode="off")
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if self._evaluationMode is not None:
+            cmds.evaluationManager(mode=self._evaluationMode)
+            self._evaluationMode = None
+
+        if self._undoState is not None:
+            cmds.undoInfo(stateWithoutFlush=self._undoState)
+            self._undoState = None
+
+    def stageComplete(self) -> None:
+        """Call after each build stage. Refreshes the viewport if the policy is `RefreshPolicy.STAGE`"""
+        if self.refreshPolicy == RefreshPolicy.STAGE:
+            self.refresh()
+
+    def componentComplete(self) -> None:
+        """Call after each component. Refreshes the viewport every `refreshInterval` components"""
+        self._componentCount += 1
+        if self.refreshPolicy != RefreshPolicy.COMPONENT:
+            return
+        if self._componentCount % self.refreshInterval == 0:
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Force a viewport refresh in an interactive session"""
+        if om2.MGlobal.mayaState():
+            return
+
+        if not self.viewportSuspended:
+            cmds.refresh(force=True)
+            return
+
+        cmds.refresh(suspend=False)
+        try:
+            cmds.refresh(force=True)
+        finally:
+            cmds.refresh(suspend=True)
@@ -15,6 +15,9 @@ from distutils.dir_util import copy_tree
 from rigamajig2.maya.builder import builder
 from rigamajig2.maya.builder import constants
 from rigamajig2.maya.builder import core
+from rigamajig2.maya.builder import prefetch
+from rigamajig2.maya.data import abstractData
+from rigamajig2.maya.data import skinData
 from rigamajig2.shared import path
 
 logger = logging.getLogger(__name__)
@@ -28,7 +31,14 @@ mergableFeilds = [
 
 
 def mergeRigs(
-    rigFile1, rigFile2, rigName, mergedPath, outputSuffix="_rig-deliver", method="game"
+    rigFile1,
+    rigFile2,
+    rigName,
+    mergedPath,
+    outputSuffix="_rig-deliver",
+    method="game",
+    maxInfluences=4,
+    pruneThreshold=0.001,
 ):
     """
     Merge two rig files into a single rig file. The order of rig files in vital! the first one will be used when there
@@ -46,7 +56,9 @@ def mergeRigs(
                 It requires cleanup to combine the two but will result in a single skin cluster per mesh
             - 'film' will use deformation layers to stack deformations from rigFile2 ontop of rigFile1. This will work
                 as expected out of the box but cannot be sent to a game engine because it uses stacked skin clusters.
-
+    :param maxInfluences: maximum number of influences per vertex of the merged skins. Only used by the 'game' method.
+    :param pruneThreshold: skin weights below this value are removed from the merged skins.
+            Only used by the 'game' method.
     """
 
     # remove a suffix from the mergedRig file if one was added.
@@ -56,10 +68,8 @@ def mergeRigs(
     rigFile = core.newRigEnvironmentFromArchetype(mergedPath, "base", rigName=rigName)
     rigEnv = os.path.dirname(rigFile)
 
-    rigFileData = abstract_data.AbstractData()
-    rigFileData.read(rigFile)
-
-    rigFileDict = rigFileData.getData()
+    rigFileModel = core.RigFile.get(rigFile)
+    rigFileDict = rigFileModel.getData()
 
     file1Archetype = builder.Builder.getRigData(rigFile1, constants.BASE_ARCHETYPE)
     file2Archetype = builder.Builder.getRigData(rigFile2, constants.BASE_ARCHETYPE)
@@ -113,7 +123,12 @@ def mergeRigs(
 
     # merge the skins and SHAPES
     rigFileDict[constants.SKINS] = mergeSkinWeights(
-        rigFile1, rigFile2, rigEnv=rigEnv, method=method
+        rigFile1,
+        rigFile2,
+        rigEnv=rigEnv,
+        method=method,
+        maxInfluences=maxInfluences,
+        pruneThreshold=pruneThreshold,
     )
     # rigFileDict[constants.SHAPES] = mergeContentBased(rigFile1, rigFile2, rigEnv=rigEnv, key=constants.SHAPES)
 
@@ -124,14 +139,13 @@ def mergeRigs(
     copyScripts(rigFile1, rigFile2, rigFile, constants.PUB_SCRIPT)
 
     # finally set all the values back to the rig file and write it out!
-    rigFileData.setData(rigFileDict)
-    rigFileData.write(rigFile)
+    rigFileModel.write(rigFileDict)
 
     # display a log statement
     filename1 = os.path.basename(rigFile1)
     filename2 = os.path.basename(rigFile2)
 
-    Builder_Logger.info(
+    logger.info(
         f"Rig files: '{filename1}' and '{filename2}' sucessfully merged! Output: {rigEnv}"
     )
 
@@ -168,7 +182,7 @@ def mergeJsonFile(rigFile1, rigFile2, rigEnv, key):
     """Merge a two json files."""
 
     # get the data for rig file 1
-    rigFile1Data = abstract_data.AbstractData()
+    rigFile1Data = abstractData.AbstractData()
     file1Relative = builder.Builder.getRigData(rigFile1, key)
     if file1Relative:
         file1Absolute = os.path.realpath(
@@ -177,7 +191,7 @@ def mergeJsonFile(rigFile1, rigFile2, rigEnv, key):
         rigFile1Data.read(file1Absolute)
 
     # get the data for rig file 2
-    rigFile2Data = abstract_data.AbstractData()
+    rigFile2Data = abstractData.AbstractData()
     file2Relative = builder.Builder.getRigData(rigFile2, key)
     if file2Relative:
         file2Absolute = os.path.realpath(
@@ -198,15 +212,25 @@ def mergeJsonFile(rigFile1, rigFile2, rigEnv, key):
     return file1Relative
 
 
-def mergeSkinWeights(rigFile1, rigFile2, rigEnv, method="game"):
+def mergeSkinWeights(
+    rigFile1, rigFile2, rigEnv, method="game", maxInfluences=4, pruneThreshold=0.001
+):
     """
     Do a sloppy merge of the skin weights. The method
+
+    With the 'game' method the merged skin files are cleaned up for a game engine. See `cleanupSkinFiles`.
     """
 
     if method == "game":
         relativePath = mergeContentBased(
             rigFile1, rigFile2, rigEnv, key=constants.SKINS
         )
+        if relativePath:
+            cleanupSkinFiles(
+                os.path.realpath(os.path.join(rigEnv, relativePath)),
+                maxInfluences=maxInfluences,
+                pruneThreshold=pruneThreshold,
+            )
 
     else:
         raise NotImplementedError(
@@ -216,6 +240,33 @@ def mergeSkinWeights(rigFile1, rigFile2, rigEnv, method="game"):
     return relativePath
 
 
+def cleanupSkinFiles(filepath, maxInfluences=4, pruneThreshold=0.001):
+    """
+    Clean up the skin weights stored in skin files without loading them into maya.
+    Weights below the prune threshold are removed, the influences of each vertex are limited to the max influences
+    and the weights are renormalized. Influences without any weights are removed from the files.
+
+    :param filepath: skin file or directory of skin files to clean up
+    :param maxInfluences: maximum number of influences per vertex
+    :param pruneThreshold: weights below this value are removed
+    :return: dictionary of the number of changed vertices of each node in each file
+    """
+    report = dict()
+    for skinFile in prefetch.DataPrefetcher.expandPaths(filepath):
+        dataObj = skinData.SkinData()
+        dataObj.read(skinFile)
+        report[skinFile] = dataObj.cleanupWeights(
+            maxInfluences=maxInfluences, pruneThreshold=pruneThreshold
+        )
+        dataObj.write(skinFile)
+
+    changedVertices = sum(sum(fileReport.values()) for fileReport in report.values())
+    logger.info(
+        f"Cleaned up {len(report)} skin files. {changedVertices} vertices changed."
+    )
+    return report
+
+
 def mergeContentBased(rigFile1, rigFile2, rigEnv, key):
     """Merge types that are content based ie skinweights, blendshapes or SHAPES"""
     # build a skins folder from the first rig file
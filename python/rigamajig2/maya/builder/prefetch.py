@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: prefetch.py
+    author: masonsmigel
+    date: 10/2026
+    description: Background reading and writing of rig data files.
+                 Data files are read and decoded on a thread pool so they are ready to apply when the build
+                 reaches the step that loads them. Data objects are only created on the main thread.
+                 Data files can also be encoded and written on a thread pool while maya gathers the data for
+                 the next file.
+"""
+import concurrent.futures
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from rigamajig2.maya.builder import dataManager
+from rigamajig2.maya.data import abstractData
+from rigamajig2.shared import common
+from rigamajig2.shared import serialization
+
+logger = logging.getLogger(__name__)
+
+
+def _getFileStamp(filepath: str):
+    """Get the modification time and size of a file. Returns None if the file does not exist"""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _decodeDataFile(filepath: str, dataType: str = None) -> Tuple[str, Dict]:
+    """
+    Read and decode a data file without creating a data object. Runs on a worker thread.
+    Data objects can call maya when they are created so they are only created on the main thread.
+
+    :param filepath: path of the data file to read
+    :param dataType: type of data stored in the file. If None the type is read from the file.
+    :return: the data type and the data decoded from the file
+    """
+    if not dataType:
+        dataType = abstractData.AbstractData.getDataType(filepath)
+
+    # data types are registered on the main thread before any file is prefetched
+    dataClass = dataManager.getRegistry().getDataClass(dataType)
+    if not dataClass:
+        raise ValueError(f"Data type {dataType} is not valid")
+
+    _, data = serialization.read(filepath, lazyArrays=dataClass.LAZY_ARRAYS)
+    return dataType, data
+
+
+def _readDataFile(filepath: str, dataType: str = None) -> abstractData.AbstractData:
+    """
+    Read a data file into a new data object. Runs on the main thread.
+
+    :param filepath: path of the data file to read
+    :param dataType: type of data object to create. If None the type is read from the file.
+    :return: data object with the file data
+    """
+    if not dataType:
+        dataType = abstractData.AbstractData.getDataType(filepath)
+
+    dataObj = dataManager.createDataClassInstance(dataType)
+    dataObj.read(filepath)
+    return dataObj
+
+
+class DataPrefetcher(object):
+    """
+    Read data files in the background.
+
+    Each file is read once on a thread pool. Loaders use `take` to get the prefetched data object.
+    If a file was modified after it was prefetched, failed to read or was never prefetched, `take` returns None
+    and the loader should read the file itself.
+
+    Example:
+        >>> prefetcher = DataPrefetcher()
+        >>> prefetcher.prefetch("path/to/skins", dataType="SkinData")
+        >>> dataObj = prefetcher.take("path/to/skins/body.json", dataType="SkinData")
+    """
+
+    def __init__(self, maxWorkers: int = None):
+        """
+        :param maxWorkers: maximum number of threads used to read files. Defaults to the number of cpus.
+        """
+        self.maxWorkers = maxWorkers or os.cpu_count() or 1
+
+        self._executor = None
+        self._pending = dict()
+
+    @staticmethod
+    def _getKey(filepath: str) -> str:
+        return os.path.normcase(os.path.realpath(filepath))
+
+    @staticmethod
+    def expandPaths(filepaths: List[str]) -> List[str]:
+        """
+        Get a list of data files from a list of files and directories.
+        Directories are expanded to the data files directly within them.
+
+        :param filepaths: list of files and directories
+        :return: list of data files
+        """
+        dataFiles = list()
+        for filepath in common.toList(filepaths):
+            if not filepath or not os.path.exists(filepath):
+                continue
+            if os.path.isdir(filepath):
+                for fileName in sorted(os.listdir(filepath)):
+                    childPath = os.path.join(filepath, fileName)
+                    if (
+                        os.path.splitext(childPath)[-1]
+                        in serialization.DATA_FILE_EXTENSIONS
+                    ):
+                        dataFiles.append(childPath)
+            else:
+                dataFiles.append(filepath)
+        return dataFiles
+
+    def prefetch(self, filepaths: List[str] or str, dataType: str = None) -> List[str]:
+        """
+        Start reading data files in the background.
+        Files that are already being prefetched are skipped unless they were modified since.
+
+        :param filepaths: list of files or directories of data files to read
+        :param dataType: type of data stored in the files. If None the type is read from each file.
+        :return: list of files that started prefetching
+        """
+        if self._executor is None:
+            # load the data types on the main thread so workers never import modules
+            dataManager.getDataTypes()
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.maxWorkers, thread_name_prefix="rigamajigPrefetch"
+            )
+
+        submitted = list()
+        for filepath in self.expandPaths(filepaths):
+            key = self._getKey(filepath)
+            fileStamp = _getFileStamp(filepath)
+            if key in self._pending and self._pending[key][1] == fileStamp:
+                continue
+
+            future = self._executor.submit(_decodeDataFile, filepath, dataType)
+            self._pending[key] = (future, fileStamp)
+            submitted.append(filepath)
+
+        return submitted
+
+    def isPrefetched(self, filepath: str) -> bool:
+        """Check if a file is being prefetched"""
+        return self._getKey(filepath) in self._pending
+
+    def getPendingFiles(self) -> List[str]:
+        """Get a list of all files that have been prefetched but not taken yet"""
+        return list(self._pending.keys())
+
+    def take(
+        self, filepath: str, dataType: str = None
+    ) -> Optional[abstractData.AbstractData]:
+        """
+        Get the prefetched data object of a file. This waits for the file to finish reading.
+        The data object is removed from the prefetcher so it can only be taken once.
+
+        :param filepath: path of the data file
+        :param dataType: expected type of the data. If the prefetched data does not match None is returned.
+        :return: the data object or None if a valid data object was not prefetched
+        """
+        pendingData = self._pending.pop(self._getKey(filepath), None)
+        if pendingData is None:
+            return None
+
+        future, fileStamp = pendingData
+        try:
+            fileDataType, data = future.result()
+        except Exception as e:
+            logger.debug(f"Failed to prefetch {filepath}: {e}")
+            return None
+
+        if _getFileStamp(filepath) != fileStamp:
+            logger.debug(f"{filepath} was modified after it was prefetched")
+            return None
+
+        if dataType and fileDataType != dataType:
+            return None
+
+        # workers only decode the file. The data object is created here on the main thread.
+        dataObj = dataManager.createDataClassInstance(fileDataType)
+        dataObj.setFileData(filepath, data)
+        return dataObj
+
+    def cancel(self) -> None:
+        """Cancel all pending reads and shut down the thread pool"""
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending = dict()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class DataWriter(object):
+    """
+    Write data files in the background.
+
+    Each data object is encoded and written on a thread pool so the main thread can continue gathering data from maya.
+    Data objects must not be modified after they are passed to `write`. Use `wait` or the context manager to
+    wait for all files to finish writing.
+
+    Files should be written in the binary format. Json encoding holds the GIL so json files do not overlap with
+    each other or with the main thread.
+
+    Example:
+        >>> with DataWriter() as dataWriter:
+        >>>     for mesh in meshes:
+        >>>         dataObj = SkinData()
+        >>>         dataObj.gatherData(mesh)
+        >>>         dataWriter.write(dataObj, f"path/to/skins/{mesh}.rigdata")
+    """
+
+    def __init__(self, maxWorkers: int = None):
+        """
+        :param maxWorkers: maximum number of threads used to write files. Defaults to the number of cpus.
+        """
+        self.maxWorkers = maxWorkers or os.cpu_count() or 1
+
+        self._executor = None
+        self._pending = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is not None:
+            # dont raise write errors over the original exception
+            for _, future in self._pending:
+                future.cancel()
+            self._pending = list()
+            self._shutdown()
+            return
+        self.wait()
+
+    def write(
+        self, dataObj: abstractData.AbstractData, filepath: str, fileFormat: str = None
+    ) -> None:
+        """
+        Start writing a data object to a file.
+
+        :param dataObj: data object to write
+        :param filepath: path of the file to write
+        :param fileFormat: Optional- format to write the file in. See `AbstractData.write`.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.maxWorkers, thread_name_prefix="rigamajigWriter"
+            )
+
+        # create the directory on the main thread so workers dont race to create it
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        future = self._executor.submit(
+            dataObj.write, filepath, createDirectory=False, fileFormat=fileFormat
+        )
+        self._pending.append((filepath, future))
+
+    def wait(self) -> List[str]:
+        """
+        Wait for all files to finish writing.
+        Raises a RuntimeError after all files are finished if any of them failed to write.
+
+        :return: list of files that were written
+        """
+        writtenFiles = list()
+        failedFiles = list()
+        for filepath, future in self._pending:
+            try:
+                future.result()
+                writtenFiles.append(filepath)
+            except Exception as e:
+                logger.error(f"Failed to write {filepath}: {e}")
+                failedFiles.append(filepath)
+
+        self._pending = list()
+        self._shutdown()
+
+        if failedFiles:
+            raise RuntimeError(f"Failed to write data files: {failedFiles}")
+        return writtenFiles
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def readData(
+    filepath: str, dataType: str = None, prefetcher: DataPrefetcher = None
+) -> abstractData.AbstractData:
+    """
+    Get the data object of a file. If the file was prefetched the prefetched object is used,
+    otherwise the file is read immediately.
+
+    :param filepath: path of the data file
+    :param dataType: type of data stored in the file. If None the type is read from the file.
+    :param prefetcher: Optional- prefetcher to take the data from
+    :return: data object with the file data
+    """
+    if prefetcher:
+        dataObj = prefetcher.take(filepath, dataType=dataType)
+        if dataObj is not None:
+            return dataObj
+
+    return _readDataFile(filepath, dataType)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: profiler.py
+    author: masonsmigel
+    date: 10/2026
+    description: Profiling utilities for the rig builder.
+                 Times each build stage and counts the maya commands called and nodes created within it.
+"""
+import collections
+import contextlib
+import functools
+import getpass
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import maya.api.OpenMaya as om2
+import maya.cmds as cmds
+
+logger = logging.getLogger(__name__)
+
+# stage categories
+STEP = "step"
+COMPONENT = "component"
+DATA = "data"
+SCRIPT = "script"
+
+
+class BuildProfiler(object):
+    """
+    Record the time, maya command calls and node creation of each stage in a rig build.
+
+    Stages can be nested. The counts stored on each stage are inclusive of any nested stages.
+    The results can be written to a json report and a chrome trace file (chrome://tracing or https://ui.perfetto.dev)
+
+    Example:
+        >>> buildProfiler = BuildProfiler("myRig")
+        >>> with buildProfiler:
+        >>>     with buildProfiler.stage("importModel"):
+        >>>         importModel()
+        >>> buildProfiler.write("path/to/profiles")
+    """
+
+    def __init__(self, name: str = "build"):
+        """
+        :param name: name of the profile. Used as the default file name when writing results.
+        """
+        self.name = name
+
+        self._stages = list()
+        self._stageStack = list()
+        self._commandCounts = collections.Counter()
+        self._commandTotal = 0
+        self._nodeTotal = 0
+
+        self._startTime = None
+        self._endTime = None
+        self._originalCommands = dict()
+        self._nodeAddedCallback = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.stop()
+
+    @property
+    def isRunning(self) -> bool:
+        """True if the profiler is currently recording"""
+        return self._startTime is not None and self._endTime is None
+
+    def start(self) -> None:
+        """Start recording. This installs the command and node creation hooks."""
+        if self.isRunning:
+            return
+
+        self._stages = list()
+        self._stageStack = list()
+        self._commandCounts = collections.Counter()
+        self._commandTotal = 0
+        self._nodeTotal = 0
+
+        self._installCommandHooks()
+        self._nodeAddedCallback = om2.MDGMessage.addNodeAddedCallback(
+            self._onNodeAdded, "dependNode"
+        )
+
+        self._startTime = time.perf_counter()
+        self._endTime = None
+
+    def stop(self) -> None:
+        """Stop recording and remove all hooks"""
+        if not self.isRunning:
+            return
+
+        self._endTime = time.perf_counter()
+
+        self._removeCommandHooks()
+        if self._nodeAddedCallback is not None:
+            om2.MMessage.removeCallback(self._nodeAddedCallback)
+            self._nodeAddedCallback = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str, category: str = STEP):
+        """
+        Context manager to profile a single stage of the build.
+
+        :param name: name of the stage
+        :param category: category of the stage. Used to group stages in the trace viewer.
+        """
+        if not self.isRunning:
+            yield
+            return
+
+        stageData = collections.OrderedDict(
+            name=name,
+            category=category,
+            parent=self._stageStack[-1]["name"] if self._stageStack else None,
+            depth=len(self._stageStack),
+            start=time.perf_counter() - self._startTime,
+            duration=0.0,
+            commands=self._commandTotal,
+            nodes=self._nodeTotal,
+        )
+        self._stages.append(stageData)
+        self._stageStack.append(stageData)
+
+        try:
+            yield
+        finally:
+            self._stageStack.pop()
+            stageData["duration"] = (
+                time.perf_counter() - self._startTime - stageData["start"]
+            )
+            stageData["commands"] = self._commandTotal - stageData["commands"]
+            stageData["nodes"] = self._nodeTotal - stageData["nodes"]
+
+    def getStages(self) -> List[Dict]:
+        """Get a list of all recorded stages in the order they were started"""
+        return self._stages
+
+    def getReport(self) -> Dict:
+        """
+        Get a dictionary report of the profile.
+
+        :return: dictionary with the totals, each stage and the call count of each maya command
+        """
+        endTime = self._endTime if self._endTime is not None else time.perf_counter()
+        totalTime = endTime - self._startTime if self._startTime is not None else 0.0
+
+        report = collections.OrderedDict()
+        report["name"] = self.name
+        report["user"] = getpass.getuser()
+        report["time"] = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+        report["totalTime"] = totalTime
+        report["totalCommands"] = self._commandTotal
+        report["totalNodes"] = self._nodeTotal
+        report["stages"] = self._stages
+        report["commands"] = collections.OrderedDict(self._commandCounts.most_common())
+        return report
+
+    def getChromeTrace(self) -> Dict:
+        """
+        Get the profile in the chrome trace event format.
+
+        :return: dictionary of trace events
+        """
+        traceEvents = list()
+        for stageData in self._stages:
+            traceEvents.append(
+                {
+                    "name": stageData["name"],
+                    "cat": stageData["category"],
+                    "ph": "X",
+                    "ts": int(stageData["start"] * 1e6),
+                    "dur": int(stageData["duration"] * 1e6),
+                    "pid": 1,
+                    "tid": 1,
+                    "args": {
+                        "commands": stageData["commands"],
+                        "nodes": stageData["nodes"],
+                    },
+                }
+            )
+        return {"traceEvents": traceEvents, "displayTimeUnit": "ms"}
+
+    def writeReport(self, filepath: str) -> str:
+        """
+        Write the json report
+
+        :param filepath: path to the json file to write
+        :return: path to the file written
+        """
+        return self._writeJson(self.getReport(), filepath)
+
+    def writeChromeTrace(self, filepath: str) -> str:
+        """
+        Write the chrome trace file
+
+        :param filepath: path to the json file to write
+        :return: path to the file written
+        """
+        return self._writeJson(self.getChromeTrace(), filepath)
+
+    def write(self, directory: str, fileName: str = None) -> Tuple[str, str]:
+        """
+        Write both the json report and chrome trace into a directory.
+
+        :param directory: directory to write the files into
+        :param fileName: base name of the files. By default the profile name and a timestamp are used.
+        :return: path to the report and path to the trace file
+        """
+        if not fileName:
+            fileName = "{}_{}".format(self.name, time.strftime("%Y%m%d_%H%M%S"))
+
+        reportPath = self.writeReport(os.path.join(directory, f"{fileName}.json"))
+        tracePath = self.writeChromeTrace(
+            os.path.join(directory, f"{fileName}.trace.json")
+        )
+        logger.info(f"Build profile saved to: {reportPath}")
+        return reportPath, tracePath
+
+    @staticmethod
+    def _writeJson(data, filepath):
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(filepath, "w") as f:
+            f.write(json.dumps(data, indent=4))
+        return filepath
+
+    def _onNodeAdded(self, node, clientData):
+        self._nodeTotal += 1
+
+    def _installCommandHooks(self):
+        """Wrap every maya command so each call is counted"""
+        for commandName in dir(cmds):
+            if commandName.startswith("_"):
+                continue
+            command = getattr(cmds, commandName)
+            if not callable(command):
+                continue
+
+            self._originalCommands[commandName] = command
+            setattr(cmds, commandName, self._wrapCommand(commandName, command))
+
+    def _removeCommandHooks(self):
+        """Restore the original maya commands"""
+        for commandName, command in self._originalCommands.items():
+            setattr(cmds, commandName, command)
+        self._originalCommands = dict()
+
+    def _wrapCommand(self, commandName, command):
+        @functools.wraps(command)
+        def wrapper(*args, **kwargs):
+            self._commandCounts[commandName] += 1
+            self._commandTotal += 1
+            return command(*args, **kwargs)
+
+        return wrapper
+
+
+def stage(buildProfiler: Optional[BuildProfiler], name: str, category: str = STEP):
+    """
+    Get a context manager to profile a stage. If no profiler is given this does nothing.
+
+    :param buildProfiler: profiler to record the stage with. Can be None.
+    :param name: name of the stage
+    :param category: category of the stage
+    """
+    if buildProfiler is None:
+        return contextlib.nullcontext()
+    return buildProfiler.stage(name, category=category)
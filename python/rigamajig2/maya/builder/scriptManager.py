@@ -11,7 +11,7 @@ import os
 import pathlib
 
 from rigamajig2.maya.builder import constants
-from rigamajig2.maya.builder.core import getRigData, getAvailableArchetypes, findRigFile
+from rigamajig2.maya.builder.core import RigFile
 from rigamajig2.shared import common, runScript
 
 
@@ -44,11 +44,15 @@ def validateScriptList(scriptsList=None):
     return resultList
 
 
-def runAllScripts(scripts=None):
+def runAllScripts(scripts=None, buildProfiler=None):
     """
     Run pre scripts. You can add scripts by path, but the main use is through the PRE SCRIPT path
     :param scripts: path to scripts to run
+    :param buildProfiler: Optional- profiler to record each script with
     """
+    # the profiler needs maya. Import it here so the script list can be built outside of maya
+    from rigamajig2.maya.builder import profiler
+
     if scripts is None:
         scripts = list()
 
@@ -56,7 +60,8 @@ def runAllScripts(scripts=None):
 
     fileScripts.reverse()
     for script in fileScripts:
-        runScript.runScript(script)
+        with profiler.stage(buildProfiler, os.path.basename(script), profiler.SCRIPT):
+            runScript.runScript(script)
 
 
 class GetCompleteScriptList(object):
@@ -92,37 +97,30 @@ class GetCompleteScriptList(object):
         :param recursionLevel: the recursion level of the script to store as the dictionary key.
         """
         scriptType = scriptType or constants.PRE_SCRIPT
-        localScriptPaths = getRigData(rigFile, scriptType)
-        rigEnvironmentPath = os.path.abspath(os.path.join(rigFile, "../"))
-
-        if recursionLevel not in cls.scriptDict:
-            cls.scriptDict[recursionLevel] = []
-
-        # for each item in the script path append the scripts
-        for localScriptPath in localScriptPaths:
-            fullScriptPath = os.path.join(rigEnvironmentPath, localScriptPath)
-            builderScripts = validateScriptList(fullScriptPath)
-
-            # make a temp script list
-            _scriptList = list()
-
-            for script in builderScripts:
-                if script not in cls.scriptList:
-                    _scriptList.insert(0, script)
-                    cls.scriptList.insert(0, script)
-
-            cls.scriptDict[recursionLevel].extend(_scriptList)
-
-        # now we can look at the parent archetypes and iterate through them too.
-        baseArchetype = getRigData(rigFile, constants.BASE_ARCHETYPE)
-        archetypeList = common.toList(baseArchetype)
-        for baseArchetype in archetypeList:
-            if baseArchetype and baseArchetype in getAvailableArchetypes():
-                archetypePath = os.sep.join([common.ARCHETYPES_PATH, baseArchetype])
-                archetypeRigFile = findRigFile(archetypePath)
-
-                cls.findScripts(
-                    archetypeRigFile,
-                    scriptType=scriptType,
-                    recursionLevel=recursionLevel + 1,
+
+        # the rig file model resolves the archetype parents so each file in the chain is only read once.
+        for inheritanceLevel, inheritedRigFile in RigFile.get(
+            rigFile
+        ).getInheritanceChain():
+            level = recursionLevel + inheritanceLevel
+            if level not in cls.scriptDict:
+                cls.scriptDict[level] = []
+
+            localScriptPaths = inheritedRigFile.getValue(scriptType) or list()
+
+            # for each item in the script path append the scripts
+            for localScriptPath in localScriptPaths:
+                fullScriptPath = os.path.join(
+                    inheritedRigFile.rigEnvironment, localScriptPath
                 )
+                builderScripts = validateScriptList(fullScriptPath)
+
+                # make a temp script list
+                _scriptList = list()
+
+                for script in builderScripts:
+                    if script not in cls.scriptList:
+                        _scriptList.insert(0, script)
+                        cls.scriptList.insert(0, script)
+
+                cls.scriptDict[level].extend(_scriptList)
@@ -1,10 +1,9 @@
 """
 Constraint functions
 """
-import maya.api.OpenMaya as om2
 from maya import cmds as cmds
 
-import rigamajig2.maya.mesh as mesh
+import rigamajig2.maya.meshnav as meshnav
 import rigamajig2.maya.meta as meta
 import rigamajig2.maya.naming as naming
 import rigamajig2.maya.node as node
@@ -315,12 +314,9 @@ def uvPinConstraint(target, meshName, maintainOffset=False):
             f=True,
         )
 
-    # now lets connect the coorindates to the uv pin. We can use pen maya to get the closest uv coords
-    point = om2.MPoint(cmds.xform(target, q=True, t=True, ws=True))
-
-    mfnMesh = mesh.getMeshFn(meshName)
-    closestPoint, _ = mfnMesh.getClosestPoint(point, space=om2.MSpace.kWorld)
-    uvCoords = mfnMesh.getUVAtPoint(closestPoint, space=om2.MSpace.kWorld)
+    # now lets connect the coorindates to the uv pin. The closest uv coords come from a cached mesh query
+    point = cmds.xform(target, q=True, t=True, ws=True)
+    uvCoords = meshnav.getClosestUV(meshName, point)
 
     # get the next available index on the coordinate plug
     nextIndex = attr.getNextAvailableElement("{}.coordinate".format(uvPinNode))
@@ -5,6 +5,7 @@ from collections import OrderedDict
 import maya.api.OpenMaya as om2
 import maya.cmds as cmds
 
+from rigamajig2.maya import apiUndo
 from rigamajig2.maya import general
 from rigamajig2.maya import shape
 from rigamajig2.maya.decorators import oneUndo, preserveSelection
@@ -320,11 +321,19 @@ def setCvPositions(curve, cvList, world=True):
             )
         )
 
-    for i, cv in enumerate(getCvs(curve)):
-        if world:
-            cmds.xform(cv, ws=True, t=cvList[i])
-        else:
-            cmds.xform(cv, ws=False, t=cvList[i])
+    # all cvs are set at once through the API. The previous positions are recorded so the change can be undone.
+    space = om2.MSpace.kWorld if world else om2.MSpace.kObject
+    dagPath = om2.MGlobal.getSelectionListByName(curve).getDagPath(0)
+
+    previousPoints = om2.MFnNurbsCurve(dagPath).cvPositions(space)
+    newPoints = om2.MPointArray([list(position)[:3] for position in cvList])
+
+    def _setPoints(points):
+        curveFn = om2.MFnNurbsCurve(dagPath)
+        curveFn.setCVPositions(points, space)
+        curveFn.updateCurve()
+
+    apiUndo.execute(lambda: _setPoints(newPoints), lambda: _setPoints(previousPoints))
 
 
 def wipeCurveShape(curve):
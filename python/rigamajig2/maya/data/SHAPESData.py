@@ -184,17 +184,19 @@ class SHAPESData(maya_data.MayaData):
         super(SHAPESData, self).write(filepath=filepath)
         self.filepath = filepath
 
-    def read(self, filepath):
+    def setFileData(self, filepath, data):
         """
-        This will read a .json file and return the data in the file.
+        Set the data decoded from a .json file and keep the file path to find the setup files.
 
-        :param filepath: the path of the file to read
+        :param filepath: the path of the file the data was read from
         :type filepath: str
+        :param data: data decoded from the file
+        :type data: dict
         :return: Data from the filepath given.
         :rtype: dict
         """
-        super(SHAPESData, self).read(filepath)
         self.filepath = filepath
+        return super(SHAPESData, self).setFileData(filepath, data)
 
 
 # ----------------------------------------------------------------------
@@ -8,21 +8,25 @@
     author: masonsmigel
     date: 01/2021
 """
-
 import getpass
-import json
 import logging
 import os
-import sys
 from collections import OrderedDict
 from time import gmtime, strftime
 
 import rigamajig2.shared.common as common
+import rigamajig2.shared.serialization as serialization
 
 
 class AbstractData(object):
     """This class is a template for any data we need to save."""
 
+    # format used to write files that do not have a known file extension. See `serialization` for valid formats.
+    FILE_FORMAT = serialization.JSON
+
+    # read the arrays of binary files only when they are used. See `serialization.LazyArray`.
+    LAZY_ARRAYS = False
+
     def __init__(self):
         """
         constructor for the abstract class. Abstract Class is used as  template for all data classes
@@ -129,25 +133,32 @@ class AbstractData(object):
         """
         self.applyData(list(self._data.keys()))
 
-    def write(self, filepath, createDirectory=True):
+    def write(self, filepath, createDirectory=True, fileFormat=None):
         """
-        This will write the dictionary information to disc in .json format
+        This will write the dictionary information to disc.
+        By default the format is based on the file extension, `.json` files are written as json and
+        `.rigdata` files are written as a compact binary file. Any other extension uses the `FILE_FORMAT`.
 
         :param filepath: The path to the file you wish to write.
         :type filepath: str
         :param createDirectory: Create file path if needed
         :type createDirectory: bool
+        :param fileFormat: Optional- format to write the file in. See `serialization.getFileFormats`.
+        :type fileFormat: str
         """
 
         if not isinstance(self._data, (dict, OrderedDict)):
             raise TypeError("The data must be passed in as a dictionary.")
-        writeData = OrderedDict(
+        header = OrderedDict(
             user=getpass.getuser(),
             type=self.__class__.__name__,
             time=strftime("%Y-%m-%d %H:%M:%S", gmtime()),
         )
-        writeData["data"] = self._data
-        data = json.dumps(writeData, indent=4, ensure_ascii=False)
+
+        if not fileFormat:
+            fileFormat = (
+                serialization.getFormatFromExtension(filepath) or self.FILE_FORMAT
+            )
 
         # Create path if needed
         directory = os.path.dirname(filepath)
@@ -157,9 +168,7 @@ class AbstractData(object):
                 os.makedirs(directory)
 
         # Write Data
-        f = open(filepath, "w")
-        f.write(data)
-        f.close()
+        serialization.write(filepath, header, self._data, fileFormat=fileFormat)
 
         self._filepath = filepath
 
@@ -168,28 +177,37 @@ class AbstractData(object):
             f"{self.__class__.__name__} saved to : {filepath} ({len(self._data)} node(s))"
         )
 
-    def read(self, filepath):
+    def read(self, filepath, keys=None):
         """
-        This will read a .json file and return the data in the file.
+        This will read a data file and return the data in the file. The file format is detected automatically.
 
         :param filepath: the path of the file to read
         :type filepath: str
+        :param keys: Optional- only read the data of these keys. Binary files will only decode the requested keys.
+        :type keys: list
         :return: Data from the filepath given.
         :rtype: dict
         """
         if not os.path.isfile(filepath):
             raise RuntimeError("The file {0} does not exists.".format(filepath))
 
-        f = open(filepath, "r")
-        if sys.version_info.major == 3:
-            data = json.loads(f.read(), object_pairs_hook=OrderedDict)
-        else:
-            data = json.loads(f.read().decode("utf-8"), object_pairs_hook=OrderedDict)
-        f.close()
+        _, data = serialization.read(filepath, keys=keys, lazyArrays=self.LAZY_ARRAYS)
+        return self.setFileData(filepath, data)
 
+    def setFileData(self, filepath, data):
+        """
+        Set the data decoded from a data file. This is used by `read` and by data prefetched in the background.
+
+        :param filepath: the path of the file the data was read from
+        :type filepath: str
+        :param data: data decoded from the file
+        :type data: dict
+        :return: Data from the filepath given.
+        :rtype: dict
+        """
         # Set the new filepath on the class
         self._filepath = filepath
-        self._data = common.convertDictKeys(data["data"])
+        self._data = common.convertDictKeys(data)
         return self._data
 
     @classmethod
@@ -202,12 +220,17 @@ class AbstractData(object):
         :return: datatype of the given file
         :rtype: str
         """
-        f = open(filepath, "r")
-        if sys.version_info.major == 3:
-            data = json.loads(f.read(), object_pairs_hook=OrderedDict)
-        else:
-            data = json.loads(f.read().decode("utf-8"), object_pairs_hook=OrderedDict)
-        f.close()
+        return serialization.readHeader(filepath)["type"]
+
+    @classmethod
+    def readKeys(cls, filepath):
+        """
+        Read the list of keys stored in a data file.
+        Binary files store the keys in their header so the data is not decoded.
 
-        datatype = data["type"]
-        return datatype
+        :param filepath: the path of the file to read
+        :type filepath: str
+        :return: list of keys in the file
+        :rtype: list
+        """
+        return [str(key) for key in serialization.readKeys(filepath)]
@@ -13,16 +13,231 @@ import logging
 from collections import OrderedDict
 
 import maya.cmds as cmds
+import numpy as np
 
 import rigamajig2.maya.data.mayaData as maya_data
 from rigamajig2.maya import blendshape
+from rigamajig2.maya import shape
 from rigamajig2.shared import common
+from rigamajig2.shared import compression
 
 logger = logging.getLogger(__name__)
 
+# Deltas are stored as an array of vertex IDs and a (vertex x 3) array of deltas.
+# Older files store the deltas as a dictionary of {vertexId: delta}
+# Compressed deltas are quantized per target or share a low rank basis across all targets of a blendshape.
+DELTA_FORMAT_SPARSE = "sparse"
+DELTA_FORMAT_DICT = "dict"
+DELTA_FORMAT_QUANTIZED = "quantized"
+DELTA_FORMAT_BASIS = "basis"
+DELTA_TOLERANCE = 1e-4
+
+# Weight maps are stored as a sparse (target x vertex) matrix of the weights that are not 1.0.
+# Older files store the weights as a dictionary of {target: {vertexId: weight}}
+WEIGHTS_FORMAT_SPARSE = "sparse"
+WEIGHTS_FORMAT_DICT = "dict"
+WEIGHTS_TOLERANCE = 1e-4
+
+
+def encodeWeights(weights, targets, tolerance=WEIGHTS_TOLERANCE):
+    """
+    Encode a (target x vertex) array of blendshape weight maps as a sparse matrix of the weights that are not 1.0.
+
+    :param np.ndarray weights: (target x vertex) array of weights
+    :param list targets: name of the target of each row
+    :param float tolerance: weights within this tolerance of 1.0 are not stored
+    :return: dictionary of the targets, the point count and the row, vertex and value of each stored weight
+    :rtype: dict
+    """
+    weights = np.asarray(weights, dtype=np.float32).reshape(len(targets), -1)
+    rows, indices = np.nonzero(np.abs(weights - 1.0) > tolerance)
+
+    encodedWeights = OrderedDict()
+    encodedWeights["targets"] = list(targets)
+    encodedWeights["pointCount"] = weights.shape[1]
+    encodedWeights["rows"] = rows.astype(np.int32)
+    encodedWeights["indices"] = indices.astype(np.int32)
+    encodedWeights["values"] = weights[rows, indices]
+    return encodedWeights
+
+
+def decodeWeights(encodedWeights, pointCount=None):
+    """
+    Decode blendshape weight maps stored as a sparse matrix into an array.
+
+    :param dict encodedWeights: dictionary returned by `encodeWeights`
+    :param int pointCount: Optional- number of points to decode. Stored points beyond it are skipped and
+                           points beyond the stored point count have a weight of 1.0.
+    :return: (target x vertex) array of weights and the name of the target of each row
+    :rtype: tuple
+    """
+    if pointCount is None:
+        pointCount = encodedWeights["pointCount"]
+
+    targets = list(encodedWeights["targets"])
+    weights = np.ones((len(targets), pointCount), dtype=np.float32)
+
+    rows = np.asarray(encodedWeights["rows"], dtype=np.int64)
+    indices = np.asarray(encodedWeights["indices"], dtype=np.int64)
+    values = np.asarray(encodedWeights["values"], dtype=np.float32)
+    inRange = indices < pointCount
+    weights[rows[inRange], indices[inRange]] = values[inRange]
+    return weights, targets
+
 
 class BlendshapeData(maya_data.MayaData):
-    """Class to store  maya data"""
+    """
+    Class to store maya blendshape data.
+
+    When the data is read from a binary file the delta arrays are only read when they are used,
+    so applying the data only loads the targets that do not exist on the blendshape yet.
+    """
+
+    LAZY_ARRAYS = True
+
+    def __init__(
+        self,
+        tolerance=DELTA_TOLERANCE,
+        targetTolerances=None,
+        maxError=None,
+        sharedBasis=False,
+    ):
+        """
+        :param float tolerance: deltas with a magnitude below this value are not stored
+        :param dict targetTolerances: Optional- dictionary of {target: tolerance} to override the tolerance per target
+        :param float maxError: Optional- compress the deltas so no vertex moves further than this distance.
+                               By default the deltas are not compressed.
+        :param bool sharedBasis: compress the deltas of all targets of a blendshape with a shared low rank basis.
+                                 If the basis is not smaller than quantizing each target the targets are quantized.
+        """
+        super(BlendshapeData, self).__init__()
+        self.tolerance = tolerance
+        self.targetTolerances = targetTolerances or dict()
+        self.maxError = maxError
+        self.sharedBasis = sharedBasis
+
+        self._basisCache = dict()
+
+    def getTolerance(self, target):
+        """Get the tolerance used to gather the deltas of a target"""
+        return self.targetTolerances.get(target, self.tolerance)
+
+    def getDelta(self, node, target, iti=6000):
+        """
+        Get the stored delta of a target as arrays.
+
+        :param str node: blendshape node to get the delta from
+        :param str target: name of the target
+        :param int iti: input target item index of the target or inbetween
+        :return: array of vertex IDs and a (vertex x 3) float32 array of the delta of each vertex
+        """
+        itiData = self._data[node]["targets"][target][str(iti)]
+        deltaFormat = self._data[node].get("deltaFormat", DELTA_FORMAT_DICT)
+        if deltaFormat == DELTA_FORMAT_DICT:
+            deltas = itiData["deltas"] or dict()
+            indices = [int(vertexId) for vertexId in deltas.keys()]
+            deltas = list(deltas.values())
+        elif deltaFormat == DELTA_FORMAT_QUANTIZED:
+            indices = itiData["indices"]
+            deltas = compression.dequantize(itiData["quantized"])
+        elif deltaFormat == DELTA_FORMAT_BASIS:
+            # rebuild the deltas of all vertices in the basis and keep only the vertices of the target
+            basisIndices, basis = self._getDeltaBasis(node)
+            indices = np.asarray(itiData["indices"], dtype=np.int32)
+            coefficients = np.asarray(itiData["coefficients"], dtype=np.float32)
+            deltas = (coefficients @ basis).reshape(-1, 3)
+            deltas = deltas[np.searchsorted(basisIndices, indices)]
+        else:
+            indices, deltas = itiData["indices"], itiData["deltas"]
+
+        # lazy arrays are read from the file here
+        indices = np.asarray(indices, dtype=np.int32)
+        return indices, np.asarray(deltas, dtype=np.float32).reshape(-1, 3)
+
+    def _getDeltaBasis(self, node):
+        """Get the vertex IDs and the shared basis of a blendshape. The basis is only read once."""
+        basisData = self._data[node]["deltaBasis"]
+        cachedData, basisIndices, basis = self._basisCache.get(node, (None, None, None))
+        if cachedData is not basisData:
+            basisIndices = np.asarray(basisData["indices"], dtype=np.int32)
+            basis = np.asarray(basisData["basis"], dtype=np.float32)
+            self._basisCache[node] = (basisData, basisIndices, basis)
+        return basisIndices, basis
+
+    def compressDeltas(self, node, maxError, sharedBasis=False):
+        """
+        Compress the sparse deltas of a blendshape so no vertex moves further than the max error.
+
+        :param str node: blendshape node to compress the deltas of
+        :param float maxError: maximum distance between a compressed delta and the original delta
+        :param bool sharedBasis: try to compress all targets with a shared low rank basis.
+                                 If the basis is not smaller than quantizing each target the targets are quantized.
+        """
+        data = self._data[node]
+        if data.get("deltaFormat") != DELTA_FORMAT_SPARSE:
+            raise ValueError(
+                f"Only sparse deltas can be compressed. '{node}' is not sparse"
+            )
+
+        itiDataList = [
+            itiData
+            for targetDict in data["targets"].values()
+            for itiData in targetDict.values()
+        ]
+        quantizedList = [
+            compression.quantize(itiData["deltas"], maxError) for itiData in itiDataList
+        ]
+
+        if sharedBasis and self._compressDeltaBasis(
+            data, itiDataList, quantizedList, maxError
+        ):
+            data["deltaFormat"] = DELTA_FORMAT_BASIS
+        else:
+            for itiData, quantized in zip(itiDataList, quantizedList):
+                del itiData["deltas"]
+                itiData["quantized"] = quantized
+            data["deltaFormat"] = DELTA_FORMAT_QUANTIZED
+
+        data["maxError"] = maxError
+
+    @staticmethod
+    def _compressDeltaBasis(data, itiDataList, quantizedList, maxError):
+        """
+        Replace the deltas of each target with coefficients of a shared low rank basis.
+
+        :return: True if the basis was used. False if it does not fit or is larger than the quantized deltas.
+        """
+        indicesList = [np.asarray(itiData["indices"]) for itiData in itiDataList]
+        if not indicesList:
+            return False
+        basisIndices = np.unique(np.concatenate(indicesList)).astype(np.int32)
+
+        # build a dense array of the deltas of every target on every vertex used by any target
+        values = np.zeros((len(itiDataList), len(basisIndices), 3), dtype=np.float32)
+        mask = np.zeros(values.shape[:2], dtype=bool)
+        for i, (itiData, indices) in enumerate(zip(itiDataList, indicesList)):
+            positions = np.searchsorted(basisIndices, indices)
+            values[i, positions] = np.asarray(itiData["deltas"])
+            mask[i, positions] = True
+
+        try:
+            coefficients, basis = compression.fitBasis(values, maxError, mask=mask)
+        except RuntimeError as e:
+            logger.debug(e)
+            return False
+
+        quantizedSize = sum(quantized["values"].nbytes for quantized in quantizedList)
+        if coefficients.nbytes + basis.nbytes >= quantizedSize:
+            logger.debug(
+                "The shared basis is larger than the quantized deltas. Quantizing each target instead"
+            )
+            return False
+
+        for itiData, targetCoefficients in zip(itiDataList, coefficients):
+            del itiData["deltas"]
+            itiData["coefficients"] = targetCoefficients
+        data["deltaBasis"] = OrderedDict(indices=basisIndices, basis=basis)
+        return True
 
     def gatherData(self, node, asDelta=False):
         """
@@ -46,17 +261,24 @@ class BlendshapeData(maya_data.MayaData):
             data["geometry"] = blendshape.getBaseGeometry(node)
             targets = blendshape.getTargetList(node)
 
+            data["deltaFormat"] = DELTA_FORMAT_SPARSE
+            data["targetTolerances"] = OrderedDict()
             data["targets"] = dict()
             targetWeightList = list()
             targetGeometryList = list()
             for target in targets:
                 targetDict = OrderedDict()
+                tolerance = self.getTolerance(target)
+                data["targetTolerances"][target] = tolerance
                 # get the blendshape delta and any inbetweens deltas
                 for iti in blendshape.getInputTargetItemList(node, target):
-                    itiDict = OrderedDict(deltas=None, targetGeo=None)
                     wt = blendshape.itiToInbetween(iti)
-                    deltas = blendshape.getDelta(node, target, inbetween=wt)
-                    itiDict["deltas"] = deltas
+                    indices, deltas = blendshape.getDeltaArray(
+                        node, target, inbetween=wt, tolerance=tolerance
+                    )
+                    itiDict = OrderedDict(
+                        indices=indices, deltas=deltas, targetGeo=None
+                    )
 
                     if blendshape.hasTargetGeo(node, target, inbetween=wt):
                         targetGeo = blendshape.getTargetGeo(
@@ -72,13 +294,21 @@ class BlendshapeData(maya_data.MayaData):
             data["targetGeometry"] = targetGeometryList
             data["targetWeights"] = targetWeightList
 
-            data["weights"] = blendshape.getWeights(node, targets=None)
+            weights, weightTargets = blendshape.getWeightsArray(node)
+            data["weightsFormat"] = WEIGHTS_FORMAT_SPARSE
+            data["weights"] = encodeWeights(weights, weightTargets)
 
             self._data[node].update(data)
 
+            if self.maxError:
+                self.compressDeltas(
+                    node, maxError=self.maxError, sharedBasis=self.sharedBasis
+                )
+
     def applyData(self, nodes, attributes=None, loadWeights=False):
         """
         Apply deformation layer data back to the models.
+        Only the deltas of targets that do not exist on the blendshape are loaded.
         """
 
         nodes = common.toList(nodes)
@@ -100,12 +330,12 @@ class BlendshapeData(maya_data.MayaData):
                 # rebuild the targets
                 if target not in blendshape.getTargetList(blendshapeNode):
                     # first we need to recreate the main target. This is available at the index 6000.
-                    deltaDict = self._data[node]["targets"][target]["6000"]["deltas"]
+                    delta = self.getDelta(node, target, 6000)
                     blendshape.addEmptyTarget(
                         blendshapeNode,
                         target=target,
                     )
-                    blendshape.setDelta(blendshapeNode, target, deltaDict=deltaDict)
+                    blendshape.setDelta(blendshapeNode, target, deltaDict=delta)
 
                     addedTargets += 1
 
@@ -117,10 +347,10 @@ class BlendshapeData(maya_data.MayaData):
                         # recaulcuate the weight of the inbetween
                         # using the same formula used to set the inputTargetIndex
                         wt = blendshape.itiToInbetween(iti)
-                        deltaDict = self._data[node]["targets"][target][iti]["deltas"]
+                        delta = self.getDelta(node, target, iti)
                         blendshape.addEmptyTarget(blendshapeNode, target, inbetween=wt)
                         blendshape.setDelta(
-                            blendshapeNode, target, deltaDict=deltaDict, inbetween=wt
+                            blendshapeNode, target, deltaDict=delta, inbetween=wt
                         )
 
                     # for each target we need to check if the shape exisits
@@ -143,6 +373,24 @@ class BlendshapeData(maya_data.MayaData):
                             self._data[node]["targetWeights"][i],
                         )
 
-            blendshape.setWeights(blendshapeNode, weights=self._data[node]["weights"])
+            if self._data[node].get("weightsFormat") == WEIGHTS_FORMAT_SPARSE:
+                # weights are matched by point index like the dictionary weights of older files
+                encodedWeights = self._data[node]["weights"]
+                pointCount = shape.getPointCount(base)
+                if encodedWeights["pointCount"] != pointCount:
+                    logger.warning(
+                        f"{node}: the weights were saved with {encodedWeights['pointCount']} points. "
+                        f"{base} now has {pointCount} points"
+                    )
+                weights, weightTargets = decodeWeights(
+                    encodedWeights, pointCount=pointCount
+                )
+                blendshape.setWeightsArray(
+                    blendshapeNode, weights, targets=weightTargets
+                )
+            else:
+                blendshape.setWeights(
+                    blendshapeNode, weights=self._data[node]["weights"]
+                )
 
             logger.info(f"Blendshape data loaded: '{node}' with {addedTargets} targets")
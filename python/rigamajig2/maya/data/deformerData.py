@@ -6,11 +6,13 @@ import sys
 from collections import OrderedDict
 
 import maya.cmds as cmds
+import numpy as np
 
 import rigamajig2.maya.data.mayaData as maya_data
 import rigamajig2.maya.data.nodeData as node_data
 from rigamajig2.maya import attr
 from rigamajig2.maya import deformer
+from rigamajig2.maya import shape
 from rigamajig2.shared import common
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,12 @@ IGNORE_TYPES = ["blendShape", "skinCluster"]
 
 SPECIAL_DEFORMERS = ["ffd", "cluster"]
 
+# Weights are stored as a sparse mask of the points that are not 1.0.
+# Older files store the weights as a dictionary of {point: weight}
+WEIGHTS_FORMAT_SPARSE = "sparse"
+WEIGHTS_FORMAT_DICT = "dict"
+WEIGHTS_TOLERANCE = 1e-4
+
 GATHER_ATTRS = {
     "ffd": [
         "localInfluenceS",
@@ -62,6 +70,66 @@ GATHER_ATTRS = {
 }
 
 
+def encodeWeights(weights, default=1.0, tolerance=WEIGHTS_TOLERANCE):
+    """
+    Encode an array of deformer weights as a sparse mask of the points that are not the default value.
+
+    :param np.ndarray weights: array of the weight of each point
+    :param float default: value that is not stored
+    :param float tolerance: weights within this tolerance of the default are not stored
+    :return: dictionary of the point count, the indices of the stored points and their weights
+    :rtype: dict
+    """
+    weights = np.asarray(weights, dtype=np.float32)
+    indices = np.flatnonzero(np.abs(weights - default) > tolerance)
+
+    encodedWeights = OrderedDict()
+    encodedWeights["pointCount"] = len(weights)
+    encodedWeights["indices"] = indices.astype(np.int32)
+    encodedWeights["values"] = weights[indices]
+    return encodedWeights
+
+
+def decodeWeights(encodedWeights, default=1.0, pointCount=None):
+    """
+    Decode deformer weights stored as a sparse mask into an array.
+
+    :param dict encodedWeights: dictionary of the point count, the indices of the stored points and their weights
+    :param float default: value of the points that are not stored
+    :param int pointCount: Optional- number of points to decode. Stored points beyond it are skipped and
+                           points beyond the stored point count have the default value.
+    :return: array of the weight of each point
+    :rtype: np.ndarray
+    """
+    if pointCount is None:
+        pointCount = encodedWeights["pointCount"]
+
+    indices = np.asarray(encodedWeights["indices"], dtype=np.int64)
+    values = np.asarray(encodedWeights["values"], dtype=np.float32)
+    inRange = indices < pointCount
+
+    weights = np.full(pointCount, default, dtype=np.float32)
+    weights[indices[inRange]] = values[inRange]
+    return weights
+
+
+def weightsDictToArray(weights, pointCount, default=1.0):
+    """
+    Convert deformer weights stored as a dictionary of {point: weight} into an array.
+
+    :param dict weights: dictionary of point indices and weights. Keys may be strings when read from json.
+    :param int pointCount: number of points
+    :param float default: value of the points that are not in the dictionary
+    :return: array of the weight of each point
+    :rtype: np.ndarray
+    """
+    weightsArray = np.full(pointCount, default, dtype=np.float32)
+    for index, value in weights.items():
+        if value is not None and int(index) < pointCount:
+            weightsArray[int(index)] = value
+    return weightsArray
+
+
 class DeformerData(maya_data.MayaData):
     """Subclass for Node Data"""
 
@@ -99,10 +167,11 @@ class DeformerData(maya_data.MayaData):
 
             deformerWeightsDict = dict()
             for affectedGeo in data["affectedGeo"]:
-                deformerWeightsDict[affectedGeo] = deformer.getWeights(
-                    node, affectedGeo
+                deformerWeightsDict[affectedGeo] = encodeWeights(
+                    deformer.getWeightsArray(node, affectedGeo)
                 )
 
+            data["weightsFormat"] = WEIGHTS_FORMAT_SPARSE
             data["deformerWeights"] = deformerWeightsDict
             # now we can do some specialty Cases:
             if data["deformerType"] == "ffd":
@@ -145,6 +214,30 @@ class DeformerData(maya_data.MayaData):
             # gather deformer weights for each
             self._data[node].update(data)
 
+    def getWeightsArray(self, node, geometry):
+        """
+        Get the stored weights of a geometry of the deformer as an array.
+        Supports both the sparse weights and the dictionary weights of older files.
+        The array always matches the current point count of the geometry.
+
+        :param str node: name of the deformer
+        :param str geometry: name of the geometry
+        :return: array of the weight of each point
+        :rtype: np.ndarray
+        """
+        weights = self._data[node]["deformerWeights"][geometry]
+        pointCount = shape.getPointCount(geometry)
+        if self._data[node].get("weightsFormat") == WEIGHTS_FORMAT_SPARSE:
+            # weights are matched by point index like the dictionary weights of older files
+            if weights["pointCount"] != pointCount:
+                logger.warning(
+                    f"{node}: the weights of {geometry} were saved with {weights['pointCount']} points. "
+                    f"It now has {pointCount} points"
+                )
+            return decodeWeights(weights, pointCount=pointCount)
+
+        return weightsDictToArray(weights, pointCount)
+
     def applyData(self, nodes, create=True, attributes=None):
         """
         Applies the data for given nodes.
@@ -231,8 +324,8 @@ class DeformerData(maya_data.MayaData):
                 # add the geometry to the deformer
                 deformer.addGeoToDeformer(node, geo)
                 # load the deformer weights
-                deformer.setWeights(
-                    node, self._data[node]["deformerWeights"][geo], geometry=geo
+                deformer.setWeightsArray(
+                    node, self.getWeightsArray(node, geo), geometry=geo
                 )
 
             # load the additional attributes from the deformer
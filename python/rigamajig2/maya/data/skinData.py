@@ -8,25 +8,249 @@
     author: masonsmigel
     date: 01/2021
 """
-
+import hashlib
+import json
 import logging
+import os
+import tempfile
 from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 import maya.cmds as cmds
+import numpy as np
 
 import rigamajig2.maya.data.mayaData as maya_data
 import rigamajig2.maya.deformer as deformer
+import rigamajig2.maya.shape as shape
 import rigamajig2.maya.skinCluster as skinCluster
 import rigamajig2.shared.common as common
 
 logger = logging.getLogger(__name__)
 
+# Weights are stored in a compressed sparse row layout. For each vertex the offsets give the range of its
+# influence indices and values. Older files store the weights as a dictionary of {influence: {vertex: weight}}
+WEIGHTS_FORMAT_CSR = "csr"
+WEIGHTS_FORMAT_DICT = "dict"
+
+# Quantized weights are stored as 16 bit fixed point values
+QUANTIZE_SCALE = 65535
+QUANTIZE_MAX_ERROR = 1e-4
+
+# Incremental saves store the hash of each skin file in a manifest next to the files.
+# The manifest extension is not a data file extension so loaders skip it.
+MANIFEST_FILE = "skinWeights.manifest"
+MANIFEST_VERSION = 1
+# file modification times are machine specific so they are cached locally instead of in the manifest
+MANIFEST_STAMPS_DIRECTORY = os.path.join(
+    tempfile.gettempdir(), "rigamajig2", "skinManifests"
+)
+
+
+def quantizeWeights(
+    weights: np.ndarray, maxError: float = QUANTIZE_MAX_ERROR
+) -> Tuple[Optional[np.ndarray], bool]:
+    """
+    Quantize a (vertex x influence) weights array to 16 bit fixed point values.
+    The quantized weights are checked against the original weights after they are renormalized.
+
+    :param weights: (vertex x influence) array of weights
+    :param maxError: maximum absolute error of any weight after dequantizing
+    :return: quantized weights and if the weights of each vertex should be renormalized when they are dequantized.
+             If the weights cannot be stored within the max error the quantized weights are None.
+    """
+    if maxError < 0.5 / QUANTIZE_SCALE:
+        raise ValueError(
+            f"maxError must be at least {0.5 / QUANTIZE_SCALE:.2e} to quantize weights to 16 bits"
+        )
+
+    weights = np.asarray(weights, dtype=np.float64)
+    quantized = np.rint(np.clip(weights, 0.0, 1.0) * QUANTIZE_SCALE).astype(np.uint16)
+
+    # only renormalize on load if every weighted vertex was normalized
+    totals = weights.sum(axis=1)
+    normalized = bool(np.all(np.abs(totals[totals > 0.0] - 1.0) <= maxError))
+
+    deviation = np.abs(
+        dequantizeWeights(quantized, QUANTIZE_SCALE, normalized) - weights
+    )
+    if deviation.size and deviation.max() > maxError:
+        return None, normalized
+    return quantized, normalized
+
+
+def dequantizeWeights(
+    quantized: np.ndarray, scale: int = QUANTIZE_SCALE, normalized: bool = True
+) -> np.ndarray:
+    """
+    Convert quantized weights back to float weights.
+
+    :param quantized: (vertex x influence) array of quantized weights
+    :param scale: value of a full weight in the quantized weights
+    :param normalized: renormalize the weights of each vertex
+    :return: (vertex x influence) array of weights
+    """
+    weights = np.asarray(quantized, dtype=np.float64) / scale
+    if normalized:
+        weights = skinCluster.normalizeWeightsArray(weights)
+    return weights
+
+
+def encodeWeights(
+    weights: np.ndarray,
+    influences: List[str],
+    tolerance: float = 0.0,
+    maxError: float = None,
+) -> Dict:
+    """
+    Encode a (vertex x influence) weights array into a sparse compressed row layout.
+
+    :param weights: (vertex x influence) array of weights
+    :param influences: name of the influence of each column in the weights array
+    :param tolerance: weights at or below this value are not stored
+    :param maxError: Optional- store the values as 16 bit fixed point with this maximum absolute error.
+                     If the weights cannot be stored within the error they are stored as float32.
+    :return: dictionary of the influence name table, vertex offsets, influence indices and weight values
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    if tolerance:
+        weights = np.where(np.abs(weights) > tolerance, weights, 0.0)
+
+    quantized = None
+    if maxError is not None:
+        quantized, normalized = quantizeWeights(weights, maxError)
+        if quantized is None:
+            logger.warning(
+                f"Weights cannot be quantized within {maxError}. Storing float weights"
+            )
+
+    storedWeights = weights if quantized is None else quantized
+    mask = storedWeights != 0
+
+    offsets = np.zeros(weights.shape[0] + 1, dtype=np.int32)
+    np.cumsum(mask.sum(axis=1), out=offsets[1:])
+
+    # nonzero is row major so the values are sorted by vertex
+    vertexIds, influenceIds = np.nonzero(mask)
+
+    encodedWeights = OrderedDict()
+    encodedWeights["influences"] = list(influences)
+    encodedWeights["offsets"] = offsets
+    encodedWeights["indices"] = influenceIds.astype(np.int32)
+    if quantized is None:
+        encodedWeights["values"] = weights[vertexIds, influenceIds].astype(np.float32)
+    else:
+        encodedWeights["values"] = quantized[vertexIds, influenceIds]
+        encodedWeights["scale"] = QUANTIZE_SCALE
+        encodedWeights["normalized"] = normalized
+    return encodedWeights
+
+
+def decodeWeights(encodedWeights: Dict) -> Tuple[np.ndarray, List[str]]:
+    """
+    Decode weights stored in a sparse compressed row layout into a (vertex x influence) weights array.
+    Quantized weights are renormalized exactly.
+
+    :param encodedWeights: dictionary of the influence name table, vertex offsets, influence indices and weight values
+    :return: (vertex x influence) array of weights and the name of the influence of each column
+    """
+    influences = [str(influence) for influence in encodedWeights["influences"]]
+    offsets = np.asarray(encodedWeights["offsets"], dtype=np.int64)
+    influenceIds = np.asarray(encodedWeights["indices"], dtype=np.int64)
+    values = np.asarray(encodedWeights["values"], dtype=np.float64)
+
+    vertexCount = len(offsets) - 1
+    vertexIds = np.repeat(np.arange(vertexCount), np.diff(offsets))
+
+    weights = np.zeros((vertexCount, len(influences)), dtype=np.float64)
+    weights[vertexIds, influenceIds] = values
+
+    if encodedWeights.get("scale"):
+        weights = dequantizeWeights(
+            weights,
+            scale=encodedWeights["scale"],
+            normalized=encodedWeights.get("normalized", True),
+        )
+    return weights, influences
+
+
+def alignInfluences(
+    weights: np.ndarray, influences: List[str], targetInfluences: List[str]
+) -> np.ndarray:
+    """
+    Reorder the columns of a weights array to match a list of influences.
+    Target influences that are not in the weights array are filled with zeros.
+
+    :param weights: (vertex x influence) array of weights
+    :param influences: name of the influence of each column in the weights array
+    :param targetInfluences: influence order of the output array. Must contain all influences.
+    :return: (vertex x target influence) array of weights
+    """
+    targetIndices = {influence: i for i, influence in enumerate(targetInfluences)}
+
+    alignedWeights = np.zeros((weights.shape[0], len(targetInfluences)))
+    alignedWeights[:, [targetIndices[influence] for influence in influences]] = weights
+    return alignedWeights
+
+
+def resizeWeights(weights: np.ndarray, vertexCount: int) -> np.ndarray:
+    """
+    Pad or truncate a (vertex x influence) weights array to a number of vertices.
+    Weights are matched by vertex index. Added vertices have no weights.
+
+    :param weights: (vertex x influence) array of weights
+    :param vertexCount: number of vertices in the output array
+    :return: (vertexCount x influence) array of weights
+    """
+    resizedWeights = np.zeros((vertexCount, weights.shape[1]), dtype=weights.dtype)
+    count = min(vertexCount, len(weights))
+    resizedWeights[:count] = weights[:count]
+    return resizedWeights
+
+
+def _updateHash(hasher, value) -> None:
+    """Add a value of node data to a hash. Arrays are hashed from their raw values"""
+    if isinstance(value, np.ndarray):
+        hasher.update(f"{value.dtype.str}{value.shape}".encode("utf-8"))
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b"{")
+        for key in sorted(value, key=str):
+            hasher.update(json.dumps(str(key)).encode("utf-8"))
+            _updateHash(hasher, value[key])
+        hasher.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        hasher.update(b"[")
+        for item in value:
+            _updateHash(hasher, item)
+        hasher.update(b"]")
+    else:
+        if isinstance(value, np.generic):
+            value = value.item()
+        hasher.update(json.dumps(value).encode("utf-8"))
+
+
+def hashNodeData(nodeData: Dict) -> str:
+    """
+    Get a content hash of the data of a node. Nodes with the same data always have the same hash.
+
+    :param nodeData: data of a single node
+    :return: hex digest of the data
+    """
+    hasher = hashlib.sha1()
+    _updateHash(hasher, nodeData)
+    return hasher.hexdigest()
+
 
 class SkinData(maya_data.MayaData):
     """This class to save and load skinCluster data"""
 
-    def __init__(self):
+    def __init__(self, maxError: float = None):
+        """
+        :param maxError: Optional- store the gathered weights as 16 bit fixed point values with this
+                         maximum absolute error. By default weights are stored as float32.
+        """
         super(SkinData, self).__init__()
+        self.maxError = maxError
 
     def gatherData(self, node):
         if cmds.nodeType(node) in {"nurbsCurve", "nurbsSurface", "mesh"}:
@@ -71,9 +295,10 @@ class SkinData(maya_data.MayaData):
             preBindInputs[influence] = preBindJoint[0] if preBindJoint else None
 
         data["preBindInputs"] = preBindInputs
-        weights, vertexCount = skinCluster.getWeights(node)
-        data["vertexCount"] = vertexCount
-        data["weights"] = weights
+        weights, influences = skinCluster.getWeightsArray(node)
+        data["vertexCount"] = weights.shape[0]
+        data["weightsFormat"] = WEIGHTS_FORMAT_CSR
+        data["weights"] = encodeWeights(weights, influences, maxError=self.maxError)
 
         if data["skinningMethod"] == skinningMethodNames[-1]:
             data["dqBlendWeights"] = skinCluster.getBlendWeights(node)
@@ -83,15 +308,138 @@ class SkinData(maya_data.MayaData):
     def getInfluences(self, nodes):
         """get all the influence joints"""
         nodes = common.toList(nodes)
+        influences = list()
         for node in nodes:
-            weights = self._data[node]["weights"]
+            nodeData = self._data[node]
+            if nodeData.get("weightsFormat", WEIGHTS_FORMAT_DICT) == WEIGHTS_FORMAT_CSR:
+                nodeInfluences = nodeData["weights"]["influences"]
+            else:
+                nodeInfluences = nodeData["weights"].keys()
 
-            influences = list(weights.keys())
+            influences += [inf for inf in nodeInfluences if inf not in influences]
 
         return influences
 
-    def applyData(self, nodes, rebind=True):
+    def getWeightsArray(self, node: str) -> Tuple[np.ndarray, List[str]]:
+        """
+        Get the weights of a node as a (vertex x influence) array.
+        Supports both the sparse compressed row layout and weights stored as a dictionary in older files.
+
+        :param node: node to get the weights of
+        :return: (vertex x influence) array of weights and the name of the influence of each column
+        """
+        nodeData = self._data[node]
+        if nodeData.get("weightsFormat", WEIGHTS_FORMAT_DICT) == WEIGHTS_FORMAT_CSR:
+            return decodeWeights(nodeData["weights"])
+
+        return skinCluster.weightsDictToArray(
+            nodeData["weights"], nodeData["vertexCount"]
+        )
+
+    def getHash(self, node: str) -> str:
+        """
+        Get the content hash of a node. See `hashNodeData`.
+
+        :param node: node to get the hash for
+        :return: hex digest of the node data
+        """
+        return hashNodeData(self._data[node])
+
+    def cleanupWeights(
+        self, nodes=None, maxInfluences: int = None, pruneThreshold: float = 0.0
+    ) -> Dict[str, int]:
+        """
+        Clean up the stored weights without loading them into maya.
+        Removes weights below the prune threshold, limits the influences of each vertex, renormalizes and removes
+        influences that no longer have any weights. See `skinCluster.cleanupWeightsArray`.
+
+        :param nodes: Optional- nodes to clean up. By default all nodes are cleaned up.
+        :param maxInfluences: Optional- maximum number of influences per vertex
+        :param pruneThreshold: weights below this value are removed
+        :return: dictionary of the number of changed vertices of each node
+        """
+        nodes = common.toList(nodes) if nodes else self.getKeys()
+
+        report = OrderedDict()
+        for node in nodes:
+            weights, influences = self.getWeightsArray(node)
+            cleanedWeights, changedVertices = skinCluster.cleanupWeightsArray(
+                weights, maxInfluences=maxInfluences, pruneThreshold=pruneThreshold
+            )
+
+            usedColumns = np.flatnonzero(cleanedWeights.any(axis=0))
+            usedInfluences = [influences[i] for i in usedColumns]
+
+            nodeData = self._data[node]
+            nodeData["weightsFormat"] = WEIGHTS_FORMAT_CSR
+            nodeData["weights"] = encodeWeights(
+                cleanedWeights[:, usedColumns], usedInfluences, maxError=self.maxError
+            )
+            if isinstance(nodeData.get("preBindInputs"), dict):
+                nodeData["preBindInputs"] = OrderedDict(
+                    (influence, bindInput)
+                    for influence, bindInput in nodeData["preBindInputs"].items()
+                    if influence.split(":")[-1] in usedInfluences
+                )
+
+            report[node] = changedVertices
+            logger.info(
+                f"Cleaned up skin weights for {node}: {changedVertices} vertices changed, "
+                f"{len(influences) - len(usedInfluences)} influences removed"
+            )
+        return report
+
+    def verifyWeights(self, nodes=None) -> Dict[str, Dict[str, float]]:
+        """
+        Compare the stored weights against the live skin cluster of each node.
+        The deviation of a vertex is the largest absolute difference of any of its influence weights.
+
+        :param nodes: Optional- nodes to verify. By default all nodes are verified.
+        :return: dictionary of the max and mean per-vertex deviation of each node
+        """
+        nodes = common.toList(nodes) if nodes else self.getKeys()
+
+        report = OrderedDict()
+        for node in nodes:
+            storedWeights, storedInfluences = self.getWeightsArray(node)
+            liveWeights, liveInfluences = skinCluster.getWeightsArray(node)
+            if storedWeights.shape[0] != liveWeights.shape[0]:
+                logger.warning(
+                    f"Cannot verify '{node}'. The vertex count does not match the stored weights"
+                )
+                continue
+
+            influences = list(OrderedDict.fromkeys(storedInfluences + liveInfluences))
+            deviation = np.abs(
+                alignInfluences(storedWeights, storedInfluences, influences)
+                - alignInfluences(liveWeights, liveInfluences, influences)
+            )
+            vertexDeviation = deviation.max(axis=1, initial=0.0)
+
+            report[node] = OrderedDict(
+                maxDeviation=float(vertexDeviation.max(initial=0.0)),
+                meanDeviation=(
+                    float(vertexDeviation.mean()) if vertexDeviation.size else 0.0
+                ),
+            )
+            logger.info(
+                f"{node}: max deviation {report[node]['maxDeviation']:.2e}, "
+                f"mean deviation {report[node]['meanDeviation']:.2e}"
+            )
+        return report
+
+    def applyData(self, nodes, rebind=True, maxInfluences=None, pruneThreshold=0.0):
+        """
+        Apply the skin weights to each node.
+
+        :param nodes: nodes to apply the skin weights to
+        :param rebind: delete any existing skin cluster and bind a new one
+        :param maxInfluences: Optional- enforce a maximum number of influences per vertex.
+                              Influences without any weights are not added to new skin clusters.
+        :param pruneThreshold: weights below this value are removed
+        """
         nodes = common.toList(nodes)
+        cleanup = bool(maxInfluences or pruneThreshold)
 
         for node in nodes:
             if not cmds.objExists(node):
@@ -108,7 +456,30 @@ class SkinData(maya_data.MayaData):
             mesh = cmds.listRelatives(meshShape, p=True)[0]
             meshSkin = skinCluster.getSkinCluster(mesh)
 
-            influenceObjects = list(self._data[node]["weights"].keys())
+            weights, influenceObjects = self.getWeightsArray(node)
+
+            # weights are matched by vertex index when the topology changed since they were saved
+            vertexCount = shape.getPointCount(meshShape)
+            if len(weights) != vertexCount:
+                logger.warning(
+                    f"{node}: the skin weights were saved with {len(weights)} vertices. "
+                    f"It now has {vertexCount} vertices"
+                )
+                weights = resizeWeights(weights, vertexCount)
+
+            removedInfluences = set()
+            if cleanup:
+                weights, changedVertices = skinCluster.cleanupWeightsArray(
+                    weights, maxInfluences=maxInfluences, pruneThreshold=pruneThreshold
+                )
+                if rebind:
+                    usedColumns = np.flatnonzero(weights.any(axis=0))
+                    removedInfluences = set(influenceObjects) - {
+                        influenceObjects[i] for i in usedColumns
+                    }
+                    weights = weights[:, usedColumns]
+                    influenceObjects = [influenceObjects[i] for i in usedColumns]
+                logger.info(f"Cleaned up {changedVertices} vertices on {node}")
 
             if not rebind and meshSkin:
                 assert len(skinCluster.getInfluenceJoints(meshSkin)) == len(
@@ -136,13 +507,13 @@ class SkinData(maya_data.MayaData):
                 meshSkin = skinCluster.createSkinCluster(
                     geometry=mesh,
                     influences=realInfluences,
-                    maxInfluences=3,
+                    maxInfluences=maxInfluences or 3,
                     dropoffRate=1.0,
                     weighDistribution=skinCluster.WeighDistribution.Neighbors,
                 )
 
             # set the skinweights
-            skinCluster.setWeights(mesh, meshSkin, self._data[node]["weights"])
+            skinCluster.setWeightsArray(mesh, meshSkin, weights, influenceObjects)
 
             # connect the prebind inputs
             # Here I have a check because in the inital implementation the preBindInputs were stored in a list.
@@ -150,7 +521,7 @@ class SkinData(maya_data.MayaData):
             # dictionary where the index is re-found every time weights are loaded.
             if isinstance(self._data[node]["preBindInputs"], OrderedDict):
                 for influence, bindInput in self._data[node]["preBindInputs"].items():
-                    if bindInput:
+                    if bindInput and influence not in removedInfluences:
                         influenceIndex = skinCluster.getInfluenceIndex(
                             skinCluster=meshSkin, influence=influence
                         )
@@ -201,3 +572,186 @@ class SkinData(maya_data.MayaData):
                     mesh, meshSkin, self._data[node]["dqBlendWeights"]
                 )
             logger.info(f"Loaded Skin Weights for: {node}")
+
+
+class SkinManifest(object):
+    """
+    Manifest of the skin files in a directory used for incremental saves.
+
+    The manifest stores the content hash of each node, the file it was saved to and the content hash of that file.
+    It only holds content hashes so it can be committed with the skin files and only changes when a file changes.
+    A node only needs to be written when its hash changed or its file was changed on disk.
+    Hashing the files is skipped with a cache of file modification times that is stored locally in the
+    `MANIFEST_STAMPS_DIRECTORY`. Skin files are regular data files so loading them does not need the manifest.
+
+    Example:
+        >>> manifest = SkinManifest.read("path/to/skins")
+        >>> if manifest.needsWrite(node, skinFile, dataObj.getHash(node)):
+        >>>     dataObj.write(skinFile)
+        >>>     manifest.update(node, skinFile, dataObj.getHash(node))
+        >>> manifest.write()
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: directory of the skin files
+        """
+        self.directory = directory
+        self.filepath = os.path.join(directory, MANIFEST_FILE)
+        self.nodes = OrderedDict()
+
+        directoryHash = hashlib.sha1(
+            os.path.realpath(directory).encode("utf-8")
+        ).hexdigest()[:8]
+        self.stampsFilepath = os.path.join(
+            MANIFEST_STAMPS_DIRECTORY, f"{directoryHash}.json"
+        )
+        # {fileName: [mtime, size, fileHash]}
+        self.stamps = dict()
+        self._modified = False
+
+    @classmethod
+    def read(cls, directory: str) -> "SkinManifest":
+        """
+        Read the manifest of a directory. If the directory does not have a valid manifest it is empty.
+
+        :param directory: directory of the skin files
+        :return: manifest of the directory
+        """
+        manifest = cls(directory)
+        manifest.stamps = manifest._readStamps()
+        if not os.path.isfile(manifest.filepath):
+            return manifest
+
+        try:
+            with open(manifest.filepath, "r", encoding="utf-8") as f:
+                manifestData = json.load(f, object_pairs_hook=OrderedDict)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read skin manifest {manifest.filepath}: {e}")
+            return manifest
+
+        if manifestData.get("version", 0) > MANIFEST_VERSION:
+            logger.warning(
+                f"{manifest.filepath} was written with a newer version of the manifest"
+            )
+            return manifest
+
+        manifest.nodes = manifestData.get("nodes", OrderedDict())
+        # older manifests stored machine specific file stamps. Remove them with the next write.
+        for entry in manifest.nodes.values():
+            if entry.pop("stamp", None) is not None:
+                manifest._modified = True
+        return manifest
+
+    def write(self) -> None:
+        """
+        Write the manifest to the directory. The manifest is only written if a node was updated with new hashes.
+        The local cache of file modification times is always written.
+        """
+        self._writeStamps()
+        if not self._modified and os.path.isfile(self.filepath):
+            return
+
+        manifestData = OrderedDict()
+        manifestData["version"] = MANIFEST_VERSION
+        manifestData["nodes"] = self.nodes
+
+        with open(self.filepath, "w", encoding="utf-8") as f:
+            json.dump(manifestData, f, indent=4)
+        self._modified = False
+
+    def _readStamps(self) -> Dict:
+        """Read the local cache of file modification times. The cache is empty if it does not exist"""
+        try:
+            with open(self.stampsFilepath, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return dict()
+
+    def _writeStamps(self) -> None:
+        """
+        Write the local cache of file modification times.
+        The cache is optional so failing to write it is not an error.
+        """
+        try:
+            os.makedirs(MANIFEST_STAMPS_DIRECTORY, exist_ok=True)
+            with open(self.stampsFilepath, "w", encoding="utf-8") as f:
+                json.dump(self.stamps, f)
+        except OSError:
+            logger.debug(f"Failed to write skin manifest stamps: {self.stampsFilepath}")
+
+    def _getFileHash(self, filepath: str) -> Optional[str]:
+        """
+        Get the content hash of a file. The hash is only computed if the modification time or size of the file
+        changed since it was last hashed on this machine.
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+
+        fileName = os.path.basename(filepath)
+        fileStamp = [stat.st_mtime_ns, stat.st_size]
+        cachedStamp = self.stamps.get(fileName)
+        if cachedStamp and cachedStamp[:2] == fileStamp:
+            return cachedStamp[2]
+
+        hasher = hashlib.sha1()
+        try:
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+        except OSError:
+            return None
+
+        self.stamps[fileName] = fileStamp + [hasher.hexdigest()]
+        return hasher.hexdigest()
+
+    def needsWrite(self, node: str, filepath: str, nodeHash: str) -> bool:
+        """
+        Check if a node needs to be written.
+
+        :param node: name of the node
+        :param filepath: skin file the node is saved to
+        :param nodeHash: current hash of the node. See `SkinData.getHash`.
+        :return: True if the node changed, is saved to a different file or its file changed on disk
+        """
+        entry = self.nodes.get(node)
+        if not entry:
+            return True
+        if entry["file"] != os.path.basename(filepath):
+            return True
+        if entry["hash"] != nodeHash:
+            return True
+
+        fileHash = self._getFileHash(filepath)
+        return fileHash is None or fileHash != entry.get("fileHash")
+
+    def getFile(self, node: str) -> Optional[str]:
+        """
+        Get the path of the file a node was last saved to.
+
+        :param node: name of the node
+        :return: path to the skin file or None if the node is not in the manifest
+        """
+        entry = self.nodes.get(node)
+        if not entry:
+            return None
+        return os.path.join(self.directory, entry["file"])
+
+    def update(self, node: str, filepath: str, nodeHash: str) -> None:
+        """
+        Store the hash of a node after it was written.
+
+        :param node: name of the node
+        :param filepath: skin file the node was written to. It must be finished writing.
+        :param nodeHash: hash of the written node. See `SkinData.getHash`.
+        """
+        entry = OrderedDict()
+        entry["file"] = os.path.basename(filepath)
+        entry["hash"] = nodeHash
+        entry["fileHash"] = self._getFileHash(filepath)
+
+        if self.nodes.get(node) != entry:
+            self.nodes[node] = entry
+            self._modified = True
@@ -5,8 +5,11 @@ import logging
 
 import maya.OpenMaya as om
 import maya.OpenMayaAnim as oma
+import maya.api.OpenMaya as om2
 import maya.cmds as cmds
+import numpy as np
 
+from rigamajig2.maya import apiUndo
 from rigamajig2.maya import curve
 from rigamajig2.maya import mesh
 from rigamajig2.maya import shape
@@ -276,7 +279,7 @@ def createCleanMesh(dupGeo, origShape) -> str:
     shapes = cmds.listRelatives(dupGeo, s=True)
 
     # get the point positions of the orig shape
-    origPoints = mesh.getVertPositions(origShape, world=False)
+    origPoints = mesh.getPointsArray(origShape, world=False)
 
     # delete all intermediate shapes
     for eachShape in shapes:
@@ -284,7 +287,7 @@ def createCleanMesh(dupGeo, origShape) -> str:
             cmds.delete(eachShape)
 
     # set the point positions the ones from the orig shape
-    mesh.setVertPositions(dupGeo, vertList=origPoints, world=False)
+    mesh.setPointsArray(dupGeo, origPoints, world=False)
 
     return dupGeo
 
@@ -387,45 +390,195 @@ def getGeoIndex(deformer, geo):
             return int(deformedIndecies[n])
 
 
-def getWeights(deformer, geometry=None):
+def getPlugWeights(plug, pointCount, default=1.0):
+    """
+    Get the values of a sparse multi float plug (ie. blendshape target or base weights) as an array.
+    Elements that do not exist on the plug have the default value.
+    The elements are read in a single pass over the array data handle of the plug.
+
+    :param om2.MPlug plug: array plug to read the values of
+    :param int pointCount: number of values to get
+    :param float default: value of elements that do not exist
+    :return: array of values
+    :rtype: np.ndarray
+    """
+    weights = np.full(pointCount, default, dtype=np.float32)
+
+    dataHandle = plug.asMDataHandle()
+    try:
+        arrayHandle = om2.MArrayDataHandle(dataHandle)
+        elementCount = len(arrayHandle)
+        indices = np.empty(elementCount, dtype=np.int64)
+        values = np.empty(elementCount, dtype=np.float32)
+        for i in range(elementCount):
+            arrayHandle.jumpToPhysicalElement(i)
+            indices[i] = arrayHandle.elementLogicalIndex()
+            values[i] = arrayHandle.inputValue().asFloat()
+    finally:
+        plug.destructHandle(dataHandle)
+
+    inRange = indices < pointCount
+    weights[indices[inRange]] = values[inRange]
+    return weights
+
+
+def setPlugWeights(plug, weights, default=1.0, currentWeights=None):
+    """
+    Set the values of a sparse multi float plug (ie. blendshape target or base weights) from an array.
+    Only the values that changed are added to an array data builder, which is set on the plug in one call.
+    This is not undoable on its own, use `apiUndo.execute` to record it in the undo queue.
+
+    :param om2.MPlug plug: array plug to set the values of
+    :param np.ndarray weights: array of values
+    :param float default: value of elements that do not exist
+    :param np.ndarray currentWeights: Optional - current values of the plug. If omitted they are read from the plug.
+    :return: number of values set
+    :rtype: int
+    """
+    weights = np.asarray(weights, dtype=np.float32)
+    if currentWeights is None:
+        currentWeights = getPlugWeights(plug, len(weights), default=default)
+
+    changedIndices = np.flatnonzero(currentWeights != weights)
+    if not len(changedIndices):
+        return 0
+
+    dataHandle = plug.asMDataHandle()
+    try:
+        arrayHandle = om2.MArrayDataHandle(dataHandle)
+        builder = arrayHandle.builder()
+        for index, value in zip(changedIndices.tolist(), weights[changedIndices].tolist()):
+            builder.addElement(index).setFloat(value)
+        arrayHandle.set(builder)
+        plug.setMDataHandle(dataHandle)
+    finally:
+        plug.destructHandle(dataHandle)
+    return len(changedIndices)
+
+
+class _WeightsAccess(object):
+    """Function set, geometry and complete component used to get and set the weights of a geometry of a deformer"""
+
+    def __init__(self, deformer, geometry=None):
+        if not geometry:
+            geometry = common.getFirst(getAffectedGeo(deformer))
+
+        self.geometryIndex = getGeoIndex(deformer, geometry)
+        if self.geometryIndex is None:
+            raise Exception(f"The geometry '{geometry}' is not part of the deformer set for '{deformer}'")
+
+        self.pointCount = shape.getPointCount(geometry)
+        geometryShape = shape.getShapes(geometry) or geometry
+
+        # Use the old api since there is no MFnWeightGeometryFilter in om2.
+        selList = om.MSelectionList()
+        selList.add(deformer)
+        selList.add(geometryShape)
+        deformerObj = om.MObject()
+        selList.getDependNode(0, deformerObj)
+        self.geometryPath = om.MDagPath()
+        selList.getDagPath(1, self.geometryPath)
+        self.weightFn = oma.MFnWeightGeometryFilter(deformerObj)
+
+        # meshes and curves have a single indexed component matching the point order.
+        # Other geometry falls back to setting the weightList plug directly.
+        self.components = None
+        componentType = {"mesh": om.MFn.kMeshVertComponent, "nurbsCurve": om.MFn.kCurveCVComponent}.get(
+            cmds.nodeType(geometryShape)
+        )
+        if componentType is not None:
+            componentFn = om.MFnSingleIndexedComponent()
+            self.components = componentFn.create(componentType)
+            componentFn.setCompleteData(self.pointCount)
+
+        selList = om2.MSelectionList()
+        selList.add("{}.weightList[{}].weights".format(deformer, self.geometryIndex))
+        self.plug = selList.getPlug(0)
+
+    def get(self):
+        """Get the weights as a float32 array"""
+        if self.components is None:
+            return getPlugWeights(self.plug, self.pointCount)
+
+        weights = om.MFloatArray()
+        self.weightFn.getWeights(self.geometryIndex, self.components, weights)
+        return np.fromiter(weights, dtype=np.float32, count=weights.length())
+
+    def set(self, weights):
+        """Set the weights from a float32 array with a single MFnWeightGeometryFilter call"""
+        if self.components is None:
+            setPlugWeights(self.plug, weights)
+            return
+
+        # build the MFloatArray from a float buffer instead of appending each value
+        util = om.MScriptUtil()
+        util.createFromList(weights.tolist(), len(weights))
+        values = om.MFloatArray(util.asFloatPtr(), len(weights))
+        self.weightFn.setWeight(self.geometryPath, self.components, values)
+
+
+def getWeightsArray(deformer, geometry=None):
     """
-    Get weights for the specified geometry.
-    Optionally pass a geometry to get weights for specific geometry.
+    Get the deformer weights of a geometry as an array.
 
     :param str deformer: deformer to get the geometry weights for
-    :param str geometry: name fo the geometry to get the weights for
-    :return: a dictionary of geometry indices and a list of deformer weights ie {0: [1, 1, 1, 0, ...]
-    :rtype: dict
+    :param str geometry: Optional - name of the geometry to get the weights for.
+                If ommited the first geometry of the deformer will be used.
+    :return: array of the weight of each point
+    :rtype: np.ndarray
     """
-    weightList = dict()
     if not isDeformer(deformer):
         logger.error("object '{}' is not a deformer".format(deformer))
         return
 
-    if not geometry:
-        geometry = common.getFirst(getAffectedGeo(deformer))
+    return _WeightsAccess(deformer, geometry).get()
 
-    pointCount = shape.getPointCount(geometry) - 1
 
-    geometryIndex = getGeoIndex(deformer, geometry)
+def setWeightsArray(deformer, weights, geometry=None, undoable=True):
+    """
+    Set the deformer weights of a geometry from an array.
+    The weights of meshes and curves are set with a single MFnWeightGeometryFilter call.
 
-    attr = "{}.wl[{}].w[0:{}]".format(deformer, geometryIndex, pointCount)
-    attrDefaultTest = "{}.wl[{}].w[*]".format(deformer, geometryIndex)
+    :param str deformer: deformer to set the weights of
+    :param np.ndarray weights: array of the weight of each point
+    :param str geometry: Optional - geometry to set the weights of.
+                If ommited the first geometry of the deformer will be used.
+    :param bool undoable: record the change in the undo queue
+    """
+    if not isDeformer(deformer):
+        logger.error("object '{}' is not a deformer".format(deformer))
+        return
 
-    if not cmds.objExists(attrDefaultTest):
-        values = [1 for _ in range(pointCount + 1)]
-    else:
-        values = cmds.getAttr(attr)
-        values = [round(float(v), 5) for v in values]
+    weightsAccess = _WeightsAccess(deformer, geometry)
+    weights = np.asarray(weights, dtype=np.float32)
+    if len(weights) != weightsAccess.pointCount:
+        raise ValueError(f"Expected {weightsAccess.pointCount} weights. Got {len(weights)}")
+
+    oldWeights = weightsAccess.get()
+    apiUndo.execute(
+        redo=lambda: weightsAccess.set(weights),
+        undo=lambda: weightsAccess.set(oldWeights),
+        undoable=undoable,
+    )
+
+
+def getWeights(deformer, geometry=None):
+    """
+    Get weights for the specified geometry.
+    Optionally pass a geometry to get weights for specific geometry.
 
-    opimizedDict = dict()
-    # optimize the value list
-    for i, v in enumerate(values):
-        # if the weights are almost equal to one skip adding them.
-        if not abs(v - 1.0) <= 0.0001:
-            opimizedDict[i] = v
+    :param str deformer: deformer to get the geometry weights for
+    :param str geometry: name fo the geometry to get the weights for
+    :return: a dictionary of point indices and deformer weights. Weights of 1.0 are omitted ie {3: 0.5, 4: 0.25 ...}
+    :rtype: dict
+    """
+    weights = getWeightsArray(deformer, geometry=geometry)
+    if weights is None:
+        return
 
-    return opimizedDict
+    # if the weights are almost equal to one skip adding them.
+    indices = np.flatnonzero(np.abs(weights - 1.0) > 0.0001)
+    return {index: round(value, 5) for index, value in zip(indices.tolist(), weights[indices].tolist())}
 
 
 def setWeights(deformer, weights, geometry=None):
@@ -434,7 +587,7 @@ def setWeights(deformer, weights, geometry=None):
     Optionally pass a geometry to set weights for specific geometry.
 
     :param deformer: deformer to set the weights of
-    :param weights: list of weights to set
+    :param weights: dictionary of point indices and weights. Points that are not in the dictionary are set to 1.0
     :param geometry: Optional - geometry to set the attributes of.
                 If ommited the first geometry of the deformer will be used.
     """
@@ -444,32 +597,15 @@ def setWeights(deformer, weights, geometry=None):
 
     if not geometry:
         geometry = common.getFirst(getAffectedGeo(deformer))
-    pointCount = shape.getPointCount(geometry) - 1
-
-    geometryIndex = getGeoIndex(deformer, geometry)
-    if geometryIndex is None:
-        raise Exception(f"The geometry '{geometry}' is not part of the deformer set for '{deformer}'")
-
-    tmpWeights = list()
-    for i in range(pointCount + 1):
-        # we need to check if there are weights in the dictionary. We can use get to check and return None if
-        # there is not a key for the specified weight. After that we can check if the weight == None. If we do
-        # we replace it with 1.0 since we stripped out any values at 1.0 when we gathered the weights
-        if weights.get(i) is not None:
-            tmpWeight = weights.get(i)
-        elif weights.get(str(i)) is not None:
-            tmpWeight = weights.get(str(i))
-        else:
-            tmpWeight = 1.0
 
-        if tmpWeight is None:
-            tmpWeight = 1.0
-        # finally append the weight to the list
-        tmpWeights.append(tmpWeight)
+    # we stripped out any values at 1.0 when we gathered the weights. Keys may be strings when read from json.
+    weightsArray = np.ones(shape.getPointCount(geometry), dtype=np.float32)
+    indices = np.fromiter((int(index) for index in weights), dtype=np.int64, count=len(weights))
+    values = np.array([1.0 if value is None else value for value in weights.values()], dtype=np.float32)
+    inRange = indices < len(weightsArray)
+    weightsArray[indices[inRange]] = values[inRange]
 
-    attr = "{}.wl[{}].w[0:{}]".format(deformer, geometryIndex, pointCount)
-    weightList = tmpWeights
-    cmds.setAttr(attr, *weightList)
+    setWeightsArray(deformer, weightsArray, geometry=geometry)
 
 
 def addGeoToDeformer(deformer, geo):
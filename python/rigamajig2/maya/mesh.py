@@ -5,7 +5,9 @@ import logging
 
 import maya.api.OpenMaya as om2
 import maya.cmds as cmds
+import numpy as np
 
+import rigamajig2.maya.apiUndo as apiUndo
 import rigamajig2.maya.shape as shape
 import rigamajig2.shared.common as common
 
@@ -91,20 +93,86 @@ def getVertPositions(mesh, world=True):
     return vertPos
 
 
+def getPointsArray(mesh, world=False):
+    """
+    Get the vertex positions of a mesh as an array.
+
+    :param str mesh: mesh to get the positions of
+    :param bool world: Get the vertex positions in world space. False is local position
+    :return: (vertex x 3) array of vertex positions
+    :rtype: np.ndarray
+    """
+    space = om2.MSpace.kWorld if world else om2.MSpace.kObject
+    points = getMeshFn(mesh).getPoints(space)
+    return np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3]
+
+
+def setPointsArray(mesh, points, world=False, undoable=True):
+    """
+    Set the positions of all vertices of a mesh from an array with a single MFnMesh.setPoints call.
+    The previous positions are recorded so the change can be undone.
+
+    :param str mesh: mesh to set the positions of
+    :param np.ndarray points: (vertex x 3) array of vertex positions
+    :param bool world: Set the vertex positions in world space. False is local position
+    :param bool undoable: record the change in the undo queue
+    """
+    space = om2.MSpace.kWorld if world else om2.MSpace.kObject
+    dagPath = getMeshFn(mesh).dagPath()
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    previousPoints = om2.MFnMesh(dagPath).getPoints(space)
+    if len(points) != len(previousPoints):
+        raise ValueError(
+            f"Expected {len(previousPoints)} points for '{mesh}'. Got {len(points)}"
+        )
+    newPoints = om2.MPointArray(points.tolist())
+
+    def _redo():
+        meshFn = om2.MFnMesh(dagPath)
+        meshFn.setPoints(newPoints, space)
+        meshFn.updateSurface()
+
+    def _undo():
+        meshFn = om2.MFnMesh(dagPath)
+        meshFn.setPoints(previousPoints, space)
+        meshFn.updateSurface()
+
+    apiUndo.execute(_redo, _undo, undoable=undoable)
+
+
+def getEdgeArray(mesh):
+    """
+    Get the vertex indices of every edge of a mesh as an array.
+
+    :param str mesh: mesh to get the edges of
+    :return: (edge x 2) array of vertex indices. Each edge is listed once with the lower vertex index first.
+    :rtype: np.ndarray
+    """
+    polygonCounts, polygonConnects = getMeshFn(mesh).getVertices()
+    polygonCounts = np.array(polygonCounts, dtype=np.int64)
+    polygonConnects = np.array(polygonConnects, dtype=np.int64)
+
+    # each face vertex connects to the next vertex of its face. The last vertex wraps to the first.
+    faceStarts = np.repeat(np.cumsum(polygonCounts) - polygonCounts, polygonCounts)
+    faceEnds = np.repeat(np.cumsum(polygonCounts), polygonCounts)
+    nextIndices = np.arange(len(polygonConnects)) + 1
+    nextIndices = np.where(nextIndices == faceEnds, faceStarts, nextIndices)
+
+    edges = np.stack([polygonConnects, polygonConnects[nextIndices]], axis=1)
+    return np.unique(np.sort(edges, axis=1), axis=0)
+
+
 def setVertPositions(mesh, vertList, world=False):
     """
     Using a list of vertex positions set the vertex positions of the provided mesh.
-    This function uses the maya commands. it is slower than the API version but undoable if run from the script editor.
+    All positions are set at once and the change is undoable. See `setPointsArray`.
 
     :param str mesh: mesh to set the vertices of
     :param list vertList: list of vertex positions:
     :param bool world: Space to set the vertex positions
     """
-    for i, vtx in enumerate(getVerts(mesh)):
-        if world:
-            cmds.xform(vtx, worldSpace=True, translation=vertList[i])
-        else:
-            cmds.xform(vtx, worldSpace=False, translation=vertList[i])
+    setPointsArray(mesh, vertList, world=world)
 
 
 def getVerts(mesh):
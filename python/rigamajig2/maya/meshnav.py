@@ -2,13 +2,364 @@
 This module contains functions to navigate mesh topology
 """
 
-import operator
+import hashlib
+import sys
+from collections import OrderedDict
 
 import maya.OpenMaya as om
 import maya.api.OpenMaya as om2
 import maya.cmds as cmds
+import numpy as np
 
 import rigamajig2.maya.mesh
+from rigamajig2.shared import spatial
+
+# maximum number of mesh queries kept by `getMeshQuery`. The least recently used query is removed first
+MESH_QUERY_CACHE_SIZE = 16
+
+# mesh queries used by the single point functions. See `getMeshQuery`
+_meshQueryCache = OrderedDict()
+# callbacks that clear the cache when a new scene is created or opened
+_sceneCallbackIds = list()
+
+
+def _getDagPath(mesh):
+    """Get the dag path a mesh name currently resolves to"""
+    selList = om2.MSelectionList()
+    selList.add(mesh)
+    return selList.getDagPath(0)
+
+
+def _hashArrays(*arrays):
+    """Get a hash of the values of a list of arrays"""
+    hasher = hashlib.sha1()
+    for array in arrays:
+        hasher.update(np.ascontiguousarray(array).tobytes())
+    return hasher.hexdigest()
+
+
+class MeshQuery(object):
+    """
+    Answer batched closest point queries on a mesh in world space.
+
+    The mesh function set, a mesh intersector, a KD-tree of the vertex positions and the triangles of the mesh
+    are built once and reused for every query. Node dirty and world matrix callbacks mark the query as dirty
+    when the mesh changes. Queries on a clean mesh skip reading the mesh entirely. On a dirty mesh the topology
+    and world space points are hashed and anything that changed is rebuilt.
+    UV edits do not change the hashes, use `update(force=True)`. Use `removeCallbacks` when the query is no
+    longer needed.
+
+    Example:
+        >>> meshQuery = MeshQuery("body")
+        >>> vertexIds, distances = meshQuery.closestVertices(points)
+        >>> uvs = meshQuery.closestUVs(points)
+    """
+
+    def __init__(self, mesh):
+        """
+        :param str mesh: mesh to query
+        """
+        self._callbackIds = list()
+
+        self.mesh = mesh
+        self.meshFn = rigamajig2.maya.mesh.getMeshFn(mesh)
+        self.dagPath = _getDagPath(mesh)
+
+        self.topologyHash = None
+        self.pointHash = None
+
+        self.points = None
+        self.triangles = None
+        self.triangleFaces = None
+        self._triangleOffsets = None
+        self._polygonCounts = None
+        self._polygonOffsets = None
+        self._polygonConnects = None
+        self._faceVertexKeys = None
+        self._faceVertexOrder = None
+
+        self._pointIndex = None
+        self._intersector = None
+        self._uvCache = dict()
+
+        # the callbacks only reference the dirty state. If they referenced the query it would never be deleted
+        self._dirtyState = {"dirty": True}
+        self._addCallbacks()
+
+        self.update(force=True)
+
+    def __del__(self):
+        self.removeCallbacks()
+
+    def _addCallbacks(self):
+        """Mark the query as dirty when the mesh shape or its world matrix changes"""
+        dirtyState = self._dirtyState
+
+        def _setDirty(*args):
+            dirtyState["dirty"] = True
+
+        shapePath = self.meshFn.dagPath()
+        self._callbackIds = [
+            om2.MNodeMessage.addNodeDirtyPlugCallback(shapePath.node(), _setDirty),
+            om2.MDagMessage.addWorldMatrixModifiedCallback(shapePath, _setDirty),
+        ]
+
+    def removeCallbacks(self):
+        """Remove the callbacks that watch the mesh. After this the query is only updated with `update(force=True)`"""
+        for callbackId in self._callbackIds:
+            try:
+                om2.MMessage.removeCallback(callbackId)
+            except RuntimeError:
+                pass
+        self._callbackIds = list()
+
+    def isDirty(self):
+        """
+        Check if the mesh changed since the last update.
+
+        :rtype: bool
+        """
+        return self._dirtyState["dirty"]
+
+    def update(self, force=False):
+        """
+        Rebuild the cached data if the topology or the world space points of the mesh changed.
+        The mesh is only read if it changed since the last update.
+
+        :param bool force: rebuild all cached data even if the mesh did not change
+        :return: True if the cached data was rebuilt
+        :rtype: bool
+        """
+        if not force and not self.isDirty():
+            return False
+        # clear the flag before reading the mesh so changes made during the update are not lost
+        self._dirtyState["dirty"] = False
+
+        polygonCounts, polygonConnects = self.meshFn.getVertices()
+        polygonCounts = np.array(polygonCounts, dtype=np.int32)
+        polygonConnects = np.array(polygonConnects, dtype=np.int32)
+        topologyHash = _hashArrays(
+            np.int64(self.meshFn.numVertices), polygonCounts, polygonConnects
+        )
+
+        points = np.array(self.meshFn.getPoints(om2.MSpace.kWorld), dtype=np.float64)
+        points = points.reshape(-1, 4)[:, :3]
+        pointHash = _hashArrays(points)
+
+        topologyChanged = force or topologyHash != self.topologyHash
+        if not topologyChanged and pointHash == self.pointHash:
+            return False
+
+        if topologyChanged:
+            self._buildTopology(polygonCounts, polygonConnects)
+            self.topologyHash = topologyHash
+
+        # the intersector and KD-tree store the point positions so they are rebuilt when the points change
+        self.points = points
+        self.pointHash = pointHash
+        self._pointIndex = spatial.PointIndex(points)
+        self._intersector = om2.MMeshIntersector()
+        self._intersector.create(
+            self.meshFn.object(), self.meshFn.dagPath().inclusiveMatrix()
+        )
+        return True
+
+    def _buildTopology(self, polygonCounts, polygonConnects):
+        """Build the triangles of the mesh and the lookup from a face and vertex to its face vertex"""
+        triangleCounts, triangleVertices = self.meshFn.getTriangles()
+        triangleCounts = np.array(triangleCounts, dtype=np.int64)
+        self.triangles = np.array(triangleVertices, dtype=np.int64).reshape(-1, 3)
+        self.triangleFaces = np.repeat(np.arange(len(triangleCounts)), triangleCounts)
+        self._triangleOffsets = np.concatenate([[0], np.cumsum(triangleCounts)[:-1]])
+
+        # each face vertex is stored as a key of (face * vertexCount + vertex) so it can be found with a search
+        self._polygonCounts = polygonCounts
+        self._polygonOffsets = np.concatenate([[0], np.cumsum(polygonCounts)[:-1]])
+        self._polygonConnects = polygonConnects
+        faceVertexFaces = np.repeat(np.arange(len(polygonCounts)), polygonCounts)
+        self._faceVertexKeys = (
+            faceVertexFaces * self.meshFn.numVertices + polygonConnects
+        )
+        self._faceVertexOrder = np.argsort(self._faceVertexKeys, kind="stable")
+        self._uvCache = dict()
+
+    def _closestTriangles(self, points):
+        """
+        Find the closest triangle to each point.
+
+        :return: arrays of the closest point, face, triangle and the barycentric coordinates within the triangle
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.update()
+
+        triangleIds = np.empty(len(points), dtype=np.int64)
+        for i, point in enumerate(points.tolist()):
+            pointOnMesh = self._intersector.getClosestPoint(
+                om2.MPoint(point), sys.float_info.max
+            )
+            triangleIds[i] = (
+                self._triangleOffsets[pointOnMesh.face] + pointOnMesh.triangle
+            )
+
+        corners = self.points[self.triangles[triangleIds]]
+        closestPoints, barycentric = spatial.closestPointsOnTriangles(
+            points, corners[:, 0], corners[:, 1], corners[:, 2]
+        )
+        return closestPoints, self.triangleFaces[triangleIds], triangleIds, barycentric
+
+    def closestVertices(self, points):
+        """
+        Find the closest vertex to each point.
+
+        :param np.ndarray points: (point x 3) array of world space positions
+        :return: array of the closest vertex ID and array of the distance to each vertex
+        :rtype: tuple
+        """
+        self.update()
+        distances, indices = self._pointIndex.query(points, k=1)
+        return indices[:, 0], distances[:, 0]
+
+    def closestFaceVertices(self, points):
+        """
+        Find the closest vertex of the closest face to each point.
+        Unlike `closestVertices` the vertex always belongs to the face closest to the point,
+        so it does not jump across thin gaps such as eyelids and lips.
+
+        :param np.ndarray points: (point x 3) array of world space positions
+        :return: array of the closest vertex ID and array of the distance to each vertex
+        :rtype: tuple
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        _, faceIds, _, _ = self._closestTriangles(points)
+
+        # list the vertices of the closest face of each point
+        counts = self._polygonCounts[faceIds]
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        pointIds = np.repeat(np.arange(len(points)), counts)
+        faceVertexIds = np.repeat(self._polygonOffsets[faceIds] - starts, counts)
+        vertexIds = self._polygonConnects[faceVertexIds + np.arange(len(pointIds))]
+        distances = np.linalg.norm(self.points[vertexIds] - points[pointIds], axis=1)
+
+        # sort the vertices of each point by distance and take the first one
+        closest = np.lexsort((distances, pointIds))[starts]
+        return vertexIds[closest], distances[closest]
+
+    def closestFacePoints(self, points):
+        """
+        Find the closest point on the surface of the mesh to each point.
+
+        :param np.ndarray points: (point x 3) array of world space positions
+        :return: (point x 3) array of the closest world space positions and array of the face of each position
+        :rtype: tuple
+        """
+        closestPoints, faceIds, _, _ = self._closestTriangles(points)
+        return closestPoints, faceIds
+
+    def closestBarycentric(self, points):
+        """
+        Find the closest triangle to each point and the barycentric coordinates of the closest point within it.
+
+        :param np.ndarray points: (point x 3) array of world space positions
+        :return: (point x 3) array of the vertex IDs of each triangle and (point x 3) array of barycentric coordinates
+        :rtype: tuple
+        """
+        _, _, triangleIds, barycentric = self._closestTriangles(points)
+        return self.triangles[triangleIds], barycentric
+
+    def _getTriangleUVs(self, uvSet=None):
+        """Get a (triangle x 3 x 2) array of the UVs of each triangle corner. Corners without UVs are NaN"""
+        if uvSet in self._uvCache:
+            return self._uvCache[uvSet]
+
+        us, vs = self.meshFn.getUVs(uvSet) if uvSet else self.meshFn.getUVs()
+        uvCounts, uvIds = (
+            self.meshFn.getAssignedUVs(uvSet) if uvSet else self.meshFn.getAssignedUVs()
+        )
+        uvs = np.stack([np.array(us), np.array(vs)], axis=1).reshape(-1, 2)
+
+        # UV IDs are only listed for faces that have UVs
+        faceVertexUvIds = np.full(len(self._faceVertexKeys), -1, dtype=np.int64)
+        faceVertexUvIds[np.repeat(np.array(uvCounts) > 0, self._polygonCounts)] = uvIds
+
+        # find the face vertex of each triangle corner
+        keys = self.triangleFaces[:, None] * self.meshFn.numVertices + self.triangles
+        sortedKeys = self._faceVertexKeys[self._faceVertexOrder]
+        faceVertices = self._faceVertexOrder[np.searchsorted(sortedKeys, keys)]
+        cornerUvIds = faceVertexUvIds[faceVertices]
+
+        triangleUVs = np.full(cornerUvIds.shape + (2,), np.nan, dtype=np.float64)
+        hasUv = cornerUvIds >= 0
+        triangleUVs[hasUv] = uvs[cornerUvIds[hasUv]]
+
+        self._uvCache[uvSet] = triangleUVs
+        return triangleUVs
+
+    def closestUVs(self, points, uvSet=None):
+        """
+        Find the UV coordinates of the closest point on the surface of the mesh to each point.
+
+        :param np.ndarray points: (point x 3) array of world space positions
+        :param str uvSet: Optional- UV set to get the coordinates from. By default the current UV set is used.
+        :return: (point x 2) array of UV coordinates. Points closest to faces without UVs are NaN.
+        :rtype: np.ndarray
+        """
+        _, _, triangleIds, barycentric = self._closestTriangles(points)
+        triangleUVs = self._getTriangleUVs(uvSet)[triangleIds]
+        return np.einsum("ij,ijk->ik", barycentric, triangleUVs)
+
+
+def _addSceneCallbacks():
+    """Clear the mesh query cache when a new scene is created or opened"""
+    if _sceneCallbackIds:
+        return
+
+    def _clearCache(*args):
+        clearMeshQueryCache()
+
+    for message in [om2.MSceneMessage.kBeforeNew, om2.MSceneMessage.kBeforeOpen]:
+        _sceneCallbackIds.append(om2.MSceneMessage.addCallback(message, _clearCache))
+
+
+def getMeshQuery(mesh):
+    """
+    Get a cached mesh query for a mesh. The query is only built the first time it is used.
+    If the name now belongs to a different node, for example after the cached mesh was renamed and replaced,
+    a new query is built. Only the `MESH_QUERY_CACHE_SIZE` most recently used queries are kept and the cache is
+    cleared when a new scene is created or opened.
+
+    :param str mesh: mesh name
+    :return: mesh query of the mesh
+    :rtype: MeshQuery
+    """
+    meshQuery = _meshQueryCache.get(mesh)
+    try:
+        if (
+            meshQuery is not None
+            and meshQuery.dagPath.isValid()
+            and meshQuery.dagPath == _getDagPath(mesh)
+        ):
+            _meshQueryCache.move_to_end(mesh)
+            return meshQuery
+    except RuntimeError:
+        pass
+
+    if meshQuery is not None:
+        _meshQueryCache.pop(mesh).removeCallbacks()
+
+    _addSceneCallbacks()
+    meshQuery = MeshQuery(mesh)
+    _meshQueryCache[mesh] = meshQuery
+    while len(_meshQueryCache) > MESH_QUERY_CACHE_SIZE:
+        _, oldMeshQuery = _meshQueryCache.popitem(last=False)
+        oldMeshQuery.removeCallbacks()
+    return meshQuery
+
+
+def clearMeshQueryCache():
+    """Remove all cached mesh queries"""
+    for meshQuery in _meshQueryCache.values():
+        meshQuery.removeCallbacks()
+    _meshQueryCache.clear()
 
 
 def getClosestFace(mesh, point):
@@ -30,18 +381,16 @@ def getClosestFacePoint(mesh, point):
 
     :param str mesh: mesh name
     :param list point: world space coordinate
-    :return: tuple of vertex id and distance to point
+    :return: tuple of the closest point and the face id
     :rtype: tuple
     """
-    mfnMesh = rigamajig2.maya.mesh.getMeshFn(mesh)
-
-    pos = om2.MPoint(point[0], point[1], point[2])
-    return mfnMesh.getClosestPoint(pos, om2.MSpace.kWorld)
+    closestPoints, faceIds = getMeshQuery(mesh).closestFacePoints([list(point)[:3]])
+    return om2.MPoint(closestPoints[0].tolist()), int(faceIds[0])
 
 
 def getClosestVertex(mesh, point, returnDistance=False):
     """
-    Return closest vertex on mesh to the point.
+    Return the closest vertex of the closest face on mesh to the point.
 
     :param str mesh: mesh to get the closest vertex of
     :param list point: world space coordinate
@@ -52,17 +401,9 @@ def getClosestVertex(mesh, point, returnDistance=False):
     """
     if isinstance(point, str):
         point = cmds.xform(point, q=True, ws=True, t=True)
-    pos = om2.MPoint(point[0], point[1], point[2])
-    mfnMesh = rigamajig2.maya.mesh.getMeshFn(mesh)
-
-    index = mfnMesh.getClosestPoint(pos, space=om2.MSpace.kWorld)[1]
-    faceVtx = mfnMesh.getPolygonVertices(index)
-    vtxDist = [
-        (vtx, mfnMesh.getPoint(vtx, om2.MSpace.kWorld).distanceTo(pos))
-        for vtx in faceVtx
-    ]
 
-    vertexId, dist = min(vtxDist, key=operator.itemgetter(1))
+    vertexIds, distances = getMeshQuery(mesh).closestFaceVertices([list(point)[:3]])
+    vertexId, dist = int(vertexIds[0]), float(distances[0])
     if returnDistance:
         return mesh + ".vtx[{}]".format(vertexId), dist
     return mesh + ".vtx[{}]".format(vertexId)
@@ -77,13 +418,8 @@ def getClosestUV(mesh, point):
     :return: Uv coordinates
     :rtype: tuple
     """
-
-    mfnMesh = rigamajig2.maya.mesh.getMeshFn(mesh)
-
-    pos = om2.MPoint(point[0], point[1], point[2])
-    uvFace = mfnMesh.getUVAtPoint(pos)
-    closestUv = (uvFace[0], uvFace[1])
-    return closestUv
+    uvs = getMeshQuery(mesh).closestUVs([list(point)[:3]])
+    return float(uvs[0, 0]), float(uvs[0, 1])
 
 
 # bounding box Info
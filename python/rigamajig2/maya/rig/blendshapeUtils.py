@@ -59,10 +59,8 @@ def splitBlendshapeTargets(
         skinObject = skinData.SkinData()
         skinObject.read(skinFile)
 
-        data = skinObject.getData()
         skinClusterNode = skinCluster.getSkinCluster(splitMesh) or common.getFirst(skinObject.getKeys())
-        skinWeights = data.get(skinClusterNode).get("weights")
-        vertexCount = data.get(skinClusterNode).get("vertexCount")
+        skinWeights, influences = skinObject.getWeightsArray(skinClusterNode)
 
     else:
         skinClusterNode = skinCluster.getSkinCluster(splitMesh)
@@ -70,7 +68,7 @@ def splitBlendshapeTargets(
         if not skinClusterNode:
             raise Exception(f"Your split mesh ({splitMesh}) MUST have a skinCluster")
 
-        skinWeights, vertexCount = skinCluster.getWeights(splitMesh)
+        skinWeights, influences = skinCluster.getWeightsArray(splitMesh)
 
     splitHierarchy = cmds.createNode("transform", name="tmp_split_hrc")
 
@@ -80,19 +78,10 @@ def splitBlendshapeTargets(
         splitJoints = skinCluster.getInfluenceJoints(skinClusterNode)
 
     for splitJoint in splitJoints:
-        sourceWeights = skinWeights[splitJoint]
-
-        outputWeights = {}
-        for i in range(vertexCount):
-            value = sourceWeights.get(i) or sourceWeights.get(str(i)) or 0.0
-            outputWeights[i] = value
-
-        # now put them into a dictionary
-        blendshapeDict = dict()
-        blendshapeDict["baseWeights"] = outputWeights
+        sourceWeights = skinWeights[:, influences.index(splitJoint.split(":")[-1])]
 
         blendshapeNode = blendshape.create(temporaryBaseMesh, targets=targets, origin="local")
-        blendshape.setWeights(blendshapeNode, weights=blendshapeDict, targets=["baseWeights"])
+        blendshape.setWeightsArray(blendshapeNode, sourceWeights, targets=[blendshape.BASE_WEIGHTS])
 
         targetsList = blendshape.getTargetList(blendshapeNode)
 
@@ -7,13 +7,14 @@
     date: 12/2022
     description: This module can be used to build a deformation cage for model
 
-    NOTE: This function requires ngSkinTools
+    NOTE: Smoothing with ngSkinTools is optional. By default the built-in skin smoothing is used.
 
 """
 import logging
 
 import maya.api.OpenMaya as om2
 import maya.cmds as cmds
+import numpy as np
 
 from rigamajig2.maya import joint
 from rigamajig2.maya import mathUtils
@@ -80,15 +81,19 @@ def createCageControlPoint(
     return ctl, bindJoint, bpmJoint
 
 
-def smoothSkinCluster(polyMesh, intensity=0.1, itterations=30):
+def smoothSkinCluster(polyMesh, intensity=0.1, itterations=30, useNgSkinTools=False):
     """
-    Try to import Ngskintools and smooth the skin cluster
+    Smooth the skin cluster of a mesh. Locked influences are not changed and the weights stay normalized.
 
     :param polyMesh: name of the poly mesh to smooth
     :param intensity: set the intensity of the smooth value
     :param itterations: number of times to run the smooth
+    :param useNgSkinTools: smooth with ngSkinTools2 instead of the built-in smoothing.
     :return:
     """
+    if not useNgSkinTools:
+        skinCluster.smoothWeights(polyMesh, intensity=intensity, iterations=itterations)
+        return
 
     try:
         pluginLoaded = cmds.pluginInfo("ngSkinTools2", q=True, loaded=True)
@@ -173,28 +178,20 @@ class DeformationCage(object):
         # create a list to store the controls in
         controlsList = list()
 
-        for vtx in mesh.getVerts(self.cageMesh):
-            # first lets retreive the vertex weights for each vertex
-            vertexWeights = cmds.skinPercent(skin, vtx, q=True, v=True)
+        # get the weights and positions of all vertices at once
+        cageWeights, _ = skinCluster.getWeightsArray(self.cageMesh)
+        cagePositions = mesh.getPointsArray(self.cageMesh, world=True)
 
-            # next we can loop through each list of weights anf get the influences and their values.
-            # then we'll build a dictionary of influences and their weights for each vertex.
+        for componentId in range(len(cagePositions)):
+            # get the influences and their values for each vertex.
             # Keep in mind this should be limited to TWO influences per joint
             weightDict = dict()
-            for i in range(len(vertexWeights)):
-                weight = vertexWeights[i]
-                if weight > 0:
-                    influence = influences[i]
-                    weightDict[influence] = weight
+            for i in np.flatnonzero(cageWeights[componentId] > 0):
+                weightDict[influences[i]] = cageWeights[componentId, i]
 
             # now with that lets create out control
-            vertexId = vtx.split("[")[-1].split("]")[0]
-            componentId = int(vertexId)
-
-            # get the vertex position
-            mfnMesh = mesh.getMeshFn(self.cageMesh)
-
-            position = mfnMesh.getPoint(componentId, om2.MSpace.kWorld)
+            vertexId = str(componentId)
+            position = om2.MPoint(cagePositions[componentId])
 
             # if we want to orient the control as well construct a rotation from the vertex normal
             rotation = None
@@ -270,7 +267,7 @@ class DeformationCage(object):
         """
 
         conectivityMap = list()
-        for i in range(len(mesh.getVerts(self.cageMesh))):
+        for i in range(cmds.polyEvaluate(self.cageMesh, vertex=True)):
             connectedVerts = meshnav.getConnectedVertices(self.cageMesh, i)
             # for each connected vert check if there is already a connection between those two verts.
             # we can do this by counting the number of times the inverse appears, if its zero append the point.
@@ -299,9 +296,14 @@ class DeformationCage(object):
             cmds.parent(shape, cageTransform, r=True, s=True)
             cmds.delete(displayLine)
 
-    def connectToMeshes(self, meshesToBind=None, intensity=0.1, itterations=20):
+    def connectToMeshes(self, meshesToBind=None, intensity=0.1, itterations=20, useNgSkinTools=False):
         """
         create the output mesh
+
+        :param meshesToBind: meshes to bind to the deformation cage
+        :param intensity: intensity of the skin smoothing on the high output mesh
+        :param itterations: number of skin smoothing iterations on the high output mesh
+        :param useNgSkinTools: smooth the skin with ngSkinTools2 instead of the built-in smoothing.
         """
         meshesToBind = common.toList(meshesToBind)
 
@@ -329,7 +331,9 @@ class DeformationCage(object):
         skinCluster.copySkinClusterAndInfluences(lowOutput, highOutput)
 
         # smooth the skin cluster
-        smoothSkinCluster(highOutput, intensity=intensity, itterations=itterations)
+        smoothSkinCluster(
+            highOutput, intensity=intensity, itterations=itterations, useNgSkinTools=useNgSkinTools
+        )
 
         # now that we have the bind mesh we can
         for geo in meshesToBind:
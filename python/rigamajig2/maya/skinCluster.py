@@ -7,16 +7,23 @@ Thanks to:
 Charles Wardlaw: Deformation Layering in Maya’s Parallel GPU World 
 (https://medium.com/@kattkieru/deformation-layering-in-mayas-parallel-gpu-world-15c2e3d66d82)
 """
+import logging
+import time
 from typing import Union, Dict, Tuple, Optional, List
 
 import maya.api.OpenMaya as om
 import maya.api.OpenMayaAnim as oma
 import maya.cmds as cmds
+import numpy as np
 
 from rigamajig2.maya import deformer
 from rigamajig2.maya import general
+from rigamajig2.maya import mesh as meshUtils
+from rigamajig2.shared import spatial
 from rigamajig2.shared.common import toList, getFirst
 
+logger = logging.getLogger(__name__)
+
 
 class SurfaceCopyMode:
     ClosestPoint = "closestPoint"
@@ -32,6 +39,10 @@ class InfluenceCopyMode:
     OneToOne = "oneToOne"
 
 
+# maximum number of point and triangle pairs a skin projection tests at once
+PROJECTION_CHUNK_SIZE = 2**20
+
+
 class BindMethod:
     ClosestJoint = 0
     ClosestInHierarchy = 1
@@ -211,13 +222,16 @@ def getCompleteComponents(
         return completeComponentData
 
 
-def getWeights(mesh: str) -> Tuple[Dict[str, Dict[int, float]], int]:
+def _stripNamespace(name: str) -> str:
+    return name.split(":")[-1]
+
+
+def getWeightsArray(mesh: str) -> Tuple[np.ndarray, List[str]]:
     """
-    Return a list of all skincluster weights on a mesh
+    Get all skincluster weights on a mesh as an array
 
     :param mesh: mesh (or NurbsCurve) to get the weights on
-    :return: weight dictionary and vertex count. {"influence":[]}
-    :rtype: list
+    :return: (vertex x influence) array of weights and the name of the influence of each column without namespaces
     """
     meshShape = deformer.getDeformShape(mesh)
     mesh = cmds.listRelatives(meshShape, parent=True)[0]
@@ -231,40 +245,33 @@ def getWeights(mesh: str) -> Tuple[Dict[str, Dict[int, float]], int]:
     components = getCompleteComponents(shapeMfn)
 
     weights, influenceCount = skinMfn.getWeights(meshDag, components)
+    weightsArray = np.fromiter(weights, dtype=np.float64, count=len(weights))
 
-    influences = getInfluenceJoints(skinMfn)
-    numInfluences = len(list(influences))
-    numComponentsPerInfluence = int(len(weights) / numInfluences)
-
-    weightDict = {}
-    for influence in range(len(influences)):
-        influenceName = influences[influence]
-        influenceNoNs = influenceName.split(":")[-1]
-
-        # build a dictionary of vtx:weight. Skip 0.0 weights
-        infWeightDict = {
-            i: weights[i * numInfluences + influence]
-            for i in range(numComponentsPerInfluence)
-            if weights[i * numInfluences + influence] != 0.0
-        }
-        vertexCount = int(len(weights) / float(numInfluences))
-        weightDict[str(influenceNoNs)] = infWeightDict
-    return weightDict, vertexCount
+    influences = [_stripNamespace(inf) for inf in getInfluenceJoints(skinMfn)]
+    return weightsArray.reshape(-1, influenceCount), influences
 
 
-def setWeights(
+def setWeightsArray(
     mesh: str,
     skincluster: str,
-    weightDict: Dict[str, Dict[int, float]],
-    compressed=True,
+    weights: np.ndarray,
+    influences: List[str],
+    normalize: bool = True,
 ):
     """
-    Set the skin cluster weights of a given mesh
+    Set the skin cluster weights of a given mesh from an array.
+
+    Columns are matched to the skin cluster influences by name, ignoring namespaces.
+    Skin cluster influences without a column in the array keep their current weights.
+
+    The weights are set with a single `MFnSkinCluster.setWeights` call. om2 arrays can not be built from a buffer,
+    so the weights are still copied into the MDoubleArray through a list. That copy is the remaining per-value cost.
 
     :param mesh: mesh (or NurbsCurve) to set the weights on
     :param skincluster: skin cluster node to hold the weights
-    :param weightDict: skin cluster dict holding weight values for each influence
-    :param compressed: if the weights are compressed or not
+    :param weights: (vertex x influence) array of weights
+    :param influences: name of the influence of each column in the weights array
+    :param normalize: normalize the weights of each vertex
     """
     meshShape = deformer.getDeformShape(mesh)
 
@@ -273,34 +280,361 @@ def setWeights(
     meshDag = general.getDagPath(meshShape)
     components = getCompleteComponents(shapeMfn)
 
-    weights, influenceCount = skinMfn.getWeights(meshDag, components)
-    weightList = weights
-
-    influences = getInfluenceJoints(skinMfn)
-    numInfluences = len(list(influences))
-    numComponentsPerInfluence = int(len(weights) / numInfluences)
-
-    for importedInfluence, wtValues in weightDict.items():
-        for influence in range(len(influences)):
-            influenceName = influences[influence]
-            influenceNoNs = influenceName.split(":")[-1]
-            if influenceNoNs == importedInfluence:
-                if compressed:
-                    for i in range(numComponentsPerInfluence):
-                        weight = wtValues.get(i) or wtValues.get(str(i)) or 0.0
-                        weightList[i * numInfluences + influence] = weight
-    allIndices = om.MIntArray(range(numInfluences))
-    skinMfn.setWeights(meshDag, components, allIndices, weightList, False)
+    weights = np.asarray(weights, dtype=np.float64)
+    vertexCount = om.MFnSingleIndexedComponent(components).elementCount
+    if weights.ndim != 2 or weights.shape[0] != vertexCount:
+        raise ValueError(
+            f"Weights of shape {weights.shape} do not match the {vertexCount} vertices of {mesh}"
+        )
+
+    skinInfluences = [_stripNamespace(inf) for inf in getInfluenceJoints(skinMfn)]
+    skinInfluenceIndices = {inf: i for i, inf in enumerate(skinInfluences)}
+
+    # remap the columns of the input weights to the influence order of the skin cluster
+    columns = np.array(
+        [skinInfluenceIndices.get(_stripNamespace(inf), -1) for inf in influences],
+        dtype=np.int64,
+    ).reshape(-1)
+    validColumns = columns >= 0
+    if not validColumns.all():
+        missingInfluences = [
+            inf for inf, valid in zip(influences, validColumns) if not valid
+        ]
+        logger.warning(f"Influences not found on {skincluster}: {missingInfluences}")
+
+    if np.unique(columns[validColumns]).size < len(skinInfluences):
+        currentWeights, _ = skinMfn.getWeights(meshDag, components)
+        weightsArray = np.fromiter(
+            currentWeights, dtype=np.float64, count=len(currentWeights)
+        ).reshape(-1, len(skinInfluences))
+    else:
+        weightsArray = np.zeros((vertexCount, len(skinInfluences)), dtype=np.float64)
+
+    weightsArray[:, columns[validColumns]] = weights[:, validColumns]
 
     # normalize the skinweights. This is to account for any floating point precision issues.
     # even though they mostly would not be noticable its safer to manually normalize any drift.
-    cmds.skinPercent(skincluster, meshShape, normalize=True)
+    if normalize:
+        weightsArray = normalizeWeightsArray(weightsArray)
+
+    allIndices = om.MIntArray(range(len(skinInfluences)))
+    # om2 arrays have no buffer constructor. tolist is the fastest way to fill one from numpy.
+    weightList = om.MDoubleArray(weightsArray.ravel().tolist())
+    skinMfn.setWeights(meshDag, components, allIndices, weightList, False)
 
     # Recache the bind matrices. This is from Charles Wardlaw.
     # Ensures the skin behaves correctly during playback
     cmds.skinCluster(skincluster, edit=True, recacheBindMatrices=True)
 
 
+def normalizeWeightsArray(weights: np.ndarray) -> np.ndarray:
+    """
+    Normalize a (vertex x influence) weights array so the weights of each vertex add up to 1.0.
+    Vertices without any weights are left at 0.0.
+
+    :param weights: (vertex x influence) array of weights
+    :return: normalized weights array
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    totals = weights.sum(axis=1, keepdims=True)
+    return np.divide(
+        weights, totals, out=np.zeros_like(weights), where=np.abs(totals) > 0.0
+    )
+
+
+def weightsArrayToDict(
+    weights: np.ndarray, influences: List[str], tolerance: float = 0.0
+) -> Dict[str, Dict[int, float]]:
+    """
+    Convert a (vertex x influence) weights array to a sparse weights dictionary.
+
+    :param weights: (vertex x influence) array of weights
+    :param influences: name of the influence of each column in the weights array
+    :param tolerance: weights at or below this value are skipped
+    :return: weight dictionary. {"influence": {vertex: weight}}
+    """
+    weights = np.asarray(weights)
+
+    weightDict = dict()
+    for column, influence in enumerate(influences):
+        influenceWeights = weights[:, column]
+        vertexIds = np.flatnonzero(np.abs(influenceWeights) > tolerance)
+        weightDict[_stripNamespace(str(influence))] = dict(
+            zip(vertexIds.tolist(), influenceWeights[vertexIds].tolist())
+        )
+    return weightDict
+
+
+def weightsDictToArray(
+    weightDict: Dict[str, Dict[int, float]],
+    vertexCount: int,
+    influences: List[str] = None,
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Convert a sparse weights dictionary to a (vertex x influence) weights array.
+
+    :param weightDict: weight dictionary. {"influence": {vertex: weight}}. Vertex ids can be ints or strings.
+    :param vertexCount: number of vertices in the array
+    :param influences: Optional- order of the influence columns. By default the order of the dictionary is used.
+    :return: (vertex x influence) array of weights and the name of the influence of each column
+    """
+    influences = list(influences or weightDict.keys())
+    weights = np.zeros((vertexCount, len(influences)), dtype=np.float64)
+
+    for column, influence in enumerate(influences):
+        influenceWeights = weightDict.get(influence)
+        if not influenceWeights:
+            continue
+
+        count = len(influenceWeights)
+        vertexIds = np.fromiter(
+            (int(i) for i in influenceWeights.keys()), dtype=np.int64, count=count
+        )
+        values = np.fromiter(
+            (value or 0.0 for value in influenceWeights.values()),
+            dtype=np.float64,
+            count=count,
+        )
+        inRange = vertexIds < vertexCount
+        weights[vertexIds[inRange], column] = values[inRange]
+
+    return weights, influences
+
+
+def cleanupWeightsArray(
+    weights: np.ndarray,
+    maxInfluences: int = None,
+    pruneThreshold: float = 0.0,
+    normalize: bool = True,
+) -> Tuple[np.ndarray, int]:
+    """
+    Clean up a (vertex x influence) weights array.
+    Weights below the prune threshold are removed, only the largest `maxInfluences` weights of each vertex are kept
+    and the weights are renormalized. A vertex always keeps its largest weight.
+
+    :param weights: (vertex x influence) array of weights
+    :param maxInfluences: Optional- maximum number of influences per vertex
+    :param pruneThreshold: weights below this value are removed
+    :param normalize: normalize the weights of each vertex
+    :return: cleaned weights array and the number of vertices that changed
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    cleanedWeights = weights.copy()
+
+    if pruneThreshold:
+        cleanedWeights[np.abs(cleanedWeights) < pruneThreshold] = 0.0
+
+    if maxInfluences and maxInfluences < weights.shape[1]:
+        # zero out everything but the largest weights of each vertex
+        smallest = np.argpartition(-np.abs(cleanedWeights), maxInfluences - 1, axis=1)[
+            :, maxInfluences:
+        ]
+        np.put_along_axis(cleanedWeights, smallest, 0.0, axis=1)
+
+    # vertices that lost all of their weights keep their largest weight
+    emptied = ~cleanedWeights.any(axis=1) & weights.any(axis=1)
+    if emptied.any():
+        largest = np.abs(weights[emptied]).argmax(axis=1)
+        cleanedWeights[np.flatnonzero(emptied), largest] = weights[emptied, largest]
+
+    if normalize:
+        cleanedWeights = normalizeWeightsArray(cleanedWeights)
+
+    changed = ~np.isclose(cleanedWeights, weights, rtol=0.0, atol=1e-9).all(axis=1)
+    return cleanedWeights, int(changed.sum())
+
+
+def cleanupWeights(
+    mesh: str,
+    maxInfluences: int = 4,
+    pruneThreshold: float = 0.001,
+    removeUnusedInfluences: bool = True,
+    normalize: bool = True,
+) -> Dict:
+    """
+    Clean up the skin weights of a mesh for delivery to a game engine.
+    The weights are cleaned as an array (see `cleanupWeightsArray`) and written back in a single call.
+    The max influences are set on the skin cluster and enforced.
+
+    :param mesh: skinned mesh to clean up
+    :param maxInfluences: maximum number of influences per vertex
+    :param pruneThreshold: weights below this value are removed
+    :param removeUnusedInfluences: remove influences without any weights from the skin cluster
+    :param normalize: normalize the weights of each vertex
+    :return: dictionary of the number of changed vertices and a list of removed influences
+    """
+    meshSkin = getSkinCluster(mesh)
+    if not meshSkin:
+        raise RuntimeError(f"'{mesh}' does not have a skin cluster")
+
+    weights, influences = getWeightsArray(mesh)
+    cleanedWeights, changedVertices = cleanupWeightsArray(
+        weights,
+        maxInfluences=maxInfluences,
+        pruneThreshold=pruneThreshold,
+        normalize=normalize,
+    )
+    if changedVertices:
+        setWeightsArray(mesh, meshSkin, cleanedWeights, influences, normalize=False)
+
+    removedInfluences = list()
+    if removeUnusedInfluences:
+        unusedColumns = np.flatnonzero(~cleanedWeights.any(axis=0))
+        skinInfluences = getInfluenceJoints(meshSkin)
+        removedInfluences = [skinInfluences[i] for i in unusedColumns]
+        if removedInfluences:
+            cmds.skinCluster(meshSkin, edit=True, removeInfluence=removedInfluences)
+
+    if maxInfluences:
+        cmds.setAttr("{}.maxInfluences".format(meshSkin), maxInfluences)
+        cmds.setAttr("{}.maintainMaxInfluences".format(meshSkin), True)
+
+    logger.info(
+        f"Cleaned up skin weights on {mesh}: {changedVertices} vertices changed, "
+        f"{len(removedInfluences)} influences removed"
+    )
+    return dict(changedVertices=changedVertices, removedInfluences=removedInfluences)
+
+
+def smoothWeightsArray(
+    weights: np.ndarray,
+    adjacency,
+    intensity: float = 0.1,
+    iterations: int = 30,
+    lockedColumns: List[int] = None,
+    normalize: bool = True,
+) -> np.ndarray:
+    """
+    Smooth a (vertex x influence) weights array with Laplacian smoothing.
+    Each iteration moves the weights of every vertex towards the average weights of its neighbors.
+
+    :param weights: (vertex x influence) array of weights
+    :param adjacency: row normalized (vertex x vertex) adjacency matrix. See `spatial.adjacencyMatrix`
+    :param intensity: amount to move towards the neighbor average each iteration. Between 0 and 1.
+    :param iterations: number of smoothing iterations
+    :param lockedColumns: Optional- indices of influence columns that are not changed
+    :param normalize: scale the unlocked weights of each vertex so all weights add up to 1.0
+    :return: (vertex x influence) array of smoothed weights
+    """
+    weights = np.array(weights, dtype=np.float64)
+    lockedMask = np.zeros(weights.shape[1], dtype=bool)
+    if lockedColumns is not None:
+        lockedMask[list(lockedColumns)] = True
+
+    unlockedWeights = weights[:, ~lockedMask]
+    for _ in range(iterations):
+        unlockedWeights += intensity * (adjacency @ unlockedWeights - unlockedWeights)
+
+    if normalize:
+        # the unlocked weights fill the weight that is not taken by the locked influences
+        available = np.clip(1.0 - weights[:, lockedMask].sum(axis=1), 0.0, 1.0)
+        totals = unlockedWeights.sum(axis=1)
+        scale = np.divide(
+            available, totals, out=np.zeros_like(totals), where=totals > 0.0
+        )
+        unlockedWeights *= scale[:, None]
+
+    weights[:, ~lockedMask] = unlockedWeights
+    return weights
+
+
+def smoothWeights(
+    mesh: str,
+    intensity: float = 0.1,
+    iterations: int = 30,
+    lockedInfluences: List[str] = None,
+    normalize: bool = True,
+):
+    """
+    Smooth the skin cluster weights of a mesh.
+    The mesh adjacency is built once and edges are weighted by their inverse length so uneven topology
+    smooths evenly. The result is written back with a single `setWeights` call.
+
+    :param mesh: skinned mesh to smooth
+    :param intensity: amount to move towards the neighbor average each iteration. Between 0 and 1.
+    :param iterations: number of smoothing iterations
+    :param lockedInfluences: Optional- influences that are not changed. By default influences with
+                             locked weights (`lockInfluenceWeights`) are used.
+    :param normalize: normalize the smoothed weights
+    """
+    meshShape = deformer.getDeformShape(mesh)
+    meshSkin = getSkinCluster(mesh)
+    if not meshSkin:
+        raise RuntimeError(f"'{mesh}' does not have a skin cluster")
+
+    weights, influences = getWeightsArray(mesh)
+
+    if lockedInfluences is None:
+        lockedInfluences = [
+            influence
+            for influence in getInfluenceJoints(meshSkin)
+            if cmds.attributeQuery("liw", node=influence, exists=True)
+            and cmds.getAttr("{}.liw".format(influence))
+        ]
+    lockedInfluences = [
+        _stripNamespace(influence) for influence in toList(lockedInfluences)
+    ]
+    lockedColumns = [
+        i for i, influence in enumerate(influences) if influence in lockedInfluences
+    ]
+
+    edges = meshUtils.getEdgeArray(meshShape)
+    points = np.array(meshUtils.getMeshFn(meshShape).getPoints())[:, :3]
+    edgeLengths = np.linalg.norm(points[edges[:, 0]] - points[edges[:, 1]], axis=1)
+    edgeWeights = 1.0 / np.maximum(edgeLengths, 1e-8)
+    adjacency = spatial.adjacencyMatrix(edges, len(points), edgeWeights=edgeWeights)
+
+    smoothedWeights = smoothWeightsArray(
+        weights,
+        adjacency,
+        intensity=intensity,
+        iterations=iterations,
+        lockedColumns=lockedColumns,
+        normalize=normalize,
+    )
+    setWeightsArray(mesh, meshSkin, smoothedWeights, influences, normalize=False)
+
+
+def getWeights(mesh: str) -> Tuple[Dict[str, Dict[int, float]], int]:
+    """
+    Return a list of all skincluster weights on a mesh
+
+    :param mesh: mesh (or NurbsCurve) to get the weights on
+    :return: weight dictionary and vertex count. {"influence":[]}
+    :rtype: list
+    """
+    weights, influences = getWeightsArray(mesh)
+    return weightsArrayToDict(weights, influences), weights.shape[0]
+
+
+def setWeights(
+    mesh: str,
+    skincluster: str,
+    weightDict: Dict[str, Dict[int, float]],
+    compressed=True,
+):
+    """
+    Set the skin cluster weights of a given mesh
+
+    :param mesh: mesh (or NurbsCurve) to set the weights on
+    :param skincluster: skin cluster node to hold the weights
+    :param weightDict: skin cluster dict holding weight values for each influence
+    :param compressed: if the weights are compressed or not. Uncompressed weights are not set,
+                       the current weights are only normalized and the bind matrices are recached.
+    """
+    meshShape = deformer.getDeformShape(mesh)
+    if not compressed:
+        cmds.skinPercent(skincluster, meshShape, normalize=True)
+        cmds.skinCluster(skincluster, edit=True, recacheBindMatrices=True)
+        return
+
+    components = getCompleteComponents(meshShape)
+    vertexCount = om.MFnSingleIndexedComponent(components).elementCount
+
+    weights, influences = weightsDictToArray(weightDict, vertexCount)
+    setWeightsArray(mesh, skincluster, weights, influences, normalize=True)
+
+
 def getBlendWeights(mesh: str) -> Dict[int, float]:
     """
     Get the DQ blended weights
@@ -498,7 +832,7 @@ def transferSkinCluster(sourceMesh: str, targetMesh: str, targetSkin: str):
     """
     sourceSkinCluster = getSkinCluster(sourceMesh)
 
-    weights, influenceCount = getWeights(sourceMesh)
+    weights, influences = getWeightsArray(sourceMesh)
     blendedWeights = getBlendWeights(sourceMesh)
 
     # now we need to store and copy over the influences
@@ -516,7 +850,9 @@ def transferSkinCluster(sourceMesh: str, targetMesh: str, targetSkin: str):
     setMatrixConnections(targetSkin, bpmConnections, attribute="bindPreMatrix")
 
     # now copy that over to the new mesh
-    setWeights(targetMesh, skincluster=targetSkin, weightDict=weights)
+    setWeightsArray(
+        targetMesh, skincluster=targetSkin, weights=weights, influences=influences
+    )
     setBlendWeights(targetMesh, skincluster=targetSkin, weightDict=blendedWeights)
 
     # copy the skin cluster settings
@@ -585,43 +921,10 @@ def copySkinClusterAndInfluences(
     targetMeshes = toList(targetMeshes)
 
     srcSkinCluster = getSkinCluster(sourceMesh)
-    srcInfluences = getInfluenceJoints(srcSkinCluster)
 
     copiedSkinClusters = []
     for tgtMesh in targetMeshes:
-        tgtSkinCluster = getSkinCluster(tgtMesh)
-
-        # if the target does not have a skin cluster create one with the input joints
-        if not tgtSkinCluster:
-            skinClusterName = tgtMesh + "_skinCluster"
-            tgtSkinCluster = cmds.skinCluster(
-                srcInfluences,
-                tgtMesh,
-                name=skinClusterName,
-                toSelectedBones=True,
-                bindMethod=BindMethod.ClosestJoint,
-                smoothWeights=0,
-                normalizeWeights=1,
-            )[0]
-
-        # otherwise add the missing influences to the skin cluster.
-        else:
-            tgtInfluences = getInfluenceJoints(tgtSkinCluster)
-            for influence in srcInfluences:
-                if influence not in tgtInfluences:
-                    cmds.skinCluster(tgtSkinCluster, edit=True, addInfluence=influence)
-
-        # copy the skin cluster settings
-        attrs = [
-            "skinningMethod",
-            "dqsSupportNonRigid",
-            "normalizeWeights",
-            "maxInfluences",
-            "maintainMaxInfluences",
-        ]
-        for attr in attrs:
-            value = cmds.getAttr("{}.{}".format(srcSkinCluster, attr))
-            cmds.setAttr("{}.{}".format(tgtSkinCluster, attr), value)
+        tgtSkinCluster = _prepareTargetSkinCluster(srcSkinCluster, tgtMesh)
 
         kwargs = {
             "surfaceAssociation": surfaceMode,
@@ -651,6 +954,331 @@ def copySkinClusterAndInfluences(
     return copiedSkinClusters
 
 
+def _prepareTargetSkinCluster(sourceSkinCluster: str, targetMesh: str) -> str:
+    """
+    Get a skin cluster on the target mesh with all influences and settings of the source skin cluster.
+
+    :param sourceSkinCluster: skin cluster to copy the influences and settings from
+    :param targetMesh: mesh to create or update the skin cluster on
+    :return: the target skin cluster
+    """
+    srcInfluences = getInfluenceJoints(sourceSkinCluster)
+    tgtSkinCluster = getSkinCluster(targetMesh)
+
+    # if the target does not have a skin cluster create one with the input joints
+    if not tgtSkinCluster:
+        skinClusterName = targetMesh + "_skinCluster"
+        tgtSkinCluster = cmds.skinCluster(
+            srcInfluences,
+            targetMesh,
+            name=skinClusterName,
+            toSelectedBones=True,
+            bindMethod=BindMethod.ClosestJoint,
+            smoothWeights=0,
+            normalizeWeights=1,
+        )[0]
+
+    # otherwise add the missing influences to the skin cluster.
+    else:
+        tgtInfluences = getInfluenceJoints(tgtSkinCluster)
+        for influence in srcInfluences:
+            if influence not in tgtInfluences:
+                cmds.skinCluster(tgtSkinCluster, edit=True, addInfluence=influence)
+
+    # copy the skin cluster settings
+    attrs = [
+        "skinningMethod",
+        "dqsSupportNonRigid",
+        "normalizeWeights",
+        "maxInfluences",
+        "maintainMaxInfluences",
+    ]
+    for attr in attrs:
+        value = cmds.getAttr("{}.{}".format(sourceSkinCluster, attr))
+        cmds.setAttr("{}.{}".format(tgtSkinCluster, attr), value)
+
+    return tgtSkinCluster
+
+
+def _getWorldMeshFn(mesh: str) -> om.MFnMesh:
+    """Get a mesh function set that can query world space values"""
+    meshShape = deformer.getDeformShape(mesh)
+    if not meshShape or cmds.nodeType(meshShape) != "mesh":
+        raise TypeError(f"'{mesh}' is not a mesh")
+    return om.MFnMesh(general.getDagPath(meshShape))
+
+
+class SkinProjection(object):
+    """
+    Project skin weights onto points by the closest point on the surface of a source mesh.
+
+    The source weights, triangles and a spatial index of the triangles are built once so any number of targets
+    can be projected. The weights of each point are interpolated from the corners of the closest triangle
+    with barycentric coordinates.
+
+    Example:
+        >>> projection = SkinProjection.fromMesh("body_hi")
+        >>> weights, distances = projection.project(targetPoints)
+    """
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        triangles: np.ndarray,
+        weights: np.ndarray,
+        influences: List[str],
+        candidateCount: int = 8,
+    ):
+        """
+        :param points: (vertex x 3) array of source vertex positions
+        :param triangles: (triangle x 3) array of the vertex indices of each source triangle
+        :param weights: (vertex x influence) array of source weights
+        :param influences: name of the influence of each column in the weights array
+        :param candidateCount: number of triangles near each point that are tested first. The search is widened
+                               for points where an untested triangle could be closer.
+        """
+        self.points = np.asarray(points, dtype=np.float64)
+        self.triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.influences = list(influences)
+        self.candidateCount = candidateCount
+
+        corners = self.points[self.triangles]
+        triangleNormals = np.cross(
+            corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+        )
+        lengths = np.linalg.norm(triangleNormals, axis=1, keepdims=True)
+        self.triangleNormals = np.divide(
+            triangleNormals,
+            lengths,
+            out=np.zeros_like(triangleNormals),
+            where=lengths > 0.0,
+        )
+
+        # a triangle is never closer to a point than its centroid distance minus the distance from its
+        # centroid to its furthest corner. Triangles are grouped by that radius into groups that differ by
+        # a factor of two, so a few large triangles do not loosen the bound of every other triangle.
+        centroids = corners.mean(axis=1)
+        triangleRadii = np.linalg.norm(corners - centroids[:, None], axis=2).max(axis=1)
+        radiusGroups = np.floor(np.log2(np.maximum(triangleRadii, 1e-12)))
+
+        self.triangleGroups = list()
+        for radiusGroup in np.unique(radiusGroups):
+            triangleIds = np.flatnonzero(radiusGroups == radiusGroup)
+            self.triangleGroups.append(
+                (
+                    triangleIds,
+                    spatial.PointIndex(centroids[triangleIds]),
+                    triangleRadii[triangleIds].max(),
+                )
+            )
+
+    @classmethod
+    def fromMesh(cls, mesh: str, candidateCount: int = 8) -> "SkinProjection":
+        """
+        Build a skin projection from the world space triangles and skin weights of a mesh
+
+        :param mesh: skinned mesh to project the weights of
+        :param candidateCount: number of triangles near each point that are tested for the closest point
+        """
+        meshFn = _getWorldMeshFn(mesh)
+        points = np.array(meshFn.getPoints(om.MSpace.kWorld))[:, :3]
+        _, triangleVertices = meshFn.getTriangles()
+        weights, influences = getWeightsArray(mesh)
+        return cls(
+            points,
+            np.array(triangleVertices),
+            weights,
+            influences,
+            candidateCount=candidateCount,
+        )
+
+    def project(
+        self,
+        points: np.ndarray,
+        normals: np.ndarray = None,
+        normalFalloff: float = 0.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project the source weights onto a list of points.
+
+        Within each group of similar sized triangles the `candidateCount` triangles with the nearest centroids are
+        tested first. A triangle is never closer than its centroid distance minus its radius, so the search is
+        widened for any point where an untested triangle of the group could still be closer than the best triangle
+        found.
+
+        :param points: (point x 3) array of positions to project
+        :param normals: Optional- (point x 3) array of the normal at each point. Required for the normal falloff.
+        :param normalFalloff: scale the distance to triangles that face away from the point normal by up to
+                              (1 + 2 * normalFalloff). This keeps points from picking up weights from the
+                              opposite side of thin shapes like lips and eyelids.
+        :return: (point x influence) array of weights and the distance from each point to its projected point
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        pointCount = len(points)
+        if normals is not None:
+            normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+
+        bestTriangles = np.zeros((pointCount, 3), dtype=np.int64)
+        bestBarycentric = np.zeros((pointCount, 3), dtype=np.float64)
+        bestDistances = np.zeros(pointCount, dtype=np.float64)
+        bestScores = np.full(pointCount, np.inf, dtype=np.float64)
+
+        for triangleIds, triangleIndex, maxRadius in self.triangleGroups:
+            remaining = np.arange(pointCount)
+            candidateCount = min(self.candidateCount, len(triangleIds))
+            while len(remaining):
+                furthestCentroids = np.empty(len(remaining), dtype=np.float64)
+
+                # test the points in chunks so memory use does not grow with the number of candidates
+                chunkSize = max(PROJECTION_CHUNK_SIZE // candidateCount, 1)
+                for start in range(0, len(remaining), chunkSize):
+                    chunk = remaining[start : start + chunkSize]
+                    centroidDistances, candidates = triangleIndex.query(
+                        points[chunk], k=candidateCount
+                    )
+                    furthestCentroids[start : start + len(chunk)] = centroidDistances[
+                        :, -1
+                    ]
+
+                    triangles, barycentric, distances, scores = (
+                        self._getClosestCandidates(
+                            points[chunk],
+                            triangleIds[candidates],
+                            None if normals is None else normals[chunk],
+                            normalFalloff,
+                        )
+                    )
+                    better = scores < bestScores[chunk]
+                    closerPoints = chunk[better]
+                    bestTriangles[closerPoints] = triangles[better]
+                    bestBarycentric[closerPoints] = barycentric[better]
+                    bestDistances[closerPoints] = distances[better]
+                    bestScores[closerPoints] = scores[better]
+
+                if candidateCount >= len(triangleIds):
+                    break
+
+                # the distance scale of the normal falloff is at least 1 so the lower bound is valid for the scores
+                lowerBounds = furthestCentroids - maxRadius
+                remaining = remaining[lowerBounds < bestScores[remaining]]
+                candidateCount = min(candidateCount * 2, len(triangleIds))
+
+        weights = np.zeros((pointCount, len(self.influences)), dtype=np.float64)
+        for corner in range(3):
+            weights += (
+                bestBarycentric[:, corner : corner + 1]
+                * self.weights[bestTriangles[:, corner]]
+            )
+
+        return weights, bestDistances
+
+    def _getClosestCandidates(
+        self,
+        points: np.ndarray,
+        candidates: np.ndarray,
+        normals: np.ndarray = None,
+        normalFalloff: float = 0.0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the closest of the candidate triangles of each point.
+
+        :param points: (point x 3) array of positions to project
+        :param candidates: (point x candidate) array of the triangle indices to test for each point
+        :param normals: Optional- (point x 3) array of the normal at each point
+        :param normalFalloff: see `project`
+        :return: vertex indices of the closest triangle, barycentric coordinates of the closest point,
+                 distance to the closest point and the score of the closest triangle of each point
+        """
+        pointCount, candidateCount = candidates.shape
+        candidateTriangles = self.triangles[candidates.ravel()]
+
+        repeatedPoints = np.repeat(points, candidateCount, axis=0)
+        closestPoints, barycentric = spatial.closestPointsOnTriangles(
+            repeatedPoints,
+            self.points[candidateTriangles[:, 0]],
+            self.points[candidateTriangles[:, 1]],
+            self.points[candidateTriangles[:, 2]],
+        )
+        distances = np.linalg.norm(closestPoints - repeatedPoints, axis=1).reshape(
+            pointCount, candidateCount
+        )
+
+        scores = distances
+        if normals is not None and normalFalloff:
+            repeatedNormals = np.repeat(normals, candidateCount, axis=0)
+            facing = np.einsum(
+                "ij,ij->i", repeatedNormals, self.triangleNormals[candidates.ravel()]
+            ).reshape(pointCount, candidateCount)
+            scores = distances * (1.0 + normalFalloff * (1.0 - facing))
+
+        best = np.argmin(scores, axis=1)
+        bestRows = np.arange(pointCount) * candidateCount + best
+        return (
+            candidateTriangles[bestRows],
+            barycentric[bestRows],
+            distances[np.arange(pointCount), best],
+            scores[np.arange(pointCount), best],
+        )
+
+
+def projectSkinWeights(
+    sourceMesh: str,
+    targetMeshes: Union[str, List[str]],
+    normalFalloff: float = 0.0,
+    candidateCount: int = 8,
+) -> Dict[str, Dict]:
+    """
+    Copy a skin cluster and its influences to target meshes by projecting the weights onto each target.
+    Unlike `copySkinClusterAndInfluences` this does not depend on topology, so it is safe to use
+    after a model update. The source is only processed once for all targets.
+
+    :param sourceMesh: skinned mesh to copy the weights from
+    :param targetMeshes: meshes to project the weights onto
+    :param normalFalloff: penalize source triangles that face away from the target vertex normal.
+                          see `SkinProjection.project`
+    :param candidateCount: number of triangles near each vertex that are tested for the closest point
+    :return: dictionary of the skin cluster, projection time and max and mean projection distance of each target
+    """
+    targetMeshes = toList(targetMeshes)
+
+    srcSkinCluster = getSkinCluster(sourceMesh)
+    if not srcSkinCluster:
+        raise RuntimeError(f"'{sourceMesh}' does not have a skin cluster")
+
+    projection = SkinProjection.fromMesh(sourceMesh, candidateCount=candidateCount)
+
+    report = dict()
+    for tgtMesh in targetMeshes:
+        startTime = time.perf_counter()
+
+        tgtSkinCluster = _prepareTargetSkinCluster(srcSkinCluster, tgtMesh)
+
+        meshFn = _getWorldMeshFn(tgtMesh)
+        points = np.array(meshFn.getPoints(om.MSpace.kWorld))[:, :3]
+        normals = None
+        if normalFalloff:
+            normals = np.array(meshFn.getVertexNormals(False, om.MSpace.kWorld))
+
+        weights, distances = projection.project(
+            points, normals=normals, normalFalloff=normalFalloff
+        )
+        setWeightsArray(tgtMesh, tgtSkinCluster, weights, projection.influences)
+
+        report[tgtMesh] = dict(
+            skinCluster=tgtSkinCluster,
+            time=time.perf_counter() - startTime,
+            maxDistance=float(distances.max(initial=0.0)),
+            meanDistance=float(distances.mean()) if distances.size else 0.0,
+        )
+        logger.info(
+            f"weights projected: {sourceMesh}({srcSkinCluster}) -> {tgtMesh}({tgtSkinCluster}) "
+            f"in {report[tgtMesh]['time']:.3f}s. max distance: {report[tgtMesh]['maxDistance']:.4f}"
+        )
+
+    return report
+
+
 def connectExistingBPMs(skinCluster: str, influences: List[str] = None):
     """
     Look for existist bpm nodes and connect them to the appropriate slot of the skincluster.
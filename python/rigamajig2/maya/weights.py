@@ -1,42 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
 """
-Utilities for working with weights
+    project: rigamajig2
+    file: weights.py
+    author: masonsmigel
+    date: 10/2026
+    description: Utilities for working with weights.
+                 Weights of skin clusters, blendshapes and other deformers are handled as (vertex x influence)
+                 arrays so they can be mirrored and flipped with a cached vertex symmetry map.
 """
+import hashlib
+import logging
+from typing import Dict, List, Tuple
 
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
 
-def setWeights():
+from rigamajig2.maya import blendshape
+from rigamajig2.maya import deformer as deformerUtils
+from rigamajig2.maya import general
+from rigamajig2.maya import skinCluster
+from rigamajig2.shared import common
+from rigamajig2.shared import spatial
+
+logger = logging.getLogger(__name__)
+
+AXES = "xyz"
+DEFAULT_TOLERANCE = 0.01
+
+# cache of symmetry maps keyed by topology hash, axis and tolerance
+_symmetryCache: Dict[Tuple[str, str, float], "SymmetryMap"] = dict()
+
+
+class SymmetryMap(object):
+    """
+    Vertex correspondence between the two sides of a symmetric mesh.
+
+    Each vertex is matched to the closest vertex of its mirrored position. Vertices that have no match within the
+    tolerance are left unmatched and keep their weights when mirroring or flipping.
+    """
+
+    def __init__(
+        self, points: np.ndarray, axis: str = "x", tolerance: float = DEFAULT_TOLERANCE
+    ):
+        """
+        :param points: (vertex x 3) array of vertex positions
+        :param axis: axis to mirror across
+        :param tolerance: maximum distance between a mirrored vertex and its match. Allows for small asymmetries.
+        """
+        self.axis = axis.lower()
+        self.tolerance = tolerance
+
+        axisIndex = AXES.index(self.axis)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        mirroredPoints = points.copy()
+        mirroredPoints[:, axisIndex] *= -1.0
+
+        distances, indices = spatial.PointIndex(points).query(mirroredPoints, k=1)
+        self.mirrorIndices = np.where(distances[:, 0] <= tolerance, indices[:, 0], -1)
+
+        # 1 for the positive side, -1 for the negative side and 0 for vertices on the mirror plane
+        self.sides = np.where(
+            points[:, axisIndex] > tolerance,
+            1,
+            np.where(points[:, axisIndex] < -tolerance, -1, 0),
+        )
+
+    def __len__(self):
+        return len(self.mirrorIndices)
+
+    @property
+    def unmatched(self) -> np.ndarray:
+        """Indices of vertices without a mirrored vertex"""
+        return np.flatnonzero(self.mirrorIndices < 0)
+
+    def mirror(
+        self,
+        weights: np.ndarray,
+        influenceMap: np.ndarray = None,
+        positiveToNegative: bool = True,
+    ) -> np.ndarray:
+        """
+        Mirror weights from one side of the mesh to the other
+
+        :param weights: (vertex x influence) array of weights
+        :param influenceMap: Optional- index of the mirrored influence of each column. See `getInfluenceMirrorMap`
+        :param positiveToNegative: copy the weights of the positive side to the negative side
+        :return: (vertex x influence) array of mirrored weights
+        """
+        destinationSide = -1 if positiveToNegative else 1
+        destination = np.flatnonzero(
+            (self.sides == destinationSide) & (self.mirrorIndices >= 0)
+        )
+        return self._copyWeights(weights, destination, influenceMap)
+
+    def flip(self, weights: np.ndarray, influenceMap: np.ndarray = None) -> np.ndarray:
+        """
+        Swap the weights of the two sides of the mesh
+
+        :param weights: (vertex x influence) array of weights
+        :param influenceMap: Optional- index of the mirrored influence of each column. See `getInfluenceMirrorMap`
+        :return: (vertex x influence) array of flipped weights
+        """
+        destination = np.flatnonzero(self.mirrorIndices >= 0)
+        return self._copyWeights(weights, destination, influenceMap)
+
+    def _copyWeights(
+        self,
+        weights: np.ndarray,
+        destination: np.ndarray,
+        influenceMap: np.ndarray = None,
+    ) -> np.ndarray:
+        """Copy the weights of the mirrored vertex (and mirrored influence) to each destination vertex"""
+        weights = np.asarray(weights)
+        if len(weights) != len(self):
+            raise ValueError(
+                f"Weights for {len(weights)} vertices do not match the symmetry map of {len(self)}"
+            )
+
+        sourceWeights = weights[self.mirrorIndices[destination]]
+        if influenceMap is not None:
+            sourceWeights = sourceWeights[:, influenceMap]
+
+        outputWeights = weights.copy()
+        outputWeights[destination] = sourceWeights
+        return outputWeights
+
+
+def _getRestShape(mesh: str) -> str:
+    """Get the orig shape of a deformed mesh or the mesh shape if it has no deformers"""
+    meshShape = deformerUtils.getDeformShape(mesh)
+    if not meshShape or cmds.nodeType(meshShape) != "mesh":
+        raise TypeError(f"'{mesh}' is not a mesh")
+
+    origShape = common.getFirst(cmds.deformableShape(meshShape, originalGeometry=True))
+    if origShape:
+        return origShape.split(".")[0]
+    return meshShape
+
+
+def getTopologyHash(mesh: str) -> str:
+    """
+    Get a hash of the vertex count and face connectivity of a mesh.
+    Meshes with the same topology share a hash regardless of their vertex positions.
+
+    :param mesh: mesh to hash
+    :return: hex digest of the topology
+    """
+    meshFn = om.MFnMesh(general.getMObject(_getRestShape(mesh)))
+    polygonCounts, polygonConnects = meshFn.getVertices()
+
+    topologyHash = hashlib.sha1()
+    topologyHash.update(np.int64(meshFn.numVertices).tobytes())
+    topologyHash.update(np.array(polygonCounts, dtype=np.int32).tobytes())
+    topologyHash.update(np.array(polygonConnects, dtype=np.int32).tobytes())
+    return topologyHash.hexdigest()
+
+
+def getSymmetryMap(
+    mesh: str,
+    axis: str = "x",
+    tolerance: float = DEFAULT_TOLERANCE,
+    useCache: bool = True,
+) -> SymmetryMap:
     """
-    Set deformer weights
-    :return:
+    Get the symmetry map of a mesh. The map is built from the object space positions of the rest shape
+    and cached by topology so it is only built once for each topology.
+
+    :param mesh: mesh to get the symmetry map of
+    :param axis: axis to mirror across
+    :param tolerance: maximum distance between a mirrored vertex and its match
+    :param useCache: use a cached map for the topology. If False the map is rebuilt and cached again.
+    :return: symmetry map of the mesh
     """
-    # TODO:
-    pass
+    cacheKey = (getTopologyHash(mesh), axis.lower(), tolerance)
+    if useCache and cacheKey in _symmetryCache:
+        return _symmetryCache[cacheKey]
+
+    meshFn = om.MFnMesh(general.getMObject(_getRestShape(mesh)))
+    points = np.array(meshFn.getPoints())[:, :3]
+
+    symmetryMap = SymmetryMap(points, axis=axis, tolerance=tolerance)
+    if len(symmetryMap.unmatched):
+        logger.warning(
+            f"{len(symmetryMap.unmatched)} vertices of '{mesh}' have no mirrored vertex"
+        )
+
+    _symmetryCache[cacheKey] = symmetryMap
+    return symmetryMap
+
 
+def clearSymmetryCache() -> None:
+    """Clear all cached symmetry maps"""
+    _symmetryCache.clear()
 
-def getWeights(deformer, influences=None, geometry=None):
+
+def getInfluenceMirrorMap(
+    influences: List[str], left: str = None, right: str = None
+) -> np.ndarray:
     """
-    Get the deformer weights
-    :param deformer:
-    :param influences:
-    :param geometry:
-    :return:
+    Get the index of the mirrored influence of each influence.
+    Influences without a mirrored name in the list map to themselves.
+
+    :param influences: list of influence names
+    :param left: Optional- token used for the left side. See `common.getMirrorName`
+    :param right: Optional- token used for the right side. See `common.getMirrorName`
+    :return: array of the index of the mirrored influence of each influence
     """
-    # TODO:
-    pass
+    influenceIndices = {influence: i for i, influence in enumerate(influences)}
+
+    influenceMap = np.arange(len(influences))
+    for i, influence in enumerate(influences):
+        mirrorName = common.getMirrorName(influence, left=left, right=right)
+        if mirrorName in influenceIndices:
+            influenceMap[i] = influenceIndices[mirrorName]
+        elif mirrorName and mirrorName != influence:
+            logger.warning(
+                f"Mirrored influence '{mirrorName}' of '{influence}' does not exist"
+            )
+    return influenceMap
+
 
+def _getGeometry(deformer: str, geometry: str = None) -> str:
+    if geometry:
+        return geometry
+    if cmds.nodeType(deformer) == "blendShape":
+        return common.getFirst(cmds.blendShape(deformer, query=True, geometry=True))
+    return common.getFirst(deformerUtils.getAffectedGeo(deformer))
 
-def mirrorWeights():
+
+def getWeights(
+    deformer: str, influences: List[str] = None, geometry: str = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Get the deformer weights as a (vertex x influence) array.
+    The influences of a skin cluster are its joints, the influences of a blendshape are its targets and
+    `baseWeights`. Other deformers have a single influence named after the deformer.
+
+    :param deformer: skin cluster, blendshape or deformer to get the weights of
+    :param influences: Optional- only get the weights of these influences
+    :param geometry: Optional- geometry to get the weights for. By default the first geometry is used.
+    :return: (vertex x influence) array of weights and the name of the influence of each column
+    """
+    geometry = _getGeometry(deformer, geometry)
+    influences = common.toList(influences) if influences else None
+    nodeType = cmds.nodeType(deformer)
+
+    if nodeType == "skinCluster":
+        weights, skinInfluences = skinCluster.getWeightsArray(geometry)
+        if influences is None:
+            return weights, skinInfluences
+        columns = [
+            skinInfluences.index(influence.split(":")[-1]) for influence in influences
+        ]
+        return weights[:, columns], influences
+
+    if nodeType != "blendShape":
+        weights = deformerUtils.getWeightsArray(deformer, geometry=geometry)
+        return weights.astype(np.float64).reshape(-1, 1), [deformer]
+
+    weights, influences = blendshape.getWeightsArray(
+        deformer, targets=influences, geometry=geometry
+    )
+    return weights.T.astype(np.float64), influences
+
+
+def setWeights(
+    deformer: str,
+    weights: np.ndarray,
+    influences: List[str] = None,
+    geometry: str = None,
+) -> None:
+    """
+    Set the deformer weights from a (vertex x influence) array. See `getWeights` for the influences of each deformer.
+
+    :param deformer: skin cluster, blendshape or deformer to set the weights of
+    :param weights: (vertex x influence) array of weights
+    :param influences: name of the influence of each column. Defaults to all influences of the deformer.
+    :param geometry: Optional- geometry to set the weights for. By default the first geometry is used.
+    """
+    geometry = _getGeometry(deformer, geometry)
+    weights = np.asarray(weights, dtype=np.float64)
+    nodeType = cmds.nodeType(deformer)
+
+    if nodeType == "skinCluster":
+        influences = influences or skinCluster.getInfluenceJoints(deformer)
+        skinCluster.setWeightsArray(geometry, deformer, weights, influences)
+        return
+
+    if nodeType == "blendShape":
+        if not influences:
+            influences = blendshape.getTargetList(deformer) + [blendshape.BASE_WEIGHTS]
+        blendshape.setWeightsArray(
+            deformer, weights.T, targets=influences, geometry=geometry
+        )
+        return
+
+    deformerUtils.setWeightsArray(deformer, weights[:, 0], geometry=geometry)
+
+
+def mirrorWeights(
+    deformer: str,
+    geometry: str = None,
+    axis: str = "x",
+    positiveToNegative: bool = True,
+    mirrorInfluences: bool = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+    left: str = None,
+    right: str = None,
+) -> None:
     """
     Mirror deformer weights across a mesh
-    :return:
+
+    :param deformer: skin cluster, blendshape or deformer to mirror the weights of
+    :param geometry: Optional- geometry to mirror the weights on. By default the first geometry is used.
+    :param axis: axis to mirror across
+    :param positiveToNegative: copy the weights of the positive side to the negative side
+    :param mirrorInfluences: swap the weights of left and right influences. By default only skin clusters are swapped.
+    :param tolerance: maximum distance between a mirrored vertex and its match
+    :param left: Optional- token used for left influences. See `common.getMirrorName`
+    :param right: Optional- token used for right influences. See `common.getMirrorName`
     """
-    # TODO:
-    pass
+    _applySymmetry(
+        deformer,
+        geometry,
+        axis,
+        mirrorInfluences,
+        tolerance,
+        left,
+        right,
+        lambda symmetryMap, weights, influenceMap: symmetryMap.mirror(
+            weights, influenceMap, positiveToNegative=positiveToNegative
+        ),
+    )
 
 
-def flipWeights():
+def flipWeights(
+    deformer: str,
+    geometry: str = None,
+    axis: str = "x",
+    mirrorInfluences: bool = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+    left: str = None,
+    right: str = None,
+) -> None:
     """
     Flip deformer weights across a mesh
-    :return:
+
+    :param deformer: skin cluster, blendshape or deformer to flip the weights of
+    :param geometry: Optional- geometry to flip the weights on. By default the first geometry is used.
+    :param axis: axis to flip across
+    :param mirrorInfluences: swap the weights of left and right influences. By default only skin clusters are swapped.
+    :param tolerance: maximum distance between a mirrored vertex and its match
+    :param left: Optional- token used for left influences. See `common.getMirrorName`
+    :param right: Optional- token used for right influences. See `common.getMirrorName`
     """
-    # TODO:
-    pass
+    _applySymmetry(
+        deformer,
+        geometry,
+        axis,
+        mirrorInfluences,
+        tolerance,
+        left,
+        right,
+        lambda symmetryMap, weights, influenceMap: symmetryMap.flip(
+            weights, influenceMap
+        ),
+    )
+
+
+def _applySymmetry(
+    deformer, geometry, axis, mirrorInfluences, tolerance, left, right, operation
+) -> None:
+    """Get the weights of a deformer, run a symmetry operation on them and set the result"""
+    geometry = _getGeometry(deformer, geometry)
+    if mirrorInfluences is None:
+        mirrorInfluences = cmds.nodeType(deformer) == "skinCluster"
+
+    weights, influences = getWeights(deformer, geometry=geometry)
+    symmetryMap = getSymmetryMap(geometry, axis=axis, tolerance=tolerance)
+
+    influenceMap = None
+    if mirrorInfluences:
+        influenceMap = getInfluenceMirrorMap(influences, left=left, right=right)
+
+    setWeights(
+        deformer,
+        operation(symmetryMap, weights, influenceMap),
+        influences,
+        geometry=geometry,
+    )
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: compression.py
+    author: masonsmigel
+    date: 10/2026
+    description: Lossy compression of (N x 3) vector arrays with a bounded error.
+                 Arrays can be quantized relative to their bounding box, or a set of arrays can share a low rank
+                 basis found with an SVD. Both methods guarantee that no vector moves further than a maximum error.
+"""
+import logging
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# quantization steps are made slightly smaller than needed to leave room for rounding the rebuilt values
+_STEP_MARGIN = 0.999
+
+# the step is shrunk by this factor until the rebuilt values are within the maximum error
+_STEP_SHRINK = 0.9
+_MAX_STEP_ATTEMPTS = 20
+
+def getVectorError(values: np.ndarray, approximation: np.ndarray) -> np.ndarray:
+    """
+    Get the distance between each vector and its approximation.
+
+    :param values: (... x 3) array of the original vectors
+    :param approximation: (... x 3) array of the approximated vectors
+    :return: array of the distance of each vector
+    """
+    difference = np.asarray(values, dtype=np.float64) - np.asarray(
+        approximation, dtype=np.float64
+    )
+    return np.linalg.norm(difference, axis=-1)
+
+
+def _getQuantizedType(levels: int) -> np.dtype:
+    """Get the smallest unsigned integer type that can store a number of levels"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if levels <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    raise ValueError(f"Too many quantization levels: {levels}")
+
+
+def _quantizeWithStep(values: np.ndarray, minimum: np.ndarray, extent: np.ndarray, maxStep: float) -> Dict:
+    """Quantize an array of float64 vectors with levels no further apart than the max step"""
+    levels = np.ceil(extent / maxStep).astype(np.int64) + 1
+    step = np.divide(extent, levels - 1, out=np.zeros_like(extent), where=levels > 1)
+
+    dtype = _getQuantizedType(int(levels.max()))
+    scaled = np.divide(values - minimum, step, out=np.zeros_like(values), where=step > 0.0)
+    quantizedValues = np.clip(np.rint(scaled), 0, levels - 1).astype(dtype)
+
+    return OrderedDict(minimum=minimum, step=step, values=quantizedValues)
+
+
+def quantize(values: np.ndarray, maxError: float) -> Dict:
+    """
+    Quantize an array of vectors relative to their bounding box.
+    Each axis is split into evenly spaced levels so no vector moves further than the max error.
+    The values are stored in the smallest integer type that fits the number of levels.
+
+    The bounding box minimum and step are stored as float64 and the error of the rebuilt float32 vectors is checked.
+    If it is above the max error the step is made smaller until it is not.
+
+    :param values: (N x 3) array of vectors
+    :param maxError: maximum distance between a vector and its quantized value
+    :return: dictionary of the bounding box minimum, the step of each axis and the quantized values
+    """
+    if maxError <= 0.0:
+        raise ValueError(f"The max error must be greater than 0. Got {maxError}")
+
+    values = np.asarray(values, dtype=np.float32).reshape(-1, 3)
+    if not len(values):
+        return OrderedDict(
+            minimum=np.zeros(3, dtype=np.float64),
+            step=np.zeros(3, dtype=np.float64),
+            values=np.zeros((0, 3), dtype=np.uint8),
+        )
+
+    minimum = values.min(axis=0).astype(np.float64)
+    extent = values.max(axis=0).astype(np.float64) - minimum
+
+    # the rebuilt vectors are rounded to float32, which moves them up to half a float32 step along each axis
+    roundingError = np.sqrt(3.0) * 0.5 * np.finfo(np.float32).eps * float(np.abs(values).max())
+    if roundingError >= maxError:
+        raise ValueError(f"The max error of {maxError} is below the float32 precision of the values")
+
+    # rounding each axis to the nearest level moves a vector at most half a step along each axis
+    maxStep = 2.0 * (maxError - roundingError) / np.sqrt(3.0) * _STEP_MARGIN
+    for _ in range(_MAX_STEP_ATTEMPTS):
+        quantized = _quantizeWithStep(values.astype(np.float64), minimum, extent, maxStep)
+        error = getVectorError(values, dequantize(quantized)).max()
+        if error <= maxError:
+            return quantized
+        maxStep *= _STEP_SHRINK
+
+    raise RuntimeError(f"Unable to quantize the values within the max error of {maxError}")
+
+
+def dequantize(quantized: Dict) -> np.ndarray:
+    """
+    Rebuild an array of vectors from its quantized values.
+    The vectors are rebuilt in float64 and rounded to float32 once.
+
+    :param quantized: dictionary returned by `quantize`
+    :return: (N x 3) float32 array of vectors
+    """
+    minimum = np.asarray(quantized["minimum"], dtype=np.float64)
+    step = np.asarray(quantized["step"], dtype=np.float64)
+    values = np.asarray(quantized["values"], dtype=np.float64).reshape(-1, 3)
+    return (minimum + values * step).astype(np.float32)
+
+
+def fitBasis(
+    values: np.ndarray, maxError: float, mask: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find a shared low rank basis for a set of vector arrays.
+    The rank is the smallest rank where no vector moves further than the max error.
+
+    Each array is approximated as `coefficients[i] @ basis`. If a mask is given only the masked vectors are
+    checked against the max error, the other vectors can have any value in the approximation.
+
+    :param values: (arrays x vectors x 3) array of the vector arrays
+    :param maxError: maximum distance between a vector and its approximation
+    :param mask: Optional- (arrays x vectors) boolean array of the vectors that must be within the max error
+    :return: (arrays x rank) float32 array of coefficients and (rank x vectors * 3) float32 basis
+    """
+    if maxError <= 0.0:
+        raise ValueError(f"The max error must be greater than 0. Got {maxError}")
+
+    values = np.asarray(values, dtype=np.float32)
+    arrayCount, vectorCount = values.shape[:2]
+    if mask is None:
+        mask = np.ones((arrayCount, vectorCount), dtype=bool)
+
+    matrix = values.reshape(arrayCount, vectorCount * 3)
+    u, s, vt = np.linalg.svd(matrix, full_matrices=False)
+
+    def _getBasis(rank):
+        coefficients = (u[:, :rank] * s[:rank]).astype(np.float32)
+        return coefficients, vt[:rank].astype(np.float32)
+
+    def _isValid(rank):
+        coefficients, basis = _getBasis(rank)
+        approximation = (coefficients @ basis).reshape(values.shape)
+        return getVectorError(values, approximation)[mask].max(initial=0.0) <= maxError
+
+    # the error usually drops as the rank grows so search for the smallest valid rank
+    low, high = 0, len(s)
+    while low < high:
+        rank = (low + high) // 2
+        if _isValid(rank):
+            high = rank
+        else:
+            low = rank + 1
+
+    # the max error is not guaranteed to drop with every rank so step up until the error is valid
+    rank = low
+    while rank < len(s) and not _isValid(rank):
+        rank += 1
+
+    if not _isValid(rank):
+        raise RuntimeError(f"Unable to fit a basis within the max error of {maxError}")
+
+    logger.debug(f"Fit a basis of rank {rank} to {arrayCount} arrays")
+    return _getBasis(rank)
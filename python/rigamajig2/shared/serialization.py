@@ -0,0 +1,476 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: serialization.py
+    author: masonsmigel
+    date: 10/2026
+    description: File formats used to store data files.
+                 Data files are stored as a header (user, type, time) and a dictionary of data.
+                 They can be written as human readable json or as a compact binary container.
+"""
+import json
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# file formats
+JSON = "json"
+BINARY = "binary"
+
+JSON_EXTENSION = ".json"
+BINARY_EXTENSION = ".rigdata"
+
+DATA_FILE_EXTENSIONS = [JSON_EXTENSION, BINARY_EXTENSION]
+
+# binary container layout: magic, version, header size, json header, payload
+BINARY_MAGIC = b"RIGDATA\x00"
+BINARY_VERSION = 1
+COMPRESSION_LEVEL = 1
+
+_PREAMBLE = struct.Struct("<8sII")
+_ARRAY_KEY = "__ndarray__"
+
+# size of each chunk read when looking for the header of a json file
+_JSON_HEADER_CHUNK_SIZE = 16 * 1024
+
+
+def _jsonDefault(obj):
+    """Convert numpy types to types json can store"""
+    if isinstance(obj, LazyArray):
+        obj = obj.load()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+class LazyArray(object):
+    """
+    Array stored in a binary data file that is only read and decompressed when it is used.
+    Use `load` or `numpy.asarray` to get the values.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        offset: int,
+        size: int,
+        dtype: str,
+        shape: Tuple[int, ...],
+    ):
+        """
+        :param filepath: path of the binary data file
+        :param offset: location of the compressed block in the file
+        :param size: size of the compressed block
+        :param dtype: data type of the array
+        :param shape: shape of the array
+        """
+        self.filepath = filepath
+        self.offset = offset
+        self.size = size
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self._fileStamp = self._getFileStamp()
+
+    def __len__(self):
+        return self.shape[0] if self.shape else 0
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.load()
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self):
+        return f"LazyArray(shape={self.shape}, dtype={self.dtype})"
+
+    def _getFileStamp(self):
+        stat = os.stat(self.filepath)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> np.ndarray:
+        """Read and decompress the array from the file"""
+        if self._getFileStamp() != self._fileStamp:
+            raise RuntimeError(
+                f"{self.filepath} was modified since it was read. Read the file again."
+            )
+
+        with open(self.filepath, "rb") as f:
+            f.seek(self.offset)
+            values = np.frombuffer(zlib.decompress(f.read(self.size)), dtype=self.dtype)
+        return values.reshape(self.shape).copy()
+
+
+class Serializer(object):
+    """
+    Base class for a data file format. Subclass this and use `registerSerializer` to add a new format.
+    """
+
+    def write(self, filepath: str, header: Dict, data: Dict) -> None:
+        """
+        Write a data file
+
+        :param filepath: path of the file to write
+        :param header: header values of the file (user, type, time)
+        :param data: dictionary of data to store
+        """
+        raise NotImplementedError
+
+    def read(
+        self, filepath: str, keys: List[str] = None, lazyArrays: bool = False
+    ) -> Tuple[Dict, Dict]:
+        """
+        Read a data file
+
+        :param filepath: path of the file to read
+        :param keys: Optional- only read these keys of the data. By default all keys are read.
+        :param lazyArrays: return arrays as `LazyArray` objects that are read when they are used.
+                           Only formats that store arrays separately support this.
+        :return: the header and the data of the file
+        """
+        raise NotImplementedError
+
+    def readHeader(self, filepath: str) -> Dict:
+        """
+        Read only the header of a data file
+
+        :param filepath: path of the file to read
+        :return: the header of the file
+        """
+        header, _ = self.read(filepath)
+        return header
+
+    def readKeys(self, filepath: str) -> List[str]:
+        """
+        Read the list of keys stored in the data of a file
+
+        :param filepath: path of the file to read
+        :return: list of keys
+        """
+        _, data = self.read(filepath)
+        return list(data.keys())
+
+    def isFormat(self, filepath: str) -> bool:
+        """Check if a file is stored in this format"""
+        return False
+
+
+class JsonSerializer(Serializer):
+    """Human readable json data files"""
+
+    indent = 4
+
+    def write(self, filepath, header, data):
+        writeData = OrderedDict(header)
+        writeData["data"] = data
+        fileData = json.dumps(
+            writeData, indent=self.indent, ensure_ascii=False, default=_jsonDefault
+        )
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(fileData)
+
+    def read(self, filepath, keys=None, lazyArrays=False):
+        with open(filepath, "r", encoding="utf-8") as f:
+            fileData = json.loads(f.read(), object_pairs_hook=OrderedDict)
+
+        data = fileData.pop("data", OrderedDict())
+        if keys is not None:
+            data = OrderedDict((key, data[key]) for key in keys if key in data)
+        return fileData, data
+
+    def readHeader(self, filepath):
+        """
+        Read the header values stored before the data. This only decodes the start of the file.
+        Json files may be edited by hand so the keys and their locations are not stored in the header.
+        """
+        decoder = json.JSONDecoder(object_pairs_hook=OrderedDict)
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            text = ""
+            while True:
+                chunk = f.read(_JSON_HEADER_CHUNK_SIZE)
+                text += chunk
+                try:
+                    return self._parseHeader(text, decoder)
+                except (json.JSONDecodeError, IndexError):
+                    if not chunk:
+                        break
+
+        # the file could not be read in parts. Fallback to reading the whole file.
+        return super(JsonSerializer, self).readHeader(filepath)
+
+    @staticmethod
+    def _parseHeader(text: str, decoder: json.JSONDecoder) -> Dict:
+        """
+        Decode the top level values of a json file until the data is reached.
+        Raises an error if the text ends before the data.
+        """
+
+        def _skipWhitespace(index):
+            while text[index] in " \t\n\r":
+                index += 1
+            return index
+
+        header = OrderedDict()
+        index = _skipWhitespace(0)
+        if text[index] != "{":
+            raise json.JSONDecodeError("Expected '{'", text, index)
+        index += 1
+
+        while True:
+            index = _skipWhitespace(index)
+            if text[index] == "}":
+                return header
+            if text[index] == ",":
+                index = _skipWhitespace(index + 1)
+
+            key, index = decoder.raw_decode(text, index)
+            index = _skipWhitespace(index)
+            if text[index] != ":":
+                raise json.JSONDecodeError("Expected ':'", text, index)
+
+            if key == "data":
+                return header
+
+            value, index = decoder.raw_decode(text, _skipWhitespace(index + 1))
+            header[key] = value
+
+
+class BinarySerializer(Serializer):
+    """
+    Compact binary data files.
+
+    The file starts with a json header that stores the type, user and time along with the location of each key and
+    array block in the payload. Each key of the data is compressed separately. Numpy arrays within the data are
+    stored as compressed blocks of raw values instead of json lists.
+    """
+
+    def write(self, filepath, header, data):
+        arrays = list()
+
+        def _storeArray(obj):
+            # arrays are replaced with a reference to the block that stores their values
+            if isinstance(obj, LazyArray):
+                obj = obj.load()
+            if isinstance(obj, np.ndarray):
+                arrays.append(np.ascontiguousarray(obj))
+                return {_ARRAY_KEY: len(arrays) - 1}
+            return _jsonDefault(obj)
+
+        payload = list()
+        payloadSize = 0
+
+        nodes = OrderedDict()
+        for key, value in data.items():
+            nodeData = json.dumps(value, separators=(",", ":"), default=_storeArray)
+            nodeBytes = zlib.compress(nodeData.encode("utf-8"), COMPRESSION_LEVEL)
+            nodes[str(key)] = [payloadSize, len(nodeBytes)]
+            payload.append(nodeBytes)
+            payloadSize += len(nodeBytes)
+
+        blocks = list()
+        for array in arrays:
+            blockBytes = zlib.compress(array.tobytes(), COMPRESSION_LEVEL)
+            blocks.append([payloadSize, len(blockBytes), array.dtype.str, array.shape])
+            payload.append(blockBytes)
+            payloadSize += len(blockBytes)
+
+        fileHeader = OrderedDict(header)
+        fileHeader["keys"] = list(nodes.keys())
+        fileHeader["nodes"] = nodes
+        fileHeader["blocks"] = blocks
+        headerBytes = json.dumps(fileHeader, separators=(",", ":")).encode("utf-8")
+
+        with open(filepath, "wb") as f:
+            f.write(_PREAMBLE.pack(BINARY_MAGIC, BINARY_VERSION, len(headerBytes)))
+            f.write(headerBytes)
+            for chunk in payload:
+                f.write(chunk)
+
+    def _readFileHeader(self, f) -> Tuple[Dict, int]:
+        """Read the header from an open file. Returns the header and the start of the payload"""
+        magic, version, headerSize = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != BINARY_MAGIC:
+            raise RuntimeError(f"{f.name} is not a binary data file")
+        if version > BINARY_VERSION:
+            raise RuntimeError(
+                f"{f.name} was written with a newer version ({version}) of the binary format"
+            )
+
+        header = json.loads(
+            f.read(headerSize).decode("utf-8"), object_pairs_hook=OrderedDict
+        )
+        return header, _PREAMBLE.size + headerSize
+
+    def read(self, filepath, keys=None, lazyArrays=False):
+        with open(filepath, "rb") as f:
+            header, payloadStart = self._readFileHeader(f)
+            nodes = header.pop("nodes")
+            blocks = header.pop("blocks")
+
+            def _readChunk(offset, size):
+                f.seek(payloadStart + offset)
+                return zlib.decompress(f.read(size))
+
+            def _restoreArray(pairs):
+                # replace array references with the values stored in their block
+                if len(pairs) == 1 and pairs[0][0] == _ARRAY_KEY:
+                    offset, size, dtype, shape = blocks[pairs[0][1]]
+                    if lazyArrays:
+                        return LazyArray(
+                            filepath, payloadStart + offset, size, dtype, shape
+                        )
+                    values = np.frombuffer(
+                        _readChunk(offset, size), dtype=np.dtype(dtype)
+                    )
+                    return values.reshape(shape).copy()
+                return OrderedDict(pairs)
+
+            # only the requested keys and the arrays they reference are decompressed
+            data = OrderedDict()
+            for key in header["keys"] if keys is None else keys:
+                if key not in nodes:
+                    continue
+                offset, size = nodes[key]
+                data[key] = json.loads(
+                    _readChunk(offset, size).decode("utf-8"),
+                    object_pairs_hook=_restoreArray,
+                )
+
+        return header, data
+
+    def readHeader(self, filepath):
+        with open(filepath, "rb") as f:
+            header, _ = self._readFileHeader(f)
+        header.pop("nodes")
+        header.pop("blocks")
+        return header
+
+    def readKeys(self, filepath):
+        return self.readHeader(filepath)["keys"]
+
+    def isFormat(self, filepath):
+        with open(filepath, "rb") as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+_serializers = OrderedDict()
+_extensions = dict()
+
+
+def registerSerializer(
+    fileFormat: str, serializer: Serializer, extension: str = None
+) -> None:
+    """
+    Register a file format.
+
+    :param fileFormat: name of the format
+    :param serializer: serializer instance used to read and write the format
+    :param extension: Optional- file extension that uses this format by default
+    """
+    if not isinstance(serializer, Serializer):
+        raise TypeError(f"{serializer} must be an instance of Serializer")
+
+    _serializers[fileFormat] = serializer
+    if extension:
+        _extensions[extension.lower()] = fileFormat
+
+
+def getSerializer(fileFormat: str) -> Serializer:
+    """Get the serializer of a file format"""
+    if fileFormat not in _serializers:
+        raise ValueError(
+            f"'{fileFormat}' is not a valid file format. Valid formats are {list(_serializers.keys())}"
+        )
+    return _serializers[fileFormat]
+
+
+def getFileFormats() -> List[str]:
+    """Get a list of all registered file formats"""
+    return list(_serializers.keys())
+
+
+def getFormatFromExtension(filepath: str) -> str or None:
+    """Get the file format used by the extension of a file. Returns None if the extension has no format"""
+    extension = os.path.splitext(filepath)[-1].lower()
+    return _extensions.get(extension)
+
+
+def getFileExtension(fileFormat: str) -> str:
+    """Get the default file extension of a file format"""
+    getSerializer(fileFormat)
+    for extension, extensionFormat in _extensions.items():
+        if extensionFormat == fileFormat:
+            return extension
+    raise ValueError(f"'{fileFormat}' does not have a file extension")
+
+
+def detectFormat(filepath: str) -> str:
+    """
+    Get the format of an existing data file from its contents
+
+    :param filepath: path of the file to check
+    :return: name of the file format
+    """
+    # json is the fallback for any file that does not match another format.
+    for fileFormat, serializer in _serializers.items():
+        if serializer.isFormat(filepath):
+            return fileFormat
+    return JSON
+
+
+def write(filepath: str, header: Dict, data: Dict, fileFormat: str = JSON) -> None:
+    """
+    Write a data file
+
+    :param filepath: path of the file to write
+    :param header: header values of the file (user, type, time)
+    :param data: dictionary of data to store
+    :param fileFormat: format to write the file in
+    """
+    getSerializer(fileFormat).write(filepath, header, data)
+
+
+def read(
+    filepath: str, keys: List[str] = None, lazyArrays: bool = False
+) -> Tuple[Dict, Dict]:
+    """
+    Read a data file. The format is detected from the file contents.
+
+    :param filepath: path of the file to read
+    :param keys: Optional- only read these keys of the data. By default all keys are read.
+    :param lazyArrays: return arrays of binary files as `LazyArray` objects that are read when they are used.
+    :return: the header and the data of the file
+    """
+    return getSerializer(detectFormat(filepath)).read(
+        filepath, keys=keys, lazyArrays=lazyArrays
+    )
+
+
+def readHeader(filepath: str) -> Dict:
+    """
+    Read the header of a data file. The format is detected from the file contents.
+
+    :param filepath: path of the file to read
+    :return: the header of the file
+    """
+    return getSerializer(detectFormat(filepath)).readHeader(filepath)
+
+
+def readKeys(filepath: str) -> List[str]:
+    """
+    Read the list of keys stored in a data file. Binary files only read the header.
+
+    :param filepath: path of the file to read
+    :return: list of keys
+    """
+    return getSerializer(detectFormat(filepath)).readKeys(filepath)
+
+
+registerSerializer(JSON, JsonSerializer(), extension=JSON_EXTENSION)
+registerSerializer(BINARY, BinarySerializer(), extension=BINARY_EXTENSION)
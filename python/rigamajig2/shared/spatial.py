@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: spatial.py
+    author: masonsmigel
+    date: 10/2026
+    description: Spatial queries on numpy point arrays.
+                 Nearest point lookups use a scipy KD-tree when scipy is available. Otherwise they fall back to a
+                 chunked brute force search in numpy. Mesh adjacency matrices use scipy sparse matrices
+                 when scipy is available.
+"""
+import logging
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# maximum number of distances computed at once by the brute force search
+_BRUTE_FORCE_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _getKDTreeClass():
+    """Get the scipy KD-tree class. Returns None if scipy is not installed"""
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    return cKDTree
+
+
+def _getSparseMatrixClass():
+    """Get the scipy sparse matrix class. Returns None if scipy is not installed"""
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError:
+        return None
+    return csr_matrix
+
+
+class _SparseRowMatrix(object):
+    """Minimal sparse matrix used when scipy is not available. Only supports multiplying with a dense array"""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        rows: np.ndarray,
+        columns: np.ndarray,
+        shape: Tuple[int, int],
+    ):
+        order = np.lexsort((columns, rows))
+        self.values = values[order]
+        self.rows = rows[order]
+        self.columns = columns[order]
+        self.shape = shape
+
+        self._uniqueRows, self._rowStarts = np.unique(self.rows, return_index=True)
+
+    def __matmul__(self, other: np.ndarray) -> np.ndarray:
+        other = np.asarray(other)
+        result = np.zeros(
+            (self.shape[0],) + other.shape[1:], dtype=np.result_type(other, self.values)
+        )
+        if not len(self.values):
+            return result
+
+        products = other[self.columns] * self.values.reshape(
+            (-1,) + (1,) * (other.ndim - 1)
+        )
+        result[self._uniqueRows] = np.add.reduceat(products, self._rowStarts, axis=0)
+        return result
+
+    def dot(self, other: np.ndarray) -> np.ndarray:
+        return self @ other
+
+
+def adjacencyMatrix(
+    edges: np.ndarray, vertexCount: int, edgeWeights: np.ndarray = None
+):
+    """
+    Build a row normalized sparse adjacency matrix from a list of edges.
+    Multiplying a (vertex x N) array by the matrix gives the weighted average of the neighbors of each vertex.
+    Vertices without any neighbors average to themselves.
+
+    :param edges: (edge x 2) array of the vertex indices of each edge
+    :param vertexCount: number of vertices
+    :param edgeWeights: Optional- weight of each edge. By default all edges are weighted equally.
+    :return: (vertex x vertex) sparse matrix
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if edgeWeights is None:
+        edgeWeights = np.ones(len(edges), dtype=np.float64)
+    edgeWeights = np.asarray(edgeWeights, dtype=np.float64)
+
+    # each edge connects both of its vertices
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    columns = np.concatenate([edges[:, 1], edges[:, 0]])
+    values = np.concatenate([edgeWeights, edgeWeights])
+
+    isolated = np.setdiff1d(np.arange(vertexCount), rows)
+    rows = np.concatenate([rows, isolated])
+    columns = np.concatenate([columns, isolated])
+    values = np.concatenate([values, np.ones(len(isolated))])
+
+    rowTotals = np.bincount(rows, weights=values, minlength=vertexCount)
+    values = np.divide(
+        values, rowTotals[rows], out=np.zeros_like(values), where=rowTotals[rows] != 0.0
+    )
+
+    sparseMatrixClass = _getSparseMatrixClass()
+    if sparseMatrixClass is None:
+        return _SparseRowMatrix(values, rows, columns, (vertexCount, vertexCount))
+    return sparseMatrixClass(
+        (values, (rows, columns)), shape=(vertexCount, vertexCount)
+    )
+
+
+class PointIndex(object):
+    """
+    Spatial index over a set of points used to find the nearest points to a batch of query points.
+    Build the index once and query it as many times as needed.
+
+    Example:
+        >>> pointIndex = PointIndex(sourcePoints)
+        >>> distances, indices = pointIndex.query(targetPoints, k=4)
+    """
+
+    def __init__(self, points: np.ndarray, leafSize: int = 16):
+        """
+        :param points: (N x D) array of points to index
+        :param leafSize: number of points in each leaf of the KD-tree
+        """
+        self.points = np.ascontiguousarray(points, dtype=np.float64)
+        if self.points.ndim != 2:
+            raise ValueError(
+                f"Points must be a 2D array. Got shape {self.points.shape}"
+            )
+
+        kdTreeClass = _getKDTreeClass()
+        if kdTreeClass is None:
+            logger.debug(
+                "scipy is not available. Using a brute force nearest point search"
+            )
+            self._tree = None
+        else:
+            self._tree = kdTreeClass(self.points, leafsize=leafSize)
+
+    def __len__(self):
+        return len(self.points)
+
+    def query(self, points: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest indexed points to each query point.
+
+        :param points: (M x D) array of points to query
+        :param k: number of nearest points to find for each query point
+        :return: (M x k) arrays of distances and indices of the nearest points sorted by distance
+        """
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(
+            -1, self.points.shape[1]
+        )
+        k = min(int(k), len(self.points))
+
+        if self._tree is not None:
+            distances, indices = self._tree.query(points, k=k)
+            return distances.reshape(-1, k), indices.reshape(-1, k).astype(np.int64)
+
+        return self._bruteForceQuery(points, k)
+
+    def _bruteForceQuery(
+        self, points: np.ndarray, k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        distances = np.empty((len(points), k), dtype=np.float64)
+        indices = np.empty((len(points), k), dtype=np.int64)
+
+        indexedLengths = np.einsum("ij,ij->i", self.points, self.points)
+        chunkSize = max(_BRUTE_FORCE_CHUNK_SIZE // max(len(self.points), 1), 1)
+        for start in range(0, len(points), chunkSize):
+            chunk = points[start : start + chunkSize]
+
+            # |a - b|^2 = |a|^2 + |b|^2 - 2ab
+            squaredDistances = (
+                np.einsum("ij,ij->i", chunk, chunk)[:, None]
+                + indexedLengths[None, :]
+                - 2.0 * chunk @ self.points.T
+            )
+            np.maximum(squaredDistances, 0.0, out=squaredDistances)
+
+            if k < len(self.points):
+                nearest = np.argpartition(squaredDistances, k - 1, axis=1)[:, :k]
+            else:
+                nearest = np.broadcast_to(
+                    np.arange(len(self.points)), squaredDistances.shape
+                )
+            nearestDistances = np.take_along_axis(squaredDistances, nearest, axis=1)
+
+            order = np.argsort(nearestDistances, axis=1)
+            indices[start : start + chunkSize] = np.take_along_axis(
+                nearest, order, axis=1
+            )
+            distances[start : start + chunkSize] = np.sqrt(
+                np.take_along_axis(nearestDistances, order, axis=1)
+            )
+
+        return distances, indices
+
+
+def closestPointsOnTriangles(
+    points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the closest point on each triangle to each point.
+    Based on the closest point on triangle test from Real-Time Collision Detection by Christer Ericson.
+
+    :param points: (N x 3) array of points
+    :param a: (N x 3) array of the first corner of each triangle
+    :param b: (N x 3) array of the second corner of each triangle
+    :param c: (N x 3) array of the third corner of each triangle
+    :return: (N x 3) array of the closest points and (N x 3) array of their barycentric coordinates
+    """
+    points, a, b, c = [
+        np.asarray(array, dtype=np.float64) for array in (points, a, b, c)
+    ]
+
+    def _dot(v0, v1):
+        return np.einsum("ij,ij->i", v0, v1)
+
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+
+    d1 = _dot(ab, ap)
+    d2 = _dot(ac, ap)
+    d3 = _dot(ab, bp)
+    d4 = _dot(ac, bp)
+    d5 = _dot(ab, cp)
+    d6 = _dot(ac, cp)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # inside the triangle
+        denom = va + vb + vc
+        v = np.where(denom != 0.0, vb / denom, 0.0)
+        w = np.where(denom != 0.0, vc / denom, 0.0)
+        barycentric = np.stack([1.0 - v - w, v, w], axis=1)
+
+        # the regions are assigned from the lowest to the highest priority so the first region that
+        # matches in the original test wins.
+        edgeBC = (va <= 0.0) & ((d4 - d3) >= 0.0) & ((d5 - d6) >= 0.0)
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        barycentric[edgeBC] = np.stack([np.zeros_like(t), 1.0 - t, t], axis=1)[edgeBC]
+
+        edgeAC = (vb <= 0.0) & (d2 >= 0.0) & (d6 <= 0.0)
+        t = d2 / (d2 - d6)
+        barycentric[edgeAC] = np.stack([1.0 - t, np.zeros_like(t), t], axis=1)[edgeAC]
+
+        vertexC = (d6 >= 0.0) & (d5 <= d6)
+        barycentric[vertexC] = [0.0, 0.0, 1.0]
+
+        edgeAB = (vc <= 0.0) & (d1 >= 0.0) & (d3 <= 0.0)
+        t = d1 / (d1 - d3)
+        barycentric[edgeAB] = np.stack([1.0 - t, t, np.zeros_like(t)], axis=1)[edgeAB]
+
+        vertexB = (d3 >= 0.0) & (d4 <= d3)
+        barycentric[vertexB] = [0.0, 1.0, 0.0]
+
+        vertexA = (d1 <= 0.0) & (d2 <= 0.0)
+        barycentric[vertexA] = [1.0, 0.0, 0.0]
+
+    # degenerate triangles can produce invalid coordinates. Snap them to the first corner.
+    invalid = ~np.isfinite(barycentric).all(axis=1)
+    barycentric[invalid] = [1.0, 0.0, 0.0]
+
+    closestPoints = (
+        barycentric[:, 0:1] * a + barycentric[:, 1:2] * b + barycentric[:, 2:3] * c
+    )
+    return closestPoints, barycentric
@@ -42,13 +42,12 @@ LOADABLE_TYPES = ['AnimData',
                   'SkinData']
 
 JSON_FILTER = "Json Files (*.json)"
+DATA_FILTER = "Data Files (*.json *.rigdata);;Json Files (*.json);;Binary Data Files (*.rigdata)"
 
 
 class DataLoader(QtWidgets.QWidget):
     """ Widget to select valid file or folder paths """
 
-    DATA_TYPE_LIST = dataManager.getDataModules()
-
     # emit a list of files when updated
     filesUpdated = QtCore.Signal(object)
 
@@ -56,7 +55,7 @@ class DataLoader(QtWidgets.QWidget):
             self,
             label=None,
             caption='Select a file or Folder',
-            fileFilter=JSON_FILTER,
+            fileFilter=DATA_FILTER,
             fileMode=1,
             widgetHeight=102,
             relativePath=None,
@@ -244,7 +243,7 @@ class DataLoader(QtWidgets.QWidget):
         """Here we want to create actions for each datatype and return the action so they can be added to a menu.
         This is used in both the add button and add context menu"""
         actions = list()
-        for dataType in self.DATA_TYPE_LIST:
+        for dataType in dataManager.getDataTypes():
             # if we want to use filtering check to see if the data is in the filter.
             if self.dataFilteringEnabled and dataType not in self.dataFilter:
                 continue
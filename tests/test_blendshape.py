@@ -12,9 +12,11 @@ import random
 from pathlib import Path
 
 import maya.cmds as cmds
+import numpy as np
 import pytest
 
 from rigamajig2.maya import blendshape
+from rigamajig2.maya import mesh
 from rigamajig2.maya import skinCluster
 from rigamajig2.maya.data import blendshapeData
 from rigamajig2.maya.rig import blendshapeUtils
@@ -122,6 +124,42 @@ def test_convertItiToInbetween():
         assert assertAlmostEqual(blendshape.itiToInbetween(inputTargetIndex), weight)
 
 
+def test_getDeltaArray(testScene):
+    """Test that deltas are read as arrays from live and stored targets"""
+    baseGeo, blendshapeNode, target = testScene
+    blendshape.addTarget(blendshape=blendshapeNode, target=target, base=baseGeo)
+    cmds.xform(f"{target}.vtx[5]", translation=[0, 1, 0], relative=True, objectSpace=True)
+
+    indices, deltas = blendshape.getDeltaArray(blendshapeNode, target)
+    assert indices.tolist() == [5]
+    assert deltas.dtype == np.float32 and np.allclose(deltas, [[0, 1, 0]])
+    assert blendshape.getDelta(blendshapeNode, target) == {"5": (0.0, 1.0, 0.0)}
+
+    blendshape.addEmptyTarget(blendshape=blendshapeNode, target="storedTarget", base=baseGeo)
+    blendshape.setDelta(blendshapeNode, "storedTarget", deltaDict={"3": (1.0, 0.0, 0.0), "7": (0.0, 0.0, 0.00001)})
+
+    indices, deltas = blendshape.getDeltaArray(blendshapeNode, "storedTarget")
+    assert indices.tolist() == [3]
+    assert np.allclose(deltas, [[1, 0, 0]])
+
+
+def test_reconstructTargetFromDelta(testScene):
+    """Test that targets are rebuilt from deltas and the point changes can be undone"""
+    baseGeo, blendshapeNode, target = testScene
+    basePoints = mesh.getPointsArray(baseGeo)
+
+    targetGeo = blendshape.reconstructTargetFromDelta(blendshapeNode, ([2, 4], [[0, 1, 0], [1, 0, 0]]), name="rebuilt")
+    targetPoints = mesh.getPointsArray(targetGeo)
+    assert np.allclose(targetPoints[[2, 4]] - basePoints[[2, 4]], [[0, 1, 0], [1, 0, 0]], atol=1e-6)
+    assert np.allclose(np.delete(targetPoints, [2, 4], axis=0), np.delete(basePoints, [2, 4], axis=0))
+
+    cmds.undoInfo(state=True)
+    mesh.setPointsArray(targetGeo, basePoints)
+    assert np.allclose(mesh.getPointsArray(targetGeo), basePoints)
+    cmds.undo()
+    assert np.allclose(mesh.getPointsArray(targetGeo), targetPoints)
+
+
 def test_exportBlendshapeData(testScene, dataPath):
     """Test that blendshape data can be exporter properly"""
     baseGeo, blendshapeNode, target = testScene
@@ -150,6 +188,101 @@ def test_importBlendshapeData(testScene, dataPath):
     assert cmds.objExists(blendshapeNode) and bool(blendshape.getTargetList(blendshapeNode))
 
 
+def test_blendshapeDataSparseDeltas(testScene, tmp_path):
+    """Test that deltas are stored as arrays and only missing targets are loaded"""
+    baseGeo, blendshapeNode, target = testScene
+    blendshape.addTarget(blendshape=blendshapeNode, target=target, base=baseGeo)
+    cmds.xform(f"{target}.vtx[5]", translation=[0, 1, 0], relative=True, objectSpace=True)
+    cmds.xform(f"{target}.vtx[6]", translation=[0, 0.001, 0], relative=True, objectSpace=True)
+
+    dataPath = getTempFilePath(tmp_path, "blendshapeData.rigdata")
+    data = blendshapeData.BlendshapeData(targetTolerances={target: 0.01})
+    data.gatherData(baseGeo)
+    data.write(dataPath)
+
+    indices, deltas = data.getDelta(blendshapeNode, target)
+    assert indices.dtype == np.int32 and indices.tolist() == [5]
+    assert deltas.dtype == np.float32 and deltas.shape == (1, 3)
+
+    cmds.file(newFile=True, force=True)
+    sphere = getFirst(cmds.polySphere(constructionHistory=False, name="mySphere"))
+
+    data = blendshapeData.BlendshapeData()
+    data.read(dataPath)
+    data.applyAllData()
+
+    newBlendshape = getFirst(blendshape.getBlendshapeNodes(sphere))
+    indices, deltas = blendshape.getDeltaArray(newBlendshape, target)
+    assert indices.tolist() == [5]
+    assert np.allclose(deltas, [[0, 1, 0]], atol=1e-6)
+
+    # the delta of existing targets is not changed when the data is applied again
+    blendshape.setDelta(newBlendshape, target, ([1], [[1, 0, 0]]))
+    data.applyAllData()
+    assert blendshape.getDeltaArray(newBlendshape, target)[0].tolist() == [1]
+
+
+def test_blendshapeDataCompressedDeltas(testScene, tmp_path):
+    """Test that compressed deltas are rebuilt within the max error"""
+    baseGeo, blendshapeNode, target = testScene
+    blendshape.addTarget(blendshape=blendshapeNode, target=target, base=baseGeo)
+    cmds.xform(f"{target}.vtx[5]", translation=[0, 1.2345, 0], relative=True, objectSpace=True)
+    cmds.xform(f"{target}.vtx[9]", translation=[0.5, 0, -0.25], relative=True, objectSpace=True)
+    indices, deltas = blendshape.getDeltaArray(blendshapeNode, target)
+
+    for sharedBasis in [False, True]:
+        dataPath = getTempFilePath(tmp_path, f"blendshapeData_{sharedBasis}.rigdata")
+        data = blendshapeData.BlendshapeData(maxError=0.001, sharedBasis=sharedBasis)
+        data.gatherData(baseGeo)
+        data.write(dataPath)
+
+        data = blendshapeData.BlendshapeData()
+        data.read(dataPath)
+        compressedIndices, compressedDeltas = data.getDelta(blendshapeNode, target)
+        assert compressedIndices.tolist() == indices.tolist()
+        assert np.linalg.norm(compressedDeltas - deltas, axis=1).max() <= 0.001
+
+
+def test_weightsArray(testScene):
+    """Test that target and base weight maps are read and written as a (target x vertex) array"""
+    baseGeo, blendshapeNode, target = testScene
+    blendshape.addTarget(blendshape=blendshapeNode, target=target, base=baseGeo)
+    pointCount = len(mesh.getPointsArray(baseGeo))
+
+    weights, targets = blendshape.getWeightsArray(blendshapeNode)
+    assert targets == [target, blendshape.BASE_WEIGHTS]
+    assert weights.shape == (2, pointCount) and weights.dtype == np.float32
+    assert np.all(weights == 1.0)
+
+    newWeights = np.ones((2, pointCount), dtype=np.float32)
+    newWeights[0, 3] = 0.25
+    newWeights[1, 7] = 0.0
+    cmds.undoInfo(state=True)
+    blendshape.setWeightsArray(blendshapeNode, newWeights, targets=targets)
+    assert np.allclose(blendshape.getWeightsArray(blendshapeNode)[0], newWeights)
+    assert blendshape.getWeights(blendshapeNode) == {target: {3: 0.25}, blendshape.BASE_WEIGHTS: {7: 0.0}}
+    assert cmds.getAttr(f"{blendshapeNode}.inputTarget[0].baseWeights[7]") == 0.0
+
+    cmds.undo()
+    assert np.all(blendshape.getWeightsArray(blendshapeNode)[0] == 1.0)
+
+    encodedWeights = blendshapeData.encodeWeights(newWeights, targets)
+    assert encodedWeights["rows"].tolist() == [0, 1] and encodedWeights["indices"].tolist() == [3, 7]
+    decodedWeights, decodedTargets = blendshapeData.decodeWeights(encodedWeights)
+    assert decodedTargets == targets and np.array_equal(decodedWeights, newWeights)
+
+
+def test_decodeWeightsToNewPointCount():
+    weights = np.array([[0.5, 1.0, 1.0, 0.25], [1.0, 0.0, 1.0, 1.0]], dtype=np.float32)
+    encodedWeights = blendshapeData.encodeWeights(weights, ["a", "b"])
+
+    truncatedWeights, _ = blendshapeData.decodeWeights(encodedWeights, pointCount=2)
+    assert truncatedWeights.tolist() == [[0.5, 1.0], [1.0, 0.0]]
+
+    paddedWeights, _ = blendshapeData.decodeWeights(encodedWeights, pointCount=6)
+    assert paddedWeights.tolist() == [[0.5, 1.0, 1.0, 0.25, 1.0, 1.0], [1.0, 0.0, 1.0, 1.0, 1.0, 1.0]]
+
+
 def test_splitBlendshapeTargets(testScene):
     baseGeo, blendshapeNode, target = testScene
 
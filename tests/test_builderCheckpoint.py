@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_builderCheckpoint.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import pathlib
+
+import maya.cmds as cmds
+
+from rigamajig2.maya.builder import checkpoint
+
+
+def test_hashChangesWithContent(tmp_path):
+    dataFile = pathlib.Path(tmp_path) / "data.json"
+    dataFile.write_text("{}")
+    firstHash = checkpoint.hashFile(str(dataFile))
+
+    dataFile.write_text("{ }")
+    assert checkpoint.hashFile(str(dataFile)) != firstHash
+
+
+def test_hashDirectory(tmp_path):
+    (pathlib.Path(tmp_path) / "a.json").write_text("a")
+    firstHash = checkpoint.hashFile(str(tmp_path))
+
+    (pathlib.Path(tmp_path) / "b.json").write_text("b")
+    assert checkpoint.hashFile(str(tmp_path)) != firstHash
+
+
+def test_missingFile(tmp_path):
+    assert checkpoint.hashFile(str(pathlib.Path(tmp_path) / "missing.json")) == checkpoint.MISSING
+
+
+def test_saveAndValidate(tmp_path):
+    cmds.file(newFile=True, force=True)
+    cmds.createNode("transform", name="checkpointNode")
+
+    dataFile = pathlib.Path(tmp_path) / "data.json"
+    dataFile.write_text("{}")
+    inputHashes = checkpoint.hashInputs([str(dataFile)])
+
+    checkpointManager = checkpoint.CheckpointManager(str(pathlib.Path(tmp_path) / "checkpoints"))
+    checkpointManager.save("stage", inputHashes)
+
+    # read the manifest back from disk with a new manager
+    checkpointManager = checkpoint.CheckpointManager(str(pathlib.Path(tmp_path) / "checkpoints"))
+    assert checkpointManager.isValid("stage", inputHashes)
+
+    dataFile.write_text("{ }")
+    newInputHashes = checkpoint.hashInputs([str(dataFile)])
+    assert not checkpointManager.isValid("stage", newInputHashes)
+    assert checkpointManager.getChangedInputs("stage", newInputHashes) == [str(dataFile)]
+
+    cmds.file(newFile=True, force=True)
+    checkpointManager.load("stage")
+    assert cmds.objExists("checkpointNode")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_builderPrefetch.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import os
+import threading
+
+import pytest
+
+from rigamajig2.maya.builder import dataIO
+from rigamajig2.maya.builder import prefetch
+from rigamajig2.maya.data import jointData
+
+
+def _writeJointData(filepath, name):
+    dataObj = jointData.JointData()
+    dataObj.setData({name: {"translate": [0, 1, 0]}})
+    dataObj.write(filepath)
+    return filepath
+
+
+def test_takePrefetchedData(tmp_path):
+    filepath = _writeJointData(os.path.join(tmp_path, "joints.json"), "joint1")
+
+    prefetcher = prefetch.DataPrefetcher()
+    prefetcher.prefetch(filepath, dataType="JointData")
+
+    dataObj = prefetcher.take(filepath, dataType="JointData")
+    assert dataObj.getKeys() == ["joint1"]
+
+    # data can only be taken once
+    assert prefetcher.take(filepath) is None
+
+
+def test_prefetchDirectory(tmp_path):
+    _writeJointData(os.path.join(tmp_path, "a.json"), "a")
+    _writeJointData(os.path.join(tmp_path, "b.json"), "b")
+
+    prefetcher = prefetch.DataPrefetcher()
+    assert len(prefetcher.prefetch(str(tmp_path), dataType="JointData")) == 2
+    assert len(prefetcher.prefetch(str(tmp_path), dataType="JointData")) == 0
+
+
+def test_modifiedFileIsRead(tmp_path):
+    filepath = _writeJointData(os.path.join(tmp_path, "joints.json"), "joint1")
+
+    prefetcher = prefetch.DataPrefetcher()
+    prefetcher.prefetch(filepath, dataType="JointData")
+    _writeJointData(filepath, "joint2")
+
+    dataObj = prefetch.readData(filepath, "JointData", prefetcher=prefetcher)
+    assert dataObj.getKeys() == ["joint2"]
+
+
+def test_writeDataInBackground(tmp_path):
+    directory = os.path.join(tmp_path, "joints")
+
+    with prefetch.DataWriter(maxWorkers=2) as dataWriter:
+        for name in ["a", "b", "c"]:
+            dataObj = jointData.JointData()
+            dataObj.setData({name: {"translate": [0, 1, 0]}})
+            dataWriter.write(dataObj, os.path.join(directory, f"{name}.rigdata"))
+
+    assert sorted(os.listdir(directory)) == ["a.rigdata", "b.rigdata", "c.rigdata"]
+    assert prefetch.readData(os.path.join(directory, "b.rigdata")).getKeys() == ["b"]
+
+
+def test_writesOverlap(tmp_path):
+    # each write waits for the other write and the main thread. This only passes if they all run at the same time
+    barrier = threading.Barrier(3, timeout=5)
+
+    class _BlockingData(jointData.JointData):
+        def write(self, filepath, createDirectory=True, fileFormat=None):
+            barrier.wait()
+            super(_BlockingData, self).write(filepath, createDirectory=createDirectory, fileFormat=fileFormat)
+
+    with prefetch.DataWriter(maxWorkers=2) as dataWriter:
+        for name in ["a", "b"]:
+            dataObj = _BlockingData()
+            dataObj.setData({name: {"translate": [0, 1, 0]}})
+            dataWriter.write(dataObj, os.path.join(tmp_path, f"{name}.rigdata"))
+        barrier.wait()
+
+    assert sorted(os.listdir(tmp_path)) == ["a.rigdata", "b.rigdata"]
+
+
+def test_loadDeformerChecksTypeBeforeReading(tmp_path, monkeypatch):
+    filepath = _writeJointData(os.path.join(tmp_path, "joints.json"), "joint1")
+
+    def _readData(*args, **kwargs):
+        raise AssertionError("The data should not be read before its type is checked")
+
+    monkeypatch.setattr(prefetch, "readData", _readData)
+    with pytest.raises(ValueError):
+        dataIO.loadDeformer(filepath)
+
+
+def test_dataObjectsAreCreatedOnTheMainThread(tmp_path, monkeypatch):
+    filepath = _writeJointData(os.path.join(tmp_path, "joints.json"), "joint1")
+
+    # data objects can call maya when they are created, so workers must only decode the file
+    createdThreads = list()
+    originalInit = jointData.JointData.__init__
+
+    def _init(self, *args, **kwargs):
+        createdThreads.append(threading.current_thread())
+        originalInit(self, *args, **kwargs)
+
+    monkeypatch.setattr(jointData.JointData, "__init__", _init)
+
+    prefetcher = prefetch.DataPrefetcher()
+    prefetcher.prefetch(filepath)
+    dataObj = prefetcher.take(filepath, dataType="JointData")
+
+    assert dataObj.getKeys() == ["joint1"]
+    assert createdThreads == [threading.main_thread()]
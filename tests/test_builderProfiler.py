@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_builderProfiler.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import json
+import pathlib
+
+import maya.cmds as cmds
+
+from rigamajig2.maya.builder import profiler
+
+
+def test_stageCounts():
+    cmds.file(newFile=True, force=True)
+
+    buildProfiler = profiler.BuildProfiler("test")
+    with buildProfiler:
+        with buildProfiler.stage("outer"):
+            cmds.createNode("transform", name="outer")
+            with buildProfiler.stage("inner", category=profiler.COMPONENT):
+                cmds.createNode("transform", name="inner1")
+                cmds.createNode("transform", name="inner2")
+
+    outerStage, innerStage = buildProfiler.getStages()
+    assert innerStage["parent"] == "outer"
+    assert innerStage["nodes"] == 2 and outerStage["nodes"] == 3
+    assert innerStage["commands"] == 2 and outerStage["commands"] == 3
+    assert outerStage["duration"] >= innerStage["duration"]
+
+
+def test_commandHooksRemoved():
+    originalCommand = cmds.createNode
+
+    buildProfiler = profiler.BuildProfiler("test")
+    with buildProfiler:
+        assert cmds.createNode is not originalCommand
+
+    assert cmds.createNode is originalCommand
+
+
+def test_writeProfile(tmp_path):
+    buildProfiler = profiler.BuildProfiler("test")
+    with buildProfiler:
+        with buildProfiler.stage("stage"):
+            cmds.ls()
+
+    reportPath, tracePath = buildProfiler.write(str(tmp_path), fileName="test")
+
+    report = json.loads(pathlib.Path(reportPath).read_text())
+    trace = json.loads(pathlib.Path(tracePath).read_text())
+    assert report["commands"]["ls"] == 1
+    assert trace["traceEvents"][0]["name"] == "stage"
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_componentManager.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import pathlib
+
+from rigamajig2.maya.builder import componentManager
+from rigamajig2.maya.components import base
+
+
+def test_componentTypes(tmp_path):
+    registry = componentManager.ComponentRegistry(indexFile=str(pathlib.Path(tmp_path) / "index.json"))
+    componentTypes = registry.getComponentTypes()
+
+    assert "arm.arm" in componentTypes and "main.main" in componentTypes
+    assert pathlib.Path(registry.indexFile).is_file()
+
+
+def test_componentClassIsCached(tmp_path):
+    registry = componentManager.ComponentRegistry(indexFile=str(pathlib.Path(tmp_path) / "index.json"))
+
+    componentClass = registry.getComponentClass("arm.arm")
+    assert issubclass(componentClass, base.BaseComponent)
+    assert registry.getComponentClass("arm.Arm") is componentClass
+
+
+def test_indexSkipsImports(tmp_path):
+    indexFile = str(pathlib.Path(tmp_path) / "index.json")
+    componentManager.ComponentRegistry(indexFile=indexFile).refresh()
+
+    # a new registry with an up-to-date index should not import any modules
+    registry = componentManager.ComponentRegistry(indexFile=indexFile)
+    registry.refresh()
+    assert not registry._moduleCache
+
+
+def test_invalidComponentType():
+    try:
+        componentManager.createComponentClassInstance("notA.component")
+    except ValueError:
+        return
+    assert False, "An invalid component type should raise a ValueError"
+
+
+def test_componentSourceFiles():
+    sourceFiles = componentManager.getComponentSourceFiles()
+
+    assert any(pathlib.Path(sourceFile).name == "base.py" for sourceFile in sourceFiles)
+    assert all(pathlib.Path(sourceFile).is_relative_to(componentManager.COMPONENTS_PATH) for sourceFile in sourceFiles)
+
+
+def test_componentTypesFindNewModules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    componentsPath = pathlib.Path(tmp_path) / "components"
+    componentsPath.mkdir()
+    registry = componentManager.ComponentRegistry(path=str(componentsPath), indexFile=str(tmp_path / "index.json"))
+    assert registry.getComponentTypes() == []
+
+    # modules added after the index was built are found
+    moduleFile = componentsPath / "widget.py"
+    moduleFile.write_text(
+        "from rigamajig2.maya.components import base\n\n\nclass Widget(base.BaseComponent):\n    pass\n"
+    )
+    assert registry.getComponentTypes() == ["components.widget"]
+
+    # removed modules are dropped
+    moduleFile.unlink()
+    assert registry.getComponentTypes() == []
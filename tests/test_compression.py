@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_compression.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import numpy as np
+
+from rigamajig2.shared import compression
+
+
+def test_quantizeWithinMaxError():
+    rng = np.random.default_rng(0)
+    values = (rng.random((1000, 3)) * [2.0, 0.1, 0.0] - 1.0).astype(np.float32)
+
+    for maxError in [0.1, 0.001, 0.00001]:
+        quantized = compression.quantize(values, maxError)
+        assert quantized["values"].shape == (1000, 3)
+        assert compression.getVectorError(values, compression.dequantize(quantized)).max() <= maxError
+
+    assert compression.quantize(values, 0.1)["values"].dtype == np.uint8
+    assert compression.quantize(values, 0.001)["values"].dtype == np.uint16
+    assert len(compression.dequantize(compression.quantize(np.zeros((0, 3)), 0.1))) == 0
+
+
+def test_fitBasisWithinMaxError():
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(3, 200 * 3))
+    values = (rng.normal(size=(40, 3)) @ basis).reshape(40, 200, 3)
+
+    coefficients, fitBasis = compression.fitBasis(values, 0.001)
+    assert coefficients.shape == (40, 3) and fitBasis.shape == (3, 600)
+    approximation = (coefficients @ fitBasis).reshape(values.shape)
+    assert compression.getVectorError(values, approximation).max() <= 0.001
+
+    # vectors outside the mask are not checked against the max error
+    mask = np.ones((40, 200), dtype=bool)
+    values[0, 0] = [100.0, 0.0, 0.0]
+    mask[0, 0] = False
+    coefficients, fitBasis = compression.fitBasis(values, 0.001, mask=mask)
+    approximation = (coefficients @ fitBasis).reshape(values.shape)
+    assert compression.getVectorError(values, approximation)[mask].max() <= 0.001
+
+
+def test_quantizeLargeExtentsWithinMaxError():
+    rng = np.random.default_rng(0)
+
+    # float32 rounding of the rebuilt values is close to the max error for large extents
+    for extent, maxError in [(5.0, 1e-5), (10.0, 1e-5), (20.0, 1e-4), (2.0, 1e-6)]:
+        values = ((rng.random((5000, 3)) * 2.0 - 1.0) * extent).astype(np.float32)
+        quantized = compression.quantize(values, maxError)
+        assert quantized["minimum"].dtype == np.float64
+        assert compression.getVectorError(values, compression.dequantize(quantized)).max() <= maxError
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_dataManager.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import pytest
+
+from rigamajig2.maya.builder import dataManager
+from rigamajig2.maya.data import abstractData
+
+
+def test_createDataClassInstance():
+    dataObj = dataManager.createDataClassInstance("SkinData")
+    assert dataObj.__class__.__name__ == "SkinData"
+
+
+def test_invalidDataType():
+    with pytest.raises(ValueError):
+        dataManager.createDataClassInstance("NotAData")
+
+
+def test_registerCustomDataType():
+    class StudioData(abstractData.AbstractData):
+        pass
+
+    dataManager.registerDataType(StudioData)
+    assert "StudioData" in dataManager.getDataTypes()
+    assert isinstance(dataManager.createDataClassInstance("StudioData"), StudioData)
+
+
+def test_registerInvalidDataType():
+    with pytest.raises(TypeError):
+        dataManager.registerDataType(object)
+
+
+def test_customDataTypeReplacesBuiltin():
+    class StudioSkinData(abstractData.AbstractData):
+        pass
+
+    # the built-in data types are registered first so they never replace a custom data type
+    registry = dataManager.DataRegistry()
+    registry.registerDataType(StudioSkinData, "SkinData")
+    assert registry.getDataClass("SkinData") is StudioSkinData
+    assert "JointData" in registry.getDataTypes()
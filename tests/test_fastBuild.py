@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_fastBuild.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import maya.cmds as cmds
+import pytest
+
+from rigamajig2.maya.builder import fastBuild
+
+
+def test_restoreSettings():
+    cmds.undoInfo(stateWithoutFlush=True)
+    evaluationMode = cmds.evaluationManager(query=True, mode=True)[0]
+
+    with fastBuild.FastBuild():
+        assert not cmds.undoInfo(query=True, state=True)
+        assert cmds.evaluationManager(query=True, mode=True)[0] == "off"
+
+    assert cmds.undoInfo(query=True, state=True)
+    assert cmds.evaluationManager(query=True, mode=True)[0] == evaluationMode
+
+
+def test_restoreSettingsOnError():
+    cmds.undoInfo(stateWithoutFlush=True)
+
+    with pytest.raises(RuntimeError):
+        with fastBuild.FastBuild():
+            raise RuntimeError("build failed")
+
+    assert cmds.undoInfo(query=True, state=True)
+
+
+def test_invalidRefreshPolicy():
+    with pytest.raises(ValueError):
+        fastBuild.FastBuild(refreshPolicy="sometimes")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_meshnav.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import maya.api.OpenMaya as om2
+import maya.cmds as cmds
+import numpy as np
+import pytest
+
+from rigamajig2.maya import mesh
+from rigamajig2.maya import meshnav
+from rigamajig2.shared.common import getFirst
+
+POINTS = [[0.1, 2.0, 0.2], [-0.9, 0.5, 0.95], [3.0, 1.0, 0.0]]
+
+
+@pytest.fixture()
+def plane():
+    cmds.file(newFile=True, force=True)
+    meshnav.clearMeshQueryCache()
+    plane = getFirst(cmds.polyPlane(width=2, height=2, subdivisionsX=4, subdivisionsY=4, constructionHistory=False))
+    cmds.xform(plane, translation=[0, 1, 0])
+    return plane
+
+
+def test_meshQuery(plane):
+    meshQuery = meshnav.MeshQuery(plane)
+    meshPoints = mesh.getPointsArray(plane, world=True)
+
+    vertexIds, distances = meshQuery.closestVertices(POINTS)
+    expectedDistances = np.linalg.norm(meshPoints[None, :, :] - np.array(POINTS)[:, None, :], axis=2)
+    assert vertexIds.tolist() == np.argmin(expectedDistances, axis=1).tolist()
+    assert np.allclose(distances, expectedDistances.min(axis=1))
+
+    closestPoints, faceIds = meshQuery.closestFacePoints(POINTS)
+    assert np.allclose(closestPoints, [[0.1, 1.0, 0.2], [-0.9, 1.0, 0.95], [1.0, 1.0, 0.0]])
+
+    triangleVertices, barycentric = meshQuery.closestBarycentric(POINTS)
+    assert np.allclose(barycentric.sum(axis=1), 1.0)
+    assert np.allclose(np.einsum("ij,ijk->ik", barycentric, meshPoints[triangleVertices]), closestPoints)
+
+    meshFn = mesh.getMeshFn(plane)
+    uvs = meshQuery.closestUVs(POINTS)
+    for point, uv, faceId in zip(closestPoints, uvs, faceIds):
+        expectedUv = meshFn.getUVAtPoint(om2.MPoint(point.tolist()), om2.MSpace.kWorld)
+        assert np.allclose(uv, expectedUv[:2], atol=1e-5)
+        assert faceId == expectedUv[2]
+
+
+def test_meshQueryUpdates(plane):
+    meshQuery = meshnav.MeshQuery(plane)
+    assert not meshQuery.isDirty()
+    assert not meshQuery.update()
+
+    topologyHash = meshQuery.topologyHash
+    cmds.xform(plane, translation=[0, 2, 0])
+    assert meshQuery.isDirty()
+    closestPoints, _ = meshQuery.closestFacePoints(POINTS)
+    assert np.allclose(closestPoints[:, 1], 2.0)
+    assert meshQuery.topologyHash == topologyHash
+
+    cmds.delete(f"{plane}.f[0]")
+    assert meshQuery.update()
+    assert meshQuery.topologyHash != topologyHash
+
+
+def test_singlePointQueries(plane):
+    meshPoints = mesh.getPointsArray(plane, world=True)
+    point = [1.1, 1.0, 1.1]
+    vertexId = np.argmin(np.linalg.norm(meshPoints - point, axis=1))
+    assert meshnav.getClosestVertex(plane, point) == f"{plane}.vtx[{vertexId}]"
+
+    faceId = mesh.getMeshFn(plane).getClosestPoint(om2.MPoint(point), om2.MSpace.kWorld)[1]
+    assert meshnav.getClosestFace(plane, point) == f"{plane}.f[{faceId}]"
+    assert meshnav.getMeshQuery(plane) is meshnav.getMeshQuery(plane)
+
+
+def test_meshQueryCacheRenamedMesh(plane):
+    meshQuery = meshnav.getMeshQuery(plane)
+
+    # a new mesh takes the name of the cached mesh
+    cmds.rename(plane, "oldPlane")
+    newPlane = getFirst(cmds.polyPlane(name=plane, constructionHistory=False))
+    assert newPlane == plane
+
+    newMeshQuery = meshnav.getMeshQuery(plane)
+    assert newMeshQuery is not meshQuery
+    assert newMeshQuery.meshFn.numVertices == cmds.polyEvaluate(newPlane, vertex=True)
+
+
+def test_closestVertexStaysOnClosestFace():
+    cmds.file(newFile=True, force=True)
+    meshnav.clearMeshQueryCache()
+
+    # a large face just above a small one. The point is closest to the large face but to a vertex of the small one.
+    upper = getFirst(cmds.polyPlane(width=2, height=2, subdivisionsX=1, subdivisionsY=1, constructionHistory=False))
+    cmds.xform(upper, translation=[0, 0.1, 0])
+    lower = getFirst(cmds.polyPlane(width=0.2, height=0.2, subdivisionsX=1, subdivisionsY=1, constructionHistory=False))
+    combined = getFirst(cmds.polyUnite(upper, lower, constructionHistory=False))
+    point = [0.1, 0.09, 0.1]
+
+    meshPoints = mesh.getPointsArray(combined, world=True)
+    vertexIds, _ = meshnav.getMeshQuery(combined).closestFaceVertices([point])
+    assert np.isclose(meshPoints[vertexIds[0]][1], 0.1)
+    assert meshnav.getClosestVertex(combined, point) == f"{combined}.vtx[{vertexIds[0]}]"
+
+
+def test_meshQueryCacheSize(plane, monkeypatch):
+    monkeypatch.setattr(meshnav, "MESH_QUERY_CACHE_SIZE", 2)
+    planes = [plane] + [getFirst(cmds.polyPlane(constructionHistory=False)) for _ in range(2)]
+    for meshName in planes:
+        meshnav.getMeshQuery(meshName)
+    assert list(meshnav._meshQueryCache.keys()) == planes[1:]
+
+    cmds.file(newFile=True, force=True)
+    assert not meshnav._meshQueryCache
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_rigFile.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+from rigamajig2.maya.builder import constants
+from rigamajig2.maya.builder import core
+
+
+def test_inheritanceChain(tmp_path):
+    rigFile = core.newRigEnvironmentFromArchetype(str(tmp_path), "biped", "tempRig")
+    chain = core.RigFile.get(rigFile).getInheritanceChain()
+
+    assert [level for level, _ in chain] == [0, 1, 2]
+    assert chain[1][1].filepath == core.RigFile.get(core.getArchetypeRigFile("biped")).filepath
+
+
+def test_invalidateOnWrite(tmp_path):
+    rigFile = core.newRigEnvironmentFromArchetype(str(tmp_path), "biped", "tempRig")
+    rigFileModel = core.RigFile.get(rigFile)
+
+    data = rigFileModel.getData()
+    data[constants.RIG_NAME] = "newName"
+    rigFileModel.write(data)
+
+    assert core.getRigData(rigFile, constants.RIG_NAME) == "newName"
+    assert not rigFileModel.isStale()
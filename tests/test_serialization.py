@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_serialization.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from rigamajig2.shared import serialization
+
+HEADER = OrderedDict(user="tester", type="SkinData", time="2026-10-01 00:00:00")
+
+
+def _getTestData():
+    return OrderedDict(
+        body=OrderedDict(
+            weights={"joint1": {"0": 1.0, "1": 0.5}},
+            points=np.arange(12, dtype=np.float32).reshape(4, 3),
+        ),
+        arm=OrderedDict(indices=np.array([1, 5, 9], dtype=np.int32), name="arm"),
+    )
+
+
+def test_binaryRoundTrip(tmp_path):
+    filepath = os.path.join(tmp_path, "test.rigdata")
+    serialization.write(filepath, HEADER, _getTestData(), fileFormat=serialization.BINARY)
+
+    header, data = serialization.read(filepath)
+    assert header["type"] == "SkinData"
+    assert header["user"] == "tester"
+    assert list(data.keys()) == ["body", "arm"]
+    assert data["body"]["weights"] == {"joint1": {"0": 1.0, "1": 0.5}}
+    assert data["body"]["points"].dtype == np.float32
+    assert np.array_equal(data["body"]["points"], _getTestData()["body"]["points"])
+    assert np.array_equal(data["arm"]["indices"], [1, 5, 9])
+
+
+def test_jsonStoresArraysAsLists(tmp_path):
+    filepath = os.path.join(tmp_path, "test.json")
+    serialization.write(filepath, HEADER, _getTestData(), fileFormat=serialization.JSON)
+
+    header, data = serialization.read(filepath)
+    assert header["type"] == "SkinData"
+    assert data["arm"]["indices"] == [1, 5, 9]
+
+
+def test_detectFormat(tmp_path):
+    # the format is detected from the contents, not the extension
+    binaryPath = os.path.join(tmp_path, "binary.json")
+    serialization.write(binaryPath, HEADER, _getTestData(), fileFormat=serialization.BINARY)
+    jsonPath = os.path.join(tmp_path, "json.rigdata")
+    serialization.write(jsonPath, HEADER, _getTestData(), fileFormat=serialization.JSON)
+
+    assert serialization.detectFormat(binaryPath) == serialization.BINARY
+    assert serialization.detectFormat(jsonPath) == serialization.JSON
+
+
+def test_formatFromExtension():
+    assert serialization.getFormatFromExtension("a/b.json") == serialization.JSON
+    assert serialization.getFormatFromExtension("a/b.rigdata") == serialization.BINARY
+    assert serialization.getFormatFromExtension("a/b.txt") is None
+    assert serialization.getFileExtension(serialization.BINARY) == ".rigdata"
+
+
+def test_abstractDataFormats(tmp_path):
+    from rigamajig2.maya.data import abstractData
+
+    dataObj = abstractData.AbstractData()
+    dataObj.setData(OrderedDict(node1={"value": 1}))
+
+    binaryPath = os.path.join(tmp_path, "data.rigdata")
+    dataObj.write(binaryPath)
+    assert serialization.detectFormat(binaryPath) == serialization.BINARY
+
+    readObj = abstractData.AbstractData()
+    readObj.read(binaryPath)
+    assert readObj.getData() == dataObj.getData()
+    assert abstractData.AbstractData.getDataType(binaryPath) == "AbstractData"
+
+
+def test_readHeader(tmp_path):
+    for fileFormat in [serialization.JSON, serialization.BINARY]:
+        filepath = os.path.join(tmp_path, f"header_{fileFormat}")
+        serialization.write(filepath, HEADER, _getTestData(), fileFormat=fileFormat)
+
+        header = serialization.readHeader(filepath)
+        assert header["type"] == "SkinData"
+        assert header["time"] == HEADER["time"]
+        assert "data" not in header
+
+
+def test_readKeys(tmp_path):
+    for fileFormat in [serialization.JSON, serialization.BINARY]:
+        filepath = os.path.join(tmp_path, f"keys_{fileFormat}")
+        serialization.write(filepath, HEADER, _getTestData(), fileFormat=fileFormat)
+
+        assert serialization.readKeys(filepath) == ["body", "arm"]
+
+
+def test_readSelectedKeys(tmp_path):
+    filepath = os.path.join(tmp_path, "test.rigdata")
+    serialization.write(filepath, HEADER, _getTestData(), fileFormat=serialization.BINARY)
+
+    _, data = serialization.read(filepath, keys=["arm", "missing"])
+    assert list(data.keys()) == ["arm"]
+    assert np.array_equal(data["arm"]["indices"], [1, 5, 9])
+
+
+def test_readLazyArrays(tmp_path):
+    filepath = os.path.join(tmp_path, "test.rigdata")
+    serialization.write(filepath, HEADER, _getTestData(), fileFormat=serialization.BINARY)
+
+    _, data = serialization.read(filepath, lazyArrays=True)
+    points = data["body"]["points"]
+    assert isinstance(points, serialization.LazyArray)
+    assert points.shape == (4, 3) and len(points) == 4
+    assert np.array_equal(np.asarray(points), np.arange(12, dtype=np.float32).reshape(4, 3))
+    assert data["body"]["weights"] == {"joint1": {"0": 1.0, "1": 0.5}}
+
+    # lazy arrays are written with their values
+    copyPath = os.path.join(tmp_path, "copy.rigdata")
+    serialization.write(copyPath, HEADER, data, fileFormat=serialization.BINARY)
+    _, copyData = serialization.read(copyPath)
+    assert np.array_equal(copyData["arm"]["indices"], [1, 5, 9])
+
+    # arrays can not be read once the file changes
+    serialization.write(filepath, HEADER, OrderedDict(arm=data["arm"]["name"]), fileFormat=serialization.BINARY)
+    try:
+        points.load()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Reading a lazy array from a modified file should fail")
@@ -11,11 +11,14 @@
 import pathlib
 
 import maya.cmds as cmds
+import numpy as np
 import pytest
 
 from rigamajig2.maya import skinCluster
+from rigamajig2.maya.builder import dataIO
 from rigamajig2.maya.data import skinData
 from rigamajig2.shared import pytestUtils
+from rigamajig2.shared import serialization
 from rigamajig2.shared.common import getFirst
 
 
@@ -72,6 +75,261 @@ def test_weightGetAndSetIdentical(setupScene):
     assert sourceWeights == otherWeights
 
 
+def test_weightArrayGetAndSetIdentical(setupScene):
+    sphere, joint1, joint2, skin = setupScene
+    sourceWeights, sourceInfluences = skinCluster.getWeightsArray(sphere)
+    otherSphere = getFirst(cmds.polySphere(constructionHistory=False, name="mySphere"))
+
+    # reverse the influence order of the skin to check the columns are remapped by name
+    otherSkinCluster = skinCluster.createSkinCluster(geometry=otherSphere, influences=[joint2, joint1], maxInfluences=1)
+    skinCluster.setWeightsArray(otherSphere, otherSkinCluster, sourceWeights, sourceInfluences)
+
+    otherWeights, otherInfluences = skinCluster.getWeightsArray(otherSphere)
+    assert otherInfluences == [joint2, joint1]
+    assert np.allclose(otherWeights[:, [1, 0]], sourceWeights)
+
+
+def test_uncompressedWeightsAreNormalized(setupScene):
+    sphere, joint1, joint2, skin = setupScene
+    cmds.setAttr(f"{skin}.normalizeWeights", 0)
+    cmds.skinPercent(skin, f"{sphere}.vtx[0]", transformValue=[(joint1, 0.25), (joint2, 0.25)], normalize=False)
+
+    skinCluster.setWeights(mesh=sphere, skincluster=skin, weightDict=dict(), compressed=False)
+
+    weights, _ = skinCluster.getWeightsArray(sphere)
+    assert np.isclose(weights[0].sum(), 1.0)
+
+
+def test_weightArrayDictConversion():
+    weights = np.array([[1.0, 0.0], [0.25, 0.75], [0.0, 1.0]])
+    weightDict = skinCluster.weightsArrayToDict(weights, ["ns:joint1", "joint2"])
+    assert weightDict == {"joint1": {0: 1.0, 1: 0.25}, "joint2": {1: 0.75, 2: 1.0}}
+
+    stringKeys = {inf: {str(vtx): w for vtx, w in values.items()} for inf, values in weightDict.items()}
+    convertedWeights, influences = skinCluster.weightsDictToArray(stringKeys, vertexCount=3)
+    assert influences == ["joint1", "joint2"]
+    assert np.array_equal(convertedWeights, weights)
+
+
+def test_normalizeWeightsArray():
+    weights = np.array([[2.0, 2.0], [0.0, 0.0], [0.1, 0.3]])
+    normalized = skinCluster.normalizeWeightsArray(weights)
+    assert np.allclose(normalized, [[0.5, 0.5], [0.0, 0.0], [0.25, 0.75]])
+
+
+def test_skinDataSparseWeights():
+    weights = np.array([[1.0, 0.0, 0.0], [0.25, 0.0, 0.75], [0.0, 0.0, 0.0]])
+    encodedWeights = skinData.encodeWeights(weights, ["joint1", "joint2", "joint3"])
+
+    assert encodedWeights["offsets"].tolist() == [0, 1, 3, 3]
+    assert encodedWeights["indices"].tolist() == [0, 0, 2]
+    assert encodedWeights["values"].dtype == np.float32
+
+    decodedWeights, influences = skinData.decodeWeights(encodedWeights)
+    assert influences == ["joint1", "joint2", "joint3"]
+    assert np.allclose(decodedWeights, weights)
+
+
+def test_skinDataReadsDictWeights(tmp_path):
+    dataPath = pytestUtils.getTempFilePath(tmp_path, "test_legacySkinData.json")
+
+    data = skinData.SkinData()
+    data.setData({"mySphere": {"vertexCount": 3, "weights": {"joint1": {0: 1.0, 1: 0.5}, "joint2": {1: 0.5}}}})
+    data.write(dataPath)
+
+    data = skinData.SkinData()
+    data.read(dataPath)
+    weights, influences = data.getWeightsArray("mySphere")
+
+    assert influences == ["joint1", "joint2"]
+    assert np.allclose(weights, [[1.0, 0.0], [0.5, 0.5], [0.0, 0.0]])
+
+
+def test_skinDataQuantizedWeights():
+    weights = np.array([[1.0 / 3.0, 2.0 / 3.0, 0.0], [0.1, 0.2, 0.7], [0.0, 0.0, 0.0]])
+    encodedWeights = skinData.encodeWeights(weights, ["joint1", "joint2", "joint3"], maxError=1e-4)
+    assert encodedWeights["values"].dtype == np.uint16
+
+    decodedWeights, _ = skinData.decodeWeights(encodedWeights)
+    assert np.abs(decodedWeights - weights).max() <= 1e-4
+    assert np.allclose(decodedWeights.sum(axis=1), [1.0, 1.0, 0.0], rtol=0, atol=1e-12)
+
+
+def test_verifySkinData(setupScene):
+    sphere, joint1, joint2, skin = setupScene
+
+    data = skinData.SkinData(maxError=1e-3)
+    data.gatherData(sphere)
+    report = data.verifyWeights()
+
+    assert 0.0 <= report[sphere]["meanDeviation"] <= report[sphere]["maxDeviation"] <= 1e-3
+
+
+def test_projectSkinWeights(setupScene):
+    sphere, joint1, joint2, skin = setupScene
+    sourceWeights, _ = skinCluster.getWeightsArray(sphere)
+
+    otherSphere = getFirst(
+        cmds.polySphere(constructionHistory=False, name="myOtherSphere", subdivisionsX=16, subdivisionsY=16)
+    )
+    report = skinCluster.projectSkinWeights(sphere, otherSphere)
+
+    otherWeights, otherInfluences = skinCluster.getWeightsArray(otherSphere)
+    assert otherInfluences == [joint1, joint2]
+    assert np.allclose(otherWeights.sum(axis=1), 1.0)
+    assert report[otherSphere]["maxDistance"] < 0.1
+
+    # projecting onto an identical mesh reproduces the source weights
+    identicalSphere = getFirst(cmds.polySphere(constructionHistory=False, name="myIdenticalSphere"))
+    skinCluster.projectSkinWeights(sphere, identicalSphere)
+    identicalWeights, _ = skinCluster.getWeightsArray(identicalSphere)
+    assert np.allclose(identicalWeights, sourceWeights, atol=1e-6)
+
+
+def test_projectMixedTriangleSizes():
+    # one large triangle and a cluster of small triangles. The small triangles have the closest centroids
+    # to the query point but the large triangle is closest to it.
+    points = [[-100.0, 0.0, 0.0], [100.0, 0.0, 0.0], [0.0, 0.0, 100.0]]
+    triangles = [[0, 1, 2]]
+    for i in range(16):
+        corner = np.array([i * 0.1, 5.0, 0.0])
+        triangles.append([len(points), len(points) + 1, len(points) + 2])
+        points += [corner, corner + [0.05, 0.0, 0.0], corner + [0.0, 0.0, 0.05]]
+
+    weights = np.zeros((len(points), 2))
+    weights[:3, 0] = 1.0
+    weights[3:, 1] = 1.0
+
+    projection = skinCluster.SkinProjection(points, triangles, weights, ["large", "small"], candidateCount=8)
+    projectedWeights, distances = projection.project([[0.0, 1.0, 1.0]])
+
+    assert np.allclose(projectedWeights, [[1.0, 0.0]])
+    assert np.isclose(distances[0], 1.0)
+
+
+def test_projectInChunks(monkeypatch):
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(300, 3)) * rng.uniform(0.01, 5.0, size=(300, 1))
+    triangles = np.arange(300).reshape(-1, 3)
+    weights = rng.uniform(size=(300, 2))
+    targetPoints = rng.normal(size=(200, 3)) * 3.0
+
+    projection = skinCluster.SkinProjection(points, triangles, weights, ["a", "b"], candidateCount=4)
+    expectedWeights, expectedDistances = projection.project(targetPoints)
+
+    # a small chunk size tests a few points at a time and gives the same result
+    monkeypatch.setattr(skinCluster, "PROJECTION_CHUNK_SIZE", 16)
+    projectedWeights, distances = projection.project(targetPoints)
+    assert np.allclose(projectedWeights, expectedWeights)
+    assert np.allclose(distances, expectedDistances)
+
+    # every triangle is tested when the candidate count covers the whole mesh
+    _, bruteForceDistances = skinCluster.SkinProjection(points, triangles, weights, ["a", "b"], 100).project(
+        targetPoints
+    )
+    assert np.allclose(distances, bruteForceDistances)
+
+
+def test_smoothWeights(setupScene):
+    sphere, joint1, joint2, skin = setupScene
+    sourceWeights, _ = skinCluster.getWeightsArray(sphere)
+
+    cmds.setAttr("{}.liw".format(joint2), True)
+    skinCluster.smoothWeights(sphere, intensity=0.5, iterations=10)
+    smoothedWeights, _ = skinCluster.getWeightsArray(sphere)
+
+    # the locked influence keeps its weights and the weights stay normalized
+    assert np.allclose(smoothedWeights[:, 1], sourceWeights[:, 1], atol=1e-6)
+    assert np.allclose(smoothedWeights.sum(axis=1), 1.0)
+
+
+def test_cleanupWeightsArray():
+    weights = np.array([[0.5, 0.3, 0.15, 0.05], [0.0005, 0.9995, 0.0, 0.0], [0.25, 0.25, 0.25, 0.25]])
+    cleanedWeights, changedVertices = skinCluster.cleanupWeightsArray(weights, maxInfluences=2, pruneThreshold=0.001)
+
+    assert changedVertices == 3
+    assert ((cleanedWeights > 0).sum(axis=1) <= 2).all()
+    assert np.allclose(cleanedWeights.sum(axis=1), 1.0)
+    assert np.allclose(cleanedWeights[0], [0.625, 0.375, 0.0, 0.0])
+    assert np.allclose(cleanedWeights[1], [0.0, 1.0, 0.0, 0.0])
+
+    # a vertex never loses all of its weights
+    cleanedWeights, _ = skinCluster.cleanupWeightsArray(np.array([[0.0005, 0.0002]]), pruneThreshold=0.001)
+    assert np.allclose(cleanedWeights, [[1.0, 0.0]])
+
+
+def test_cleanupWeights(setupScene):
+    sphere, joint1, joint2, skin = setupScene
+    joint3 = cmds.createNode("joint", name="joint3")
+    cmds.skinCluster(skin, edit=True, addInfluence=joint3, weight=0.0)
+
+    report = skinCluster.cleanupWeights(sphere, maxInfluences=1)
+    weights, influences = skinCluster.getWeightsArray(sphere)
+
+    assert report["removedInfluences"] == [joint3]
+    assert influences == [joint1, joint2]
+    assert ((weights > 0).sum(axis=1) == 1).all()
+    assert cmds.getAttr("{}.maxInfluences".format(skin)) == 1
+
+
+def test_skinManifest(setupScene, tmp_path):
+    sphere, joint1, joint2, skin = setupScene
+    skinFile = str(tmp_path / "mySphere.rigdata")
+
+    data = skinData.SkinData()
+    data.gatherData(sphere)
+    nodeHash = data.getHash(sphere)
+
+    manifest = skinData.SkinManifest.read(str(tmp_path))
+    assert manifest.needsWrite(sphere, skinFile, nodeHash)
+    data.write(skinFile)
+    manifest.update(sphere, skinFile, nodeHash)
+    manifest.write()
+
+    # the tracked manifest only stores content hashes
+    manifestFile = tmp_path / skinData.MANIFEST_FILE
+    assert "stamp" not in manifestFile.read_text()
+
+    # unchanged weights do not need to be written again and do not change the manifest
+    manifestText = manifestFile.read_text()
+    manifest = skinData.SkinManifest.read(str(tmp_path))
+    assert not manifest.needsWrite(sphere, skinFile, nodeHash)
+    assert manifest.getFile(sphere) == skinFile
+    manifest.update(sphere, skinFile, nodeHash)
+    manifest.write()
+    assert manifestFile.read_text() == manifestText
+
+    # changed weights and a different file format both need to be written
+    assert manifest.needsWrite(sphere, str(tmp_path / "mySphere.json"), nodeHash)
+    cmds.skinPercent(skin, "{}.vtx[100]".format(sphere), transformValue=[(joint1, 0.37), (joint2, 0.63)])
+    data = skinData.SkinData()
+    data.gatherData(sphere)
+    assert manifest.needsWrite(sphere, skinFile, data.getHash(sphere))
+
+
+def test_saveSkinWeightsKeepsFileFormat(setupScene, tmp_path):
+    sphere, joint1, joint2, skin = setupScene
+    cmds.select(sphere)
+
+    dataIO.saveSkinWeights(str(tmp_path), fileFormat=serialization.JSON)
+    cmds.skinPercent(skin, "{}.vtx[100]".format(sphere), transformValue=[(joint1, 0.37), (joint2, 0.63)])
+    dataIO.saveSkinWeights(str(tmp_path))
+
+    assert (tmp_path / "mySphere.json").is_file()
+    assert not (tmp_path / "mySphere.rigdata").exists()
+
+
+def test_saveSkinWeightsConvertsFileFormat(setupScene, tmp_path):
+    sphere, joint1, joint2, skin = setupScene
+    cmds.select(sphere)
+
+    dataIO.saveSkinWeights(str(tmp_path), fileFormat=serialization.JSON)
+    dataIO.saveSkinWeights(str(tmp_path), fileFormat=serialization.BINARY)
+
+    assert (tmp_path / "mySphere.rigdata").is_file()
+    assert not (tmp_path / "mySphere.json").exists()
+
+
 def test_importSkinData(setupScene, dataPath):
     test_exportSkinWeights(setupScene, dataPath)
 
@@ -89,6 +347,32 @@ def test_importSkinData(setupScene, dataPath):
     assert cmds.objExists(skinNode) and bool(skinCluster.getInfluenceJoints(skinNode))
 
 
+def test_importSkinDataChangedVertexCount(setupScene, dataPath):
+    test_exportSkinWeights(setupScene, dataPath)
+
+    cmds.file(newFile=True, force=True)
+
+    sphere = getFirst(
+        cmds.polySphere(constructionHistory=False, name="mySphere", subdivisionsX=16, subdivisionsY=16)
+    )
+    cmds.createNode("joint", name="joint1")
+    cmds.createNode("joint", name="joint2")
+
+    data = skinData.SkinData()
+    data.read(dataPath)
+    data.applyAllData()
+
+    weights, _ = skinCluster.getWeightsArray(sphere)
+    assert len(weights) == cmds.polyEvaluate(sphere, vertex=True)
+
+
+def test_resizeWeights():
+    weights = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]])
+
+    assert skinData.resizeWeights(weights, 2).tolist() == [[1.0, 0.0], [0.5, 0.5]]
+    assert skinData.resizeWeights(weights, 4).tolist() == [[1.0, 0.0], [0.5, 0.5], [0.0, 1.0], [0.0, 0.0]]
+
+
 def test_copyInfluencesAndWeights(setupScene):
     sphere, joint1, joint2, skin = setupScene
 
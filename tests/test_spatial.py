@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_spatial.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import numpy as np
+
+from rigamajig2.shared import spatial
+
+
+def test_queryNearestPoints():
+    points = np.array([[0, 0, 0], [1, 0, 0], [0, 2, 0], [5, 5, 5]], dtype=float)
+    pointIndex = spatial.PointIndex(points)
+
+    distances, indices = pointIndex.query([[0.9, 0, 0], [0, 0, 0.1]], k=2)
+    assert indices.tolist() == [[1, 0], [0, 1]]
+    assert np.allclose(distances[:, 0], [0.1, 0.1])
+
+
+def test_bruteForceMatchesKDTree(monkeypatch):
+    rng = np.random.default_rng(0)
+    points = rng.random((500, 3))
+    queryPoints = rng.random((50, 3))
+    distances, indices = spatial.PointIndex(points).query(queryPoints, k=3)
+
+    monkeypatch.setattr(spatial, "_getKDTreeClass", lambda: None)
+    bruteDistances, bruteIndices = spatial.PointIndex(points).query(queryPoints, k=3)
+
+    assert np.array_equal(indices, bruteIndices)
+    assert np.allclose(distances, bruteDistances)
+
+
+def test_closestPointsOnTriangles():
+    a = np.tile([0.0, 0.0, 0.0], (3, 1))
+    b = np.tile([1.0, 0.0, 0.0], (3, 1))
+    c = np.tile([0.0, 1.0, 0.0], (3, 1))
+
+    # above the face, past the first corner and past the long edge
+    points = np.array([[0.25, 0.25, 1.0], [-1.0, -1.0, 0.0], [1.0, 1.0, 0.0]])
+    closestPoints, barycentric = spatial.closestPointsOnTriangles(points, a, b, c)
+
+    assert np.allclose(closestPoints, [[0.25, 0.25, 0.0], [0.0, 0.0, 0.0], [0.5, 0.5, 0.0]])
+    assert np.allclose(barycentric, [[0.5, 0.25, 0.25], [1.0, 0.0, 0.0], [0.0, 0.5, 0.5]])
+
+
+def test_adjacencyMatrixAverage(monkeypatch):
+    edges = np.array([[0, 1], [1, 2]])
+    values = np.array([[1.0], [2.0], [4.0], [8.0]])
+
+    # vertex 3 has no neighbors so it averages to itself
+    expected = [[2.0], [2.5], [2.0], [8.0]]
+    assert np.allclose(spatial.adjacencyMatrix(edges, 4) @ values, expected)
+
+    monkeypatch.setattr(spatial, "_getSparseMatrixClass", lambda: None)
+    assert np.allclose(spatial.adjacencyMatrix(edges, 4) @ values, expected)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+    project: rigamajig2
+    file: test_weights.py
+    author: masonsmigel
+    date: 10/2026
+    description:
+
+"""
+import maya.cmds as cmds
+import numpy as np
+import pytest
+
+from rigamajig2.maya import deformer
+from rigamajig2.maya import skinCluster
+from rigamajig2.maya import weights
+from rigamajig2.maya.data import deformerData
+from rigamajig2.shared.common import getFirst
+
+
+@pytest.fixture()
+def setupScene():
+    cmds.file(newFile=True, force=True)
+    weights.clearSymmetryCache()
+
+    sphere = getFirst(cmds.polySphere(constructionHistory=False, name="mySphere"))
+    leftJoint = cmds.createNode("joint", name="arm_l")
+    rightJoint = cmds.createNode("joint", name="arm_r")
+    cmds.xform(leftJoint, translation=[1, 0, 0])
+    cmds.xform(rightJoint, translation=[-1, 0, 0])
+
+    skin = skinCluster.createSkinCluster(geometry=sphere, influences=[leftJoint, rightJoint])
+    return sphere, skin
+
+
+def test_symmetryMap():
+    points = np.array([[1.0, 0.0, 0.0], [-1.005, 0.0, 0.0], [0.0, 1.0, 0.0], [3.0, 0.0, 0.0]])
+    symmetryMap = weights.SymmetryMap(points, axis="x", tolerance=0.01)
+
+    assert symmetryMap.mirrorIndices.tolist() == [1, 0, 2, -1]
+    assert symmetryMap.sides.tolist() == [1, -1, 0, 1]
+    assert symmetryMap.unmatched.tolist() == [3]
+
+
+def test_mirrorAndFlipArrays():
+    points = np.array([[1.0, 0.0, 0.0], [-1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+    symmetryMap = weights.SymmetryMap(points)
+    influenceMap = weights.getInfluenceMirrorMap(["arm_l", "arm_r"])
+    vertexWeights = np.array([[0.8, 0.2], [0.5, 0.5], [0.4, 0.6]])
+
+    assert symmetryMap.mirror(vertexWeights, influenceMap).tolist() == [[0.8, 0.2], [0.2, 0.8], [0.4, 0.6]]
+    assert symmetryMap.flip(vertexWeights, influenceMap).tolist() == [[0.5, 0.5], [0.2, 0.8], [0.6, 0.4]]
+
+
+def test_symmetryMapIsCached(setupScene):
+    sphere, skin = setupScene
+    otherSphere = getFirst(cmds.polySphere(constructionHistory=False, name="myOtherSphere"))
+
+    assert weights.getTopologyHash(sphere) == weights.getTopologyHash(otherSphere)
+    assert weights.getSymmetryMap(sphere) is weights.getSymmetryMap(otherSphere)
+
+
+def test_mirrorSkinWeights(setupScene):
+    sphere, skin = setupScene
+    weights.mirrorWeights(skin, geometry=sphere)
+
+    skinWeights, influences = weights.getWeights(skin, geometry=sphere)
+    symmetryMap = weights.getSymmetryMap(sphere)
+    matched = symmetryMap.mirrorIndices >= 0
+
+    # the left weight of each vertex matches the right weight of its mirrored vertex
+    assert np.allclose(skinWeights[matched, 0], skinWeights[symmetryMap.mirrorIndices[matched], 1])
+
+
+def test_deformerWeightsArray(setupScene):
+    sphere, skin = setupScene
+    cluster, clusterHandle = cmds.cluster(sphere)
+
+    pointCount = cmds.polyEvaluate(sphere, vertex=True)
+    clusterWeights = np.linspace(0.0, 1.0, pointCount, dtype=np.float32)
+    deformer.setWeightsArray(cluster, clusterWeights, geometry=sphere)
+
+    assert np.array_equal(deformer.getWeightsArray(cluster, geometry=sphere), clusterWeights)
+    assert cmds.getAttr("{}.wl[0].w[1]".format(cluster)) == pytest.approx(clusterWeights[1])
+
+    # weights of 1.0 are not stored
+    encodedWeights = deformerData.encodeWeights(clusterWeights)
+    assert encodedWeights["indices"].tolist() == list(range(pointCount - 1))
+    assert np.array_equal(deformerData.decodeWeights(encodedWeights), clusterWeights)
+
+
+def test_deformerWeightsArrayUndo(setupScene):
+    sphere, skin = setupScene
+    cluster, clusterHandle = cmds.cluster(sphere)
+
+    pointCount = cmds.polyEvaluate(sphere, vertex=True)
+    cmds.undoInfo(state=True)
+    deformer.setWeightsArray(cluster, np.zeros(pointCount, dtype=np.float32), geometry=sphere)
+    cmds.undo()
+
+    assert np.array_equal(deformer.getWeightsArray(cluster, geometry=sphere), np.ones(pointCount, dtype=np.float32))
+
+
+def test_decodeWeightsToNewPointCount():
+    encodedWeights = deformerData.encodeWeights(np.array([0.5, 1.0, 0.25, 0.0], dtype=np.float32))
+
+    assert deformerData.decodeWeights(encodedWeights, pointCount=2).tolist() == [0.5, 1.0]
+    assert deformerData.decodeWeights(encodedWeights, pointCount=6).tolist() == [0.5, 1.0, 0.25, 0.0, 1.0, 1.0]